@@ -0,0 +1,17 @@
+"""
+Shared route dependencies
+"""
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from services.focal_team import FocalTeam, UnknownFocalTeamError, get_focal_team
+
+
+def focal_team(
+    focal_team_id: Optional[int] = Query(None, description="SofaScore ID of the focal team (defaults to Gil Vicente)"),
+) -> FocalTeam:
+    try:
+        return get_focal_team(focal_team_id)
+    except UnknownFocalTeamError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,85 @@
+"""
+Live Match API - the focal team's in-progress match over SSE or WebSocket
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import focal_team
+from services.focal_team import FocalTeam
+from services.live_match_service import get_live_match_service
+from utils.logger import setup_logger
+from utils.sse import SSE_HEADERS, sse_event
+
+router = APIRouter()
+logger = setup_logger(__name__)
+
+KEEPALIVE_SECONDS = 15
+
+
+@router.get("/live/match")
+async def get_live_match(team: FocalTeam = Depends(focal_team)):
+    """Current state of the in-progress match, or `{"type": "idle"}` when none is live."""
+    try:
+        return await get_live_match_service(team).current()
+    except Exception as e:
+        logger.error(f"Error fetching live match: {e}")
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+@router.get("/live/match/stream")
+async def stream_live_match(team: FocalTeam = Depends(focal_team)):
+    """
+    Server-Sent Events: a `snapshot`, then `update` events with only the changed sections
+    (`event`, `tactical_stats`, `advanced_stats`, new `incidents`), and `finished` at full time.
+    """
+    service = get_live_match_service(team)
+
+    async def events():
+        queue = service.subscribe()
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_event(message["type"], message)
+        finally:
+            service.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.websocket("/live/match/ws")
+async def live_match_websocket(websocket: WebSocket, team: FocalTeam = Depends(focal_team)):
+    """Same messages as `/live/match/stream`, as JSON WebSocket frames.
+
+    Client frames are read (and ignored) so a disconnect is noticed even while no
+    messages are sent, e.g. when no match is live.
+    """
+    service = get_live_match_service(team)
+    await websocket.accept()
+    queue = service.subscribe()
+
+    async def send():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def receive():
+        while True:
+            await websocket.receive_text()
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.warning(f"Live match websocket closed: {error}")
+    finally:
+        service.unsubscribe(queue)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,27 +1,72 @@
 """
 Match Analysis API Routes
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 import httpx
+from api.dependencies import focal_team
+from services.analysis_jobs_service import get_analysis_job_service
+from services.focal_team import FocalTeam, UnknownFocalTeamError, get_focal_team
 from services.match_analysis_service import get_match_analysis_service
 from utils.logger import setup_logger
+from utils.sse import SSE_HEADERS, sse_event
 
 router = APIRouter()
 logger = setup_logger(__name__)
 
 
+class MatchAnalysisJobRequest(BaseModel):
+    opponent_id: str
+    opponent_name: str
+    focal_team_id: Optional[int] = None  # default team when omitted
+
+
+@router.post("/match-analysis/jobs", status_code=202)
+async def create_match_analysis_job(request: MatchAnalysisJobRequest):
+    """
+    Queue a match analysis and return its job right away.
+
+    Poll `GET /match-analysis/jobs/{job_id}` until `status` is `done` (the analysis is in
+    `result`) or `failed` (see `error`). Requesting an opponent whose analysis is already
+    pending or running returns that job instead of queueing another one.
+    """
+    try:
+        team = get_focal_team(request.focal_team_id)
+        job = await get_analysis_job_service().enqueue(request.opponent_id, request.opponent_name, team)
+    except UnknownFocalTeamError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error queueing match analysis job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"job": job}
+
+
+@router.get("/match-analysis/jobs/{job_id}")
+async def get_match_analysis_job(job_id: str):
+    job = await get_analysis_job_service().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job": job}
+
+
 @router.get("/match-analysis/{opponent_id}")
-async def get_match_analysis(opponent_id: str, opponent_name: str):
+async def get_match_analysis(opponent_id: str, opponent_name: str, team: FocalTeam = Depends(focal_team)):
     """
-    Get tactical analysis for Gil Vicente vs specific opponent
+    Get tactical analysis for the focal team (Gil Vicente by default) vs specific opponent
     
     Args:
         opponent_id: Opponent team ID from API
         opponent_name: Opponent team name
+        focal_team_id: Focal team ID (optional)
     """
     try:
         service = get_match_analysis_service()
-        analysis = await service.analyze_match(opponent_id, opponent_name)
+        analysis = await service.analyze_match(opponent_id, opponent_name, team)
         return analysis
     except httpx.HTTPStatusError as e:
         status = getattr(e.response, "status_code", None)
@@ -38,3 +83,40 @@ async def get_match_analysis(opponent_id: str, opponent_name: str):
     except Exception as e:
         logger.error(f"Error generating match analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/match-analysis/{opponent_id}/stream")
+async def stream_match_analysis(opponent_id: str, opponent_name: str, team: FocalTeam = Depends(focal_team)):
+    """
+    Same analysis as `GET /match-analysis/{opponent_id}`, streamed as Server-Sent Events.
+
+    Each section is sent as soon as it is computed: `gil_vicente_form`, `opponent_form`,
+    one `recent_game_tactical` per opponent match, `opponent_advanced_stats`,
+    `ai_recommendations`, then `complete` with the full analysis. A failure ends the stream
+    with an `error` event carrying the status the non-streaming route would return.
+    """
+    service = get_match_analysis_service()
+
+    async def events():
+        try:
+            async for section, payload in service.stream_analysis(opponent_id, opponent_name, team):
+                yield sse_event(section, payload)
+        except httpx.HTTPStatusError as e:
+            status = getattr(e.response, "status_code", None)
+            logger.error(f"Error streaming match analysis: {e}")
+            if status == 403:
+                yield sse_event("error", {
+                    "status": 503,
+                    "detail": "SofaScore denied this request (HTTP 403). This environment may be blocked.",
+                })
+            else:
+                yield sse_event("error", {"status": 502, "detail": str(e)})
+        except Exception as e:
+            logger.error(f"Error streaming match analysis: {e}")
+            yield sse_event("error", {"status": 500, "detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -1,29 +1,38 @@
 """
 Fixtures API backed solely by SofaScore scraping (no paid API fallbacks).
+
+Fixtures are per focal team (`focal_team_id`, Gil Vicente by default) and cached in its
+namespace. Manual fixtures and scraper exports only exist for the default team.
+Fixtures are normalized when they are built; the endpoints below read them through a
+`FixtureIndex` (services/fixture_index.py) instead of scanning the list.
 """
 from datetime import datetime, timezone
 import json
 import os
-from typing import Optional
+import time
 from zoneinfo import ZoneInfo
 
 import httpx
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
+from api.dependencies import focal_team
 from config.settings import get_settings
+from services.analysis_snapshot_service import get_analysis_snapshot_service
 from services.cache_service import get_cache_service
+from services.fixture_index import FixtureIndex, get_fixture_index, kickoff_key
+from services.focal_team import FocalTeam, default_team_id
 from services.match_analysis_service import get_match_analysis_service
 from services.advanced_stats_analyzer import get_advanced_stats_analyzer
 from services.scraper_export_service import get_scraper_export_service
 from services.sofascore_service import get_sofascore_service
+from services.tactical_aggregation import MEAN, MODE, TacticalAggregator, summarize
 from utils.logger import setup_logger
 
 router = APIRouter()
 logger = setup_logger(__name__)
 settings = get_settings()
 
-_GIL_TEAM_IDS = {str(getattr(settings, "GIL_VICENTE_TEAM_ID", 9764) or 9764), "9764"}
 LISBON_TZ = ZoneInfo("Europe/Lisbon")
 
 
@@ -141,31 +150,15 @@ def _fixture_from_sofascore(event: dict, gil_team_id: int) -> dict | None:
 
 # --- Opponent profile helpers ---
 
-def _mean(values):
-    values = [v for v in values if v is not None]
-    if not values:
-        return None
-    return sum(values) / len(values)
-
-
-def _mode_str(values):
-    values = [v for v in values if isinstance(v, str) and v]
-    if not values:
-        return None
-    counts = {}
-    for v in values:
-        counts[v] = counts.get(v, 0) + 1
-    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[0][0]
-
-
-def _team_name_from_fixtures(fixtures: list[dict], team_id: str) -> Optional[str]:
-    tid = str(team_id)
-    for f in fixtures:
-        if str(f.get("opponent_id")) == tid:
-            name = f.get("opponent_name")
-            if isinstance(name, str) and name:
-                return name
-    return None
+_PROFILE_SPEC = {
+    "possession_avg": ("possession_control.possession_percent", MEAN),
+    "ppda_avg": ("pressing_structure.PPDA", MEAN),
+    "xg_avg": ("expected_metrics.xG", MEAN),
+    "conversion_avg": ("shooting_finishing.shot_conversion_rate", MEAN),
+    "long_balls_avg": ("possession_control.long_balls_attempted", MEAN),
+    "formation": ("team_shape.formation_detected", MODE),
+}
+_PROFILE_AGGREGATOR = TacticalAggregator(_PROFILE_SPEC)
 
 
 def _result_letter(match: dict, team_id: str) -> str:
@@ -214,16 +207,17 @@ def _simplify_recent_match(match: dict, team_id: str, team_name: str) -> dict:
 
 
 def _build_tactical_profile(recent_analyzed: list[dict], form_summary: dict) -> dict:
-    poss = _mean([(m.get("possession_control", {}) or {}).get("possession_percent") for m in recent_analyzed])
-    ppda = _mean([(m.get("pressing_structure", {}) or {}).get("PPDA") for m in recent_analyzed])
-    xg = _mean([(m.get("expected_metrics", {}) or {}).get("xG") for m in recent_analyzed])
-    conv = _mean([(m.get("shooting_finishing", {}) or {}).get("shot_conversion_rate") for m in recent_analyzed])
-    long_balls = _mean([(m.get("possession_control", {}) or {}).get("long_balls_attempted") for m in recent_analyzed])
+    summary = summarize(_PROFILE_AGGREGATOR.extract(recent_analyzed), _PROFILE_SPEC)
+    poss = summary["possession_avg"]
+    ppda = summary["ppda_avg"]
+    xg = summary["xg_avg"]
+    conv = summary["conversion_avg"]
+    long_balls = summary["long_balls_avg"]
 
     conceded_rate = form_summary.get("avg_goals_conceded")
     scored_rate = form_summary.get("avg_goals_scored")
 
-    formation = _mode_str([(m.get("team_shape", {}) or {}).get("formation_detected") for m in recent_analyzed])
+    formation = summary["formation"]
 
     if poss is not None and poss >= 55:
         style = "Possession-based control"
@@ -295,15 +289,35 @@ def _build_tactical_profile(recent_analyzed: list[dict], form_summary: dict) ->
     }
 
 
+def _materialize_upcoming(result: dict, team: FocalTeam) -> None:
+    """Refresh the analysis snapshots of the next opponents after a fixtures rebuild."""
+    try:
+        get_analysis_snapshot_service().schedule_upcoming(result.get("fixtures") or [], team)
+    except Exception as e:
+        logger.warning(f"Could not schedule analysis snapshots: {e}")
+
+
+# Normalized manual fixtures build, reused while the file (path, mtime) is unchanged.
+_manual_build: dict = {}
+
+
 @router.get("/fixtures/all")
-async def get_all_fixtures():
+async def get_all_fixtures(team: FocalTeam = Depends(focal_team)):
+    return await load_fixtures(team)
+
+
+async def load_fixtures(team: FocalTeam) -> dict:
+    """All fixtures of the focal team (manual file, cache, SofaScore, then scraper exports)."""
     cache = get_cache_service()
 
     sofa = get_sofascore_service()
     scraper_exports = get_scraper_export_service()
-    gil_team_id = int(getattr(settings, "GIL_VICENTE_TEAM_ID", 9764) or 9764)
+    gil_team_id = team.id
+    is_default_team = team.id == default_team_id()
 
     def _build_manual_fixtures():
+        if not is_default_team:
+            return None
         manual_env = (os.getenv("MANUAL_FIXTURES_PATH") or "").strip()
         candidates = []
         if manual_env:
@@ -325,6 +339,13 @@ async def get_all_fixtures():
         if not manual_path:
             return None
 
+        try:
+            stamp = (manual_path, os.path.getmtime(manual_path))
+        except OSError:
+            return None
+        if _manual_build.get("stamp") == stamp:
+            return _manual_build["result"]
+
         try:
             with open(manual_path, "r", encoding="utf-8") as fh:
                 raw = json.loads(fh.read())
@@ -359,22 +380,27 @@ async def get_all_fixtures():
         past_fixtures = [f for f in fixtures if f.get("status") == "finished"]
         upcoming_fixtures = [f for f in fixtures if f.get("status") != "finished"]
 
-        return {
+        result = {
             "total_fixtures": len(fixtures),
             "past_fixtures": len(past_fixtures),
             "upcoming_fixtures": len(upcoming_fixtures),
             "fixtures": fixtures,
             "data_source": "manual",
             "cache_info": "Fixtures from manual configuration (cached for 1h)",
+            "indexed_at": stamp[1],
         }
+        _manual_build.update(stamp=stamp, result=result, published=False)
+        return result
 
     def _build_scraper_fixtures():
+        if not is_default_team:
+            return None
         fixtures = scraper_exports.load_fixtures(limit=120)
         if not fixtures:
             return None
 
         fixtures = [_normalize_fixture(f) if isinstance(f, dict) else f for f in fixtures]
-        fixtures.sort(key=lambda x: (x.get("date") or "", x.get("time") or ""))
+        fixtures.sort(key=kickoff_key)
 
         now = datetime.now().strftime("%Y-%m-%d")
         past_fixtures = [f for f in fixtures if f.get("date", "") < now or f.get("status") == "finished"]
@@ -387,18 +413,24 @@ async def get_all_fixtures():
             "fixtures": fixtures,
             "data_source": "scraper_export",
             "cache_info": "Fixtures from scraper export (cached for 1h)",
+            "indexed_at": time.time(),
         }
 
     manual_result = _build_manual_fixtures()
     if manual_result:
-        await cache.set("fixtures", "all_gil_vicente", manual_result, ttl=3600)
+        if not _manual_build.get("published"):
+            # Once per manual file version, not on every request.
+            _manual_build["published"] = True
+            await cache.set("fixtures", "all", manual_result, ttl=3600, namespace=team.namespace)
+            _materialize_upcoming(manual_result, team)
         return manual_result
 
-    cached_data = await cache.get("fixtures", "all_gil_vicente")
+    cached_data = await cache.get("fixtures", "all", namespace=team.namespace)
 
     if cached_data:
         fixtures = cached_data.get("fixtures") or []
-        if isinstance(fixtures, list):
+        if isinstance(fixtures, list) and cached_data.get("indexed_at") is None:
+            # Cached before fixtures were normalized at ingest.
             cached_data["fixtures"] = [_normalize_fixture(f) if isinstance(f, dict) else f for f in fixtures]
         cached_data["data_source"] = "cache"
         cached_data["cache_info"] = cached_data.get("cache_info") or "Fixtures from cache"
@@ -407,7 +439,8 @@ async def get_all_fixtures():
     if not getattr(settings, "SOFASCORE_ENABLED", True):
         scraper_result = _build_scraper_fixtures()
         if scraper_result:
-            await cache.set("fixtures", "all_gil_vicente", scraper_result, ttl=3600)
+            await cache.set("fixtures", "all", scraper_result, ttl=3600, namespace=team.namespace)
+            _materialize_upcoming(scraper_result, team)
             return scraper_result
 
     try:
@@ -415,7 +448,8 @@ async def get_all_fixtures():
         if not events:
             scraper_result = _build_scraper_fixtures()
             if scraper_result:
-                await cache.set("fixtures", "all_gil_vicente", scraper_result, ttl=3600)
+                await cache.set("fixtures", "all", scraper_result, ttl=3600, namespace=team.namespace)
+                _materialize_upcoming(scraper_result, team)
                 return scraper_result
         fixtures = []
         for ev in events:
@@ -423,7 +457,7 @@ async def get_all_fixtures():
             if f:
                 fixtures.append(f)
 
-        fixtures.sort(key=lambda x: (x.get("date") or "", x.get("time") or ""))
+        fixtures.sort(key=kickoff_key)
 
         now = datetime.now().strftime("%Y-%m-%d")
         past_fixtures = [f for f in fixtures if f.get("date", "") < now or f.get("status") == "finished"]
@@ -436,9 +470,12 @@ async def get_all_fixtures():
             "fixtures": fixtures,
             "data_source": "sofascore",
             "cache_info": "Fixtures from SofaScore (cached for 1h)",
+            "indexed_at": time.time(),
         }
 
-        await cache.set("fixtures", "all_gil_vicente", result, ttl=3600)
+        await cache.set("fixtures", "all", result, ttl=3600, namespace=team.namespace)
+
+        _materialize_upcoming(result, team)
         logger.info(f"Cached {len(fixtures)} fixtures from SofaScore")
         return result
 
@@ -448,7 +485,8 @@ async def get_all_fixtures():
         if status == 403:
             scraper_result = _build_scraper_fixtures()
             if scraper_result:
-                await cache.set("fixtures", "all_gil_vicente", scraper_result, ttl=3600)
+                await cache.set("fixtures", "all", scraper_result, ttl=3600, namespace=team.namespace)
+                _materialize_upcoming(scraper_result, team)
                 return scraper_result
             raise HTTPException(
                 status_code=503,
@@ -464,17 +502,21 @@ async def get_all_fixtures():
         raise HTTPException(status_code=502, detail=str(e))
 
 
-@router.get("/fixtures/upcoming")
-async def get_upcoming_fixtures(limit: int = Query(default=5, ge=1, le=50)):
-    all_data = await get_all_fixtures()
-    fixtures = all_data.get("fixtures") or []
+async def load_fixture_index(team: FocalTeam) -> tuple[dict, FixtureIndex]:
+    """`load_fixtures` plus the index of those fixtures (built once per fixtures build)."""
+    all_data = await load_fixtures(team)
+    return all_data, get_fixture_index(team.namespace, all_data)
 
-    upcoming = [f for f in fixtures if (f.get("status") != "finished")]
-    upcoming.sort(key=lambda x: (x.get("date") or "", x.get("time") or ""))
 
-    sliced = upcoming[: int(limit)]
+@router.get("/fixtures/upcoming")
+async def get_upcoming_fixtures(
+    limit: int = Query(default=5, ge=1, le=50), team: FocalTeam = Depends(focal_team)
+):
+    all_data, index = await load_fixture_index(team)
+
+    sliced = index.upcoming[: int(limit)]
     return {
-        "team": "Gil Vicente",
+        "team": team.name,
         "fixtures": sliced,
         "count": len(sliced),
         "data_source": all_data.get("data_source", "sofascore"),
@@ -483,22 +525,9 @@ async def get_upcoming_fixtures(limit: int = Query(default=5, ge=1, le=50)):
 
 
 @router.get("/opponents")
-async def get_opponents():
-    all_data = await get_all_fixtures()
-
-    opponents_dict = {}
-    for fixture in all_data.get("fixtures", []):
-        opponent_id = fixture.get("opponent_id")
-        opponent_name = fixture.get("opponent_name")
-
-        if opponent_id not in opponents_dict:
-            opponents_dict[opponent_id] = {
-                "id": opponent_id,
-                "name": opponent_name,
-            }
-
-    opponents = list(opponents_dict.values())
-    opponents.sort(key=lambda x: x.get("name") or "")
+async def get_opponents(team: FocalTeam = Depends(focal_team)):
+    all_data, index = await load_fixture_index(team)
+    opponents = [dict(o) for o in index.opponents]
 
     return {
         "season": 2025,
@@ -512,16 +541,15 @@ async def get_opponents():
 
 
 @router.get("/opponents/{team_id}/recent")
-async def get_opponent_recent_form(team_id: str, limit: int = 5):
-    all_data = await get_all_fixtures()
-    fixtures = all_data.get("fixtures") or []
+async def get_opponent_recent_form(team_id: str, limit: int = 5, team: FocalTeam = Depends(focal_team)):
+    _, index = await load_fixture_index(team)
 
-    team_name = _team_name_from_fixtures(fixtures, team_id)
+    team_name = index.opponent_name(team_id)
     if not team_name:
         raise HTTPException(status_code=404, detail="Opponent not found in fixtures")
 
     analysis_service = get_match_analysis_service()
-    analysis = await analysis_service.analyze_match(str(team_id), team_name)
+    analysis = await analysis_service.analyze_match(str(team_id), team_name, team)
 
     opp_form = analysis.get("opponent_form", {}) or {}
     recent_matches = opp_form.get("recent_matches") or []
@@ -561,16 +589,15 @@ async def get_opponent_recent_form(team_id: str, limit: int = 5):
 
 
 @router.get("/opponents/{team_id}/tactical")
-async def get_opponent_tactical_profile(team_id: str, limit: int = 5):
-    all_data = await get_all_fixtures()
-    fixtures = all_data.get("fixtures") or []
+async def get_opponent_tactical_profile(team_id: str, limit: int = 5, team: FocalTeam = Depends(focal_team)):
+    _, index = await load_fixture_index(team)
 
-    team_name = _team_name_from_fixtures(fixtures, team_id)
+    team_name = index.opponent_name(team_id)
     if not team_name:
         raise HTTPException(status_code=404, detail="Opponent not found in fixtures")
 
     analysis_service = get_match_analysis_service()
-    analysis = await analysis_service.analyze_match(str(team_id), team_name)
+    analysis = await analysis_service.analyze_match(str(team_id), team_name, team)
 
     opp_form = analysis.get("opponent_form", {}) or {}
     recent_matches = opp_form.get("recent_matches", []) or []
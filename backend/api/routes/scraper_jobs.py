@@ -0,0 +1,74 @@
+"""
+Scraper Jobs API - on-demand refreshes run by the scraper daemon
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from services.scraper_jobs_service import ScraperQueueUnavailableError, get_scraper_job_service
+from utils.logger import setup_logger
+
+router = APIRouter()
+logger = setup_logger(__name__)
+
+
+class ScraperJobRequest(BaseModel):
+    kind: str = "next_opponent"
+    league_id: Optional[int] = None
+    team_ids: Optional[List[int]] = None
+    last_n: Optional[int] = None
+
+
+@router.post("/scraper/jobs", status_code=202)
+async def create_scraper_job(request: ScraperJobRequest):
+    """
+    Queue a scrape for the daemon (`python3 scrapper/daemon.py`).
+
+    Kinds: `next_opponent` (Gil Vicente's next opponent + fixtures) or `league`
+    (last matches of every league team, or only `team_ids`).
+    """
+    payload = {}
+    if request.kind == "league":
+        payload = {
+            key: value
+            for key, value in (
+                ("league_id", request.league_id),
+                ("team_ids", request.team_ids),
+                ("last_n", request.last_n),
+            )
+            if value
+        }
+
+    try:
+        job = get_scraper_job_service().enqueue(request.kind, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ScraperQueueUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Scraper daemon has not started: {e}")
+    except Exception as e:
+        logger.error(f"Error queueing scraper job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"job": job}
+
+
+@router.get("/scraper/jobs")
+async def list_scraper_jobs(limit: int = Query(20, ge=1, le=200)):
+    """Most recent scraper jobs, newest first."""
+    try:
+        return {"jobs": get_scraper_job_service().recent(limit)}
+    except ScraperQueueUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Scraper daemon has not started: {e}")
+
+
+@router.get("/scraper/jobs/{job_id}")
+async def get_scraper_job(job_id: int):
+    """Status (pending/running/done/failed), attempts, last error and result of one job."""
+    try:
+        job = get_scraper_job_service().get(job_id)
+    except ScraperQueueUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Scraper daemon has not started: {e}")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scraper job {job_id} not found")
+    return {"job": job}
@@ -6,10 +6,13 @@ Disclaimer: Unofficial fan-made project. Gil Vicente FC did not request/endorse
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
-from api.routes import tactical, health, api_status, match_analysis, real_fixtures, opponent_stats, tactical_plan
+from api.routes import tactical, health, api_status, match_analysis, real_fixtures, opponent_stats, tactical_plan, scraper_jobs, live_match
 from config.settings import get_settings
+from services.analysis_jobs_service import get_analysis_job_service
+from services.scraper_jobs_service import get_scraper_job_service
 from utils.logger import setup_logger
 
 settings = get_settings()
@@ -25,8 +28,12 @@ async def lifespan(app: FastAPI):
     logger.info("Enhanced opponent statistics available")
     logger.info(f"Automated tactical planning available")
     logger.info("API fallback system active")
+    scraper_events = asyncio.create_task(get_scraper_job_service().listen_for_completions())
+    analysis_workers = asyncio.create_task(get_analysis_job_service().run_workers())
     yield
     logger.info("Shutting down application...")
+    scraper_events.cancel()
+    analysis_workers.cancel()
 
 
 app = FastAPI(
@@ -56,6 +63,8 @@ app.include_router(opponent_stats.router, prefix="/api/v1", tags=["Opponent Stat
 app.include_router(tactical_plan.router, prefix="/api/v1", tags=["Tactical Plan"])
 app.include_router(match_analysis.router, prefix="/api/v1", tags=["Match Analysis"])
 app.include_router(tactical.router, prefix="/api/v1", tags=["Tactical Analysis"])
+app.include_router(scraper_jobs.router, prefix="/api/v1", tags=["Scraper Jobs"])
+app.include_router(live_match.router, prefix="/api/v1", tags=["Live Match"])
 
 
 @app.get("/")
@@ -82,7 +91,8 @@ async def root():
             "fixtures": "/api/v1/fixtures/all",
             "opponent_stats": "/api/v1/opponent-stats/{opponent_id}",
             "tactical_plan": "/api/v1/tactical-plan/{opponent_id}",
-            "match_analysis": "/api/v1/match-analysis/{opponent_id}"
+            "match_analysis": "/api/v1/match-analysis/{opponent_id}",
+            "scraper_jobs": "/api/v1/scraper/jobs"
         }
     }
 
@@ -5,5 +5,6 @@ from .base import Base
 from .team import Team
 from .match import Match
 from .tactical_profile import TacticalProfile
+from .team_match import team_match_select
 
-__all__ = ["Base", "Team", "Match", "TacticalProfile"]
+__all__ = ["Base", "Team", "Match", "TacticalProfile", "team_match_select"]
@@ -1,7 +1,7 @@
 """
 Match model
 """
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import Base
@@ -40,7 +40,7 @@ class Match(Base):
     # Tactical data (JSON for flexibility)
     home_formation = Column(String(20))
     away_formation = Column(String(20))
-    tactical_data = Column(JSON)  # Additional tactical metrics
+    tactical_data = Column(JSON(none_as_null=True))  # Additional tactical metrics
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -52,3 +52,21 @@ class Match(Base):
     
     def __repr__(self):
         return f"<Match(id={self.id}, home={self.home_team_id} vs away={self.away_team_id})>"
+
+
+# "Last N matches of a team (before a date)": one (team, date DESC) index per side. On
+# PostgreSQL they also carry the other team-match view columns, so the window queries
+# (which read only those, see MatchRepository._window_statement) are index-only scans.
+_WINDOW_INCLUDE = ["status", "home_score", "away_score", "api_fixture_id"]
+Index(
+    "idx_matches_home_team_date",
+    Match.home_team_id,
+    Match.match_date.desc(),
+    postgresql_include=_WINDOW_INCLUDE + ["away_team_id"],
+)
+Index(
+    "idx_matches_away_team_date",
+    Match.away_team_id,
+    Match.match_date.desc(),
+    postgresql_include=_WINDOW_INCLUDE + ["home_team_id"],
+)
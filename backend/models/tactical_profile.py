@@ -11,7 +11,7 @@ class TacticalProfile(Base):
     __tablename__ = "tactical_profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, unique=True)
     
     # Formation tendencies
     primary_formation = Column(String(20))
@@ -37,6 +37,11 @@ class TacticalProfile(Base):
     attacking_patterns = Column(JSON)
     defensive_patterns = Column(JSON)
     
+    # Incrementally maintained aggregates (see services/tactical_profile_service.py)
+    profile = Column(JSON)  # window profile served to the analyses
+    window_stats = Column(JSON)  # metric vectors of the last N games, newest first
+    running_totals = Column(JSON)  # all-time sums/counts, points, formations
+    
     # Analysis metadata
     matches_analyzed = Column(Integer, default=0)
     last_analysis_date = Column(DateTime)
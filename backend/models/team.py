@@ -20,7 +20,7 @@ class Team(Base):
     venue_capacity = Column(Integer)
     
     # Metadata
-    is_gil_vicente = Column(Integer, default=0)  # 1 if Gil Vicente, 0 otherwise
+    is_gil_vicente = Column(Integer, default=0)  # 1 for focal teams (Gil Vicente and FOCAL_TEAMS_JSON), 0 otherwise
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -0,0 +1,27 @@
+"""
+Team-match view: every match seen from each of its two teams
+"""
+from sqlalchemy import false, select, true
+
+from .match import Match
+
+
+def team_match_select(side: str):
+    """One side of the view (the `home` or `away` team's rows), as a SELECT on `matches`.
+
+    Filtering and ordering a side by `team_id` / `match_date` uses that side's
+    `idx_matches_<side>_team_date` index, which also covers every selected column.
+    """
+    home = side == "home"
+    team, opponent = (Match.home_team_id, Match.away_team_id) if home else (Match.away_team_id, Match.home_team_id)
+    goals_for, goals_against = (Match.home_score, Match.away_score) if home else (Match.away_score, Match.home_score)
+    return select(
+        Match.api_fixture_id.label("api_fixture_id"),
+        team.label("team_id"),
+        opponent.label("opponent_id"),
+        (true() if home else false()).label("is_home"),
+        Match.match_date.label("match_date"),
+        Match.status.label("status"),
+        goals_for.label("goals_for"),
+        goals_against.label("goals_against"),
+    )
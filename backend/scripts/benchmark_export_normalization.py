@@ -0,0 +1,82 @@
+"""Scraper export normalization benchmark.
+
+Times `ScraperExportMatch.to_tactical_stats` over synthetic export rows and compares
+the compiled column map (`StatKeyResolver`) against probing every candidate key per
+metric with `_pick`.
+Intended for manual profiling (not as a CI test).
+
+Usage (inside container):
+  python scripts/benchmark_export_normalization.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure `/app` (backend root) is on sys.path when executed as a script.
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from services.scraper_export_service import (  # noqa: E402
+    _EXPORT_METRICS,
+    ScraperExportMatch,
+    StatKeyResolver,
+)
+
+
+def make_rows(count: int):
+    # English-labelled exports: the Portuguese candidates are probed and missed first.
+    rows = []
+    for i in range(count):
+        row = {"home_team": "Moreirense", "away_team": "Gil Vicente", "match_url": f"x#id:{i}"}
+        for bases, _ in _EXPORT_METRICS.values():
+            for side in ("home", "away"):
+                row[f"{bases[-1]}_{side}"] = str(i % 17)
+        row["ball_possession_home"] = "52%"
+        rows.append(row)
+    return rows
+
+
+def probe_keys(match: ScraperExportMatch):
+    return {
+        metric: match._pick(list(bases), other_team=other_team)
+        for metric, (bases, other_team) in _EXPORT_METRICS.items()
+    }
+
+
+def compiled_keys(match: ScraperExportMatch):
+    side = "home" if match.is_opponent_home else "away"
+    return StatKeyResolver.for_row(match.raw).extract(match.raw, side)
+
+
+def timed(label: str, fn, matches, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for match in matches:
+            fn(match)
+        best = min(best, time.perf_counter() - start)
+    per_row = best / len(matches) * 1e6
+    print(f"{label:<28} {best * 1000:9.1f} ms  {per_row:7.2f} us/row")
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    matches = [ScraperExportMatch(raw=row, opponent_name="Moreirense") for row in make_rows(args.rows)]
+    print(f"rows={len(matches)} metrics={len(_EXPORT_METRICS)} repeat={args.repeat} (best run)")
+
+    probe = timed("key lookup: _pick probing", probe_keys, matches, args.repeat)
+    compiled = timed("key lookup: compiled map", compiled_keys, matches, args.repeat)
+    timed("to_tactical_stats", ScraperExportMatch.to_tactical_stats, matches, args.repeat)
+    print(f"lookup speedup: {probe / compiled:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
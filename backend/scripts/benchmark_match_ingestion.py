@@ -0,0 +1,153 @@
+"""Match ingestion benchmark.
+
+Ingests a synthetic league season (events with both sides' extracted statistics in
+`tactical_data`) into `teams` / `matches` twice and reports rows per second:
+  - row by row through the ORM (look up each team/match, then add or update it)
+  - `MatchRepository.upsert_events` (multi-row INSERT ... ON CONFLICT batches on
+    PostgreSQL, executemany of the upsert on SQLite)
+Each path runs twice: the first run inserts, the second updates every row.
+Intended for manual profiling (not as a CI test).
+
+Usage (inside container):
+  python scripts/benchmark_match_ingestion.py [--events 2000] [--database-url sqlite:////tmp/bench.db]
+
+A PostgreSQL URL writes to that database: fixtures use IDs from 2_000_000_000 up and are
+deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure `/app` (backend root) is on sys.path when executed as a script.
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from sqlalchemy import delete, select  # noqa: E402
+
+from models import Match, Team  # noqa: E402
+from services.database import create_engine, create_sessionmaker, create_tables  # noqa: E402
+from services.match_repository import MatchRepository, _statistics_columns, _utc_datetime  # noqa: E402
+
+ID_BASE = 2_000_000_000
+TEAMS = 18
+
+METRICS = {
+    "ball_poss": 55.0, "total_shots": 14.0, "shots_on": 6.0, "shots_in": 9.0, "shots_out": 5.0,
+    "big_chances": 3.0, "big_missed": 2.0, "xg": 1.42, "passes_total": 512.0, "acc_passes": 441.0,
+    "pass_acc": 86.0, "acc_pass_pct": 86.0, "long_completed": 21.0, "long_attempted": 48.0,
+    "key_passes": 10.0, "crosses": 19.0, "accurate_crosses": 6.0, "tackles": 17.0,
+    "interceptions": 9.0, "blocks": 3.0, "clearances": 14.0, "duels_won": 48.0, "corners": 7.0,
+    "corners_conceded": 3.0,
+}
+
+
+def make_season(count: int, round_: int):
+    events, statistics = [], {}
+    for i in range(count):
+        home, away = i % TEAMS, (i * 7 + 1) % TEAMS
+        if home == away:
+            away = (away + 1) % TEAMS
+        event_id = ID_BASE + i
+        events.append({
+            "id": event_id,
+            "homeTeam": {"id": ID_BASE + home, "name": f"Bench Team {home}"},
+            "awayTeam": {"id": ID_BASE + away, "name": f"Bench Team {away}"},
+            "homeScore": {"current": (i + round_) % 4},
+            "awayScore": {"current": i % 3},
+            "status": {"type": "finished"},
+            "startTimestamp": 1_690_000_000 + i * 3600,
+            "venue": {"name": f"Stadium {home}"},
+        })
+        statistics[event_id] = {"home": dict(METRICS, round=round_), "away": dict(METRICS, round=round_)}
+    return events, statistics
+
+
+async def ingest_orm(sessionmaker, events, statistics) -> None:
+    async with sessionmaker() as session:
+        teams = {}
+        for ev in events:
+            for side in ("homeTeam", "awayTeam"):
+                api_id = ev[side]["id"]
+                if api_id in teams:
+                    continue
+                team = (await session.execute(select(Team).where(Team.api_team_id == api_id))).scalar_one_or_none()
+                if team is None:
+                    team = Team(api_team_id=api_id, name=ev[side]["name"])
+                    session.add(team)
+                    await session.flush()
+                teams[api_id] = team.id
+
+        for ev in events:
+            match = (await session.execute(select(Match).where(Match.api_fixture_id == ev["id"]))).scalar_one_or_none()
+            if match is None:
+                match = Match(api_fixture_id=ev["id"])
+                session.add(match)
+            match.home_team_id = teams[ev["homeTeam"]["id"]]
+            match.away_team_id = teams[ev["awayTeam"]["id"]]
+            match.match_date = _utc_datetime(ev["startTimestamp"])
+            match.venue = ev["venue"]["name"]
+            match.status = ev["status"]["type"]
+            match.home_score = ev["homeScore"]["current"]
+            match.away_score = ev["awayScore"]["current"]
+            for column, value in _statistics_columns(statistics[ev["id"]]).items():
+                setattr(match, column, value)
+        await session.commit()
+
+
+async def cleanup(sessionmaker) -> None:
+    async with sessionmaker() as session:
+        await session.execute(delete(Match).where(Match.api_fixture_id >= ID_BASE))
+        await session.execute(delete(Team).where(Team.api_team_id >= ID_BASE))
+        await session.commit()
+
+
+async def run(args) -> None:
+    engine = create_engine(args.database_url)
+    sessionmaker = create_sessionmaker(engine)
+    await create_tables(engine)
+    repo = MatchRepository(sessionmaker, batch_size=args.batch_size)
+    print(f"database={engine.url.render_as_string(hide_password=True)} events={args.events} batch={repo.batch_size}")
+
+    try:
+        for label, ingest in (
+            ("ORM row by row", lambda ev, st: ingest_orm(sessionmaker, ev, st)),
+            ("upsert_events (bulk)", lambda ev, st: repo.upsert_events(ev, st)),
+        ):
+            await cleanup(sessionmaker)
+            for round_, phase in enumerate(("insert", "update")):
+                events, statistics = make_season(args.events, round_)
+                start = time.perf_counter()
+                await ingest(events, statistics)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<24} {phase:<7} {elapsed * 1000:9.1f} ms  {args.events / elapsed:10.0f} rows/s")
+    finally:
+        await cleanup(sessionmaker)
+        await engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--database-url", default=None, help="defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmpdir = None
+    if not args.database_url:
+        tmpdir = tempfile.TemporaryDirectory()
+        args.database_url = f"sqlite:///{os.path.join(tmpdir.name, 'ingestion.db')}"
+    try:
+        asyncio.run(run(args))
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
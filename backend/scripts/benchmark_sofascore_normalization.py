@@ -0,0 +1,151 @@
+"""SofaScore statistics normalization benchmark.
+
+Times `SofaScoreService.normalize_event_tactical_stats` per event on a synthetic
+`/event/{id}/statistics` payload shaped like SofaScore's (three periods, nested values),
+next to the two-pass lookup it replaced (`_flatten_stats` followed by a separate
+side pick + parse per metric), and the batch feature-matrix path
+(`normalize_events_matrix`) against normalizing per event and collecting the dicts.
+Intended for manual profiling (not as a CI test).
+
+Usage (inside container):
+  python scripts/benchmark_sofascore_normalization.py [--events 2000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure `/app` (backend root) is on sys.path when executed as a script.
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from services.sofascore_service import (  # noqa: E402
+    SofaScoreService,
+    TacticalFeatureMatrix,
+    _parse_count_and_percent,
+    _parse_number,
+    _parse_percent,
+    _unwrap_stat_value,
+)
+
+ITEMS = [
+    ("Ball possession", "55%", "45%"),
+    ("Expected goals", "1.42", "0.87"),
+    ("Big chances", 3, 1),
+    ("Total shots", 14, 9),
+    ("Shots on target", 6, 3),
+    ("Shots off target", 5, 4),
+    ("Blocked shots", 3, 2),
+    ("Shots inside box", 9, 5),
+    ("Shots outside box", 5, 4),
+    ("Big chances missed", 2, 1),
+    ("Corner kicks", 7, 3),
+    ("Fouls", 11, 13),
+    ("Offsides", 2, 1),
+    ("Passes", 512, 388),
+    ("Accurate passes", "441 (86%)", "301 (78%)"),
+    ("Key passes", 10, 6),
+    ("Long balls", "21/48 (44%)", "18/51 (35%)"),
+    ("Crosses", "6/19 (32%)", "4/15 (27%)"),
+    ("Tackles", 17, 21),
+    ("Interceptions", 9, 12),
+    ("Clearances", 14, 25),
+    ("Duels won", 48, 43),
+    ("Aerial duels won", 12, 15),
+    ("Goalkeeper saves", 2, 4),
+    ("Dispossessed", 8, 10),
+]
+
+
+def make_payload():
+    groups = [
+        {"groupName": "Match overview", "statisticsItems": [
+            {"name": name, "home": {"value": home}, "away": {"value": away}} for name, home, away in ITEMS
+        ]}
+    ]
+    return {"statistics": [{"period": period, "groups": groups} for period in ("1ST", "2ND", "ALL")]}
+
+
+EVENT = {
+    "id": 1,
+    "homeTeam": {"id": 3010, "name": "Gil Vicente"},
+    "awayTeam": {"id": 3001, "name": "Moreirense"},
+    "homeScore": {"current": 2},
+    "awayScore": {"current": 1},
+    "startTimestamp": 1700000000,
+}
+
+
+def _pick_side(stat, is_home):
+    return _unwrap_stat_value(stat.get("home") if is_home else stat.get("away"))
+
+
+def two_pass_lookup(svc: SofaScoreService, stats_raw, is_home=True):
+    flat = svc._flatten_stats(stats_raw)
+    out = {}
+    for key in ("ball_possession", "pass_accuracy"):
+        out[key] = _parse_percent(_pick_side(flat.get(key, {}), is_home))
+    for key in ("total_shots", "shots_on_target", "shots_inside_box", "shots_outside_box", "big_chances",
+                "big_chances_missed", "xg", "total_passes", "corners", "tackles", "interceptions",
+                "clearances", "blocked_shots", "duels_won", "key_passes", "crosses", "accurate_crosses"):
+        out[key] = _parse_number(_pick_side(flat.get(key, {}), is_home))
+    for key in ("accurate_passes", "long_balls", "accurate_long_balls"):
+        out[key] = _parse_count_and_percent(_pick_side(flat.get(key, {}), is_home))
+    out["corners_conceded"] = _parse_number(_pick_side(flat.get("corners", {}), not is_home))
+    return out
+
+
+def timed(label: str, fn, count: int, repeat: int, unit: str = "event") -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:9.1f} ms  {best / count * 1e6:7.2f} us/{unit}")
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    svc = SofaScoreService()
+    payload = make_payload()
+    print(f"events={args.events} items/event={len(ITEMS) * 3} repeat={args.repeat} (best run)")
+
+    timed("flatten + per-metric pick/parse", lambda: two_pass_lookup(svc, payload), args.events, args.repeat)
+    timed(
+        "normalize_event_tactical_stats",
+        lambda: svc.normalize_event_tactical_stats(event=EVENT, team_id=3010, stats_raw=payload),
+        args.events,
+        args.repeat,
+    )
+
+    batch = 50
+    events, payloads = [EVENT] * batch, [payload] * batch
+    rounds = max(1, args.events // batch)
+    timed(
+        f"per-event dicts -> matrix ({batch})",
+        lambda: TacticalFeatureMatrix.from_tactical_stats([
+            svc.normalize_event_tactical_stats(event=ev, team_id=3010, stats_raw=p) for ev, p in zip(events, payloads)
+        ]),
+        rounds,
+        args.repeat,
+        unit="batch",
+    )
+    timed(
+        f"normalize_events_matrix ({batch})",
+        lambda: svc.normalize_events_matrix(events=events, team_id=3010, stats_payloads=payloads),
+        rounds,
+        args.repeat,
+        unit="batch",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,301 @@
+"""Analysis Jobs Service
+
+Runs opponent analyses outside the request: `POST /match-analysis/jobs` queues an
+analysis and returns a job ID right away, and `GET /match-analysis/jobs/{id}` polls its
+status and result. Jobs run `AnalysisSnapshotService.materialize`, so a finished job also
+refreshes the opponent's snapshot.
+
+Two queue backends share one interface:
+  - `RedisAnalysisJobBackend`: jobs, the pending list and the dedup index live in Redis,
+    so any backend process can enqueue, run or report a job
+  - `InProcessAnalysisJobBackend`: asyncio queue + dict, used when Redis is unavailable
+    and in tests
+
+An identical job (same opponent and focal team) that is still pending or running is
+returned instead of queueing a duplicate. Each process runs `ANALYSIS_JOB_CONCURRENCY` workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+from services.analysis_snapshot_service import AnalysisSnapshotService, get_analysis_snapshot_service
+from services.cache_service import CacheService, get_cache_service
+from services.focal_team import FocalTeam, default_team_id, get_focal_team
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+ACTIVE_STATUSES = ("pending", "running")
+_KEY_PREFIX = "gil_vicente:analysis_jobs"
+
+# Deletes the dedup entry KEYS[1] only while it still points to ARGV[1] and that job
+# (KEYS[2]) is finished or expired, so a concurrent enqueue's fresh entry is never dropped.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+local raw = redis.call('GET', KEYS[2])
+if raw then
+    local status = cjson.decode(raw)['status']
+    if status == 'pending' or status == 'running' then
+        return 0
+    end
+end
+return redis.call('DEL', KEYS[1])
+"""
+
+
+def dedup_key(opponent_id: str, opponent_name: str, team_id: Any = None) -> str:
+    return f"{team_id or default_team_id()}:{opponent_id}_{opponent_name}"
+
+
+def _job_dedup_key(job: Dict[str, Any]) -> str:
+    return dedup_key(job["opponent_id"], job["opponent_name"], job.get("team_id"))
+
+
+def _new_job(opponent_id: str, opponent_name: str, team_id: int) -> Dict[str, Any]:
+    now = time.time()
+    return {
+        "id": uuid.uuid4().hex,
+        "opponent_id": str(opponent_id),
+        "opponent_name": opponent_name,
+        "team_id": int(team_id),
+        "status": "pending",
+        "created_at": now,
+        "updated_at": now,
+        "error": None,
+        "result": None,
+    }
+
+
+class InProcessAnalysisJobBackend:
+    """Jobs kept in this process; finished jobs are dropped after `result_ttl` seconds."""
+
+    def __init__(self, result_ttl: int = 3600):
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._active: Dict[str, str] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._lock = asyncio.Lock()
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] not in ACTIVE_STATUSES and job["updated_at"] < cutoff
+        ]:
+            self._jobs.pop(job_id, None)
+
+    async def enqueue(self, opponent_id: str, opponent_name: str, team_id: int) -> Dict[str, Any]:
+        key = dedup_key(opponent_id, opponent_name, team_id)
+        async with self._lock:
+            self._expire()
+            existing = self._jobs.get(self._active.get(key, ""))
+            if existing and existing["status"] in ACTIVE_STATUSES:
+                return dict(existing)
+
+            job = _new_job(opponent_id, opponent_name, team_id)
+            self._jobs[job["id"]] = job
+            self._active[key] = job["id"]
+        await self._queue.put(job["id"])
+        return dict(job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def claim(self, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        try:
+            job_id = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job.update(status="running", updated_at=time.time())
+        return dict(job)
+
+    async def finish(self, job: Dict[str, Any], *, result: Any = None, error: Optional[str] = None) -> None:
+        stored = self._jobs.get(job["id"])
+        if stored is None:
+            return
+        stored.update(
+            status="failed" if error else "done",
+            result=result,
+            error=error,
+            updated_at=time.time(),
+        )
+        key = _job_dedup_key(stored)
+        if self._active.get(key) == stored["id"]:
+            self._active.pop(key, None)
+
+
+class RedisAnalysisJobBackend:
+    """Jobs stored in Redis: `job:<id>` JSON documents, a pending list and a dedup index."""
+
+    def __init__(self, redis_client, result_ttl: int = 3600):
+        self.redis = redis_client
+        self.result_ttl = result_ttl
+        self.queue_key = f"{_KEY_PREFIX}:queue"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{_KEY_PREFIX}:job:{job_id}"
+
+    def _dedup_key(self, key: str) -> str:
+        return f"{_KEY_PREFIX}:active:{key}"
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        await self.redis.set(self._job_key(job["id"]), json.dumps(job, default=str), ex=self.result_ttl)
+
+    async def _release(self, active_key: str, job_id: str) -> bool:
+        return bool(await self.redis.eval(_RELEASE_SCRIPT, 2, active_key, self._job_key(job_id), job_id))
+
+    async def enqueue(self, opponent_id: str, opponent_name: str, team_id: int) -> Dict[str, Any]:
+        active_key = self._dedup_key(dedup_key(opponent_id, opponent_name, team_id))
+        job = _new_job(opponent_id, opponent_name, team_id)
+
+        # The job document is written before the dedup entry is claimed, so an entry never
+        # points to a missing job while it is being queued. A stale entry (job finished or
+        # expired) is released atomically and the claim retried.
+        await self._save(job)
+        for _ in range(3):
+            if await self.redis.set(active_key, job["id"], nx=True, ex=self.result_ttl):
+                await self.redis.lpush(self.queue_key, job["id"])
+                return job
+
+            existing_id = await self.redis.get(active_key)
+            existing = await self.get(existing_id) if existing_id else None
+            if existing and existing["status"] in ACTIVE_STATUSES:
+                await self.redis.delete(self._job_key(job["id"]))
+                return existing
+            if existing_id:
+                await self._release(active_key, existing_id)
+
+        await self.redis.delete(self._job_key(job["id"]))
+        raise RuntimeError(f"Could not queue analysis job for {opponent_name} ({opponent_id})")
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.get(self._job_key(job_id))
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except Exception:
+            return None
+
+    async def claim(self, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        popped = await self.redis.brpop(self.queue_key, timeout=max(1, int(timeout)))
+        if not popped:
+            return None
+        job = await self.get(popped[1])
+        if job is None:
+            return None
+        job.update(status="running", updated_at=time.time())
+        await self._save(job)
+        return job
+
+    async def finish(self, job: Dict[str, Any], *, result: Any = None, error: Optional[str] = None) -> None:
+        job = dict(job)
+        job.update(status="failed" if error else "done", result=result, error=error, updated_at=time.time())
+        await self._save(job)
+        await self._release(self._dedup_key(_job_dedup_key(job)), job["id"])
+
+
+class AnalysisJobService:
+    def __init__(
+        self,
+        backend=None,
+        snapshots: Optional[AnalysisSnapshotService] = None,
+        cache: Optional[CacheService] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self._backend = backend
+        self._snapshots = snapshots
+        self.cache = cache or get_cache_service()
+        self.concurrency = max(1, int(concurrency or getattr(settings, "ANALYSIS_JOB_CONCURRENCY", 2) or 1))
+        self.result_ttl = int(getattr(settings, "ANALYSIS_JOB_RESULT_TTL_SECONDS", 3600) or 3600)
+        self._backend_lock = asyncio.Lock()
+
+    @property
+    def snapshots(self) -> AnalysisSnapshotService:
+        if self._snapshots is None:
+            self._snapshots = get_analysis_snapshot_service()
+        return self._snapshots
+
+    async def backend(self):
+        """Redis backend when `ANALYSIS_JOB_BACKEND` allows it and Redis is reachable."""
+        if self._backend is not None:
+            return self._backend
+        async with self._backend_lock:
+            if self._backend is None:
+                mode = str(getattr(settings, "ANALYSIS_JOB_BACKEND", "auto") or "auto").lower()
+                if mode != "memory":
+                    if not self.cache.redis_client:
+                        await self.cache.connect()
+                    if self.cache.redis_client:
+                        self._backend = RedisAnalysisJobBackend(self.cache.redis_client, self.result_ttl)
+                if self._backend is None:
+                    if mode == "redis":
+                        logger.warning("ANALYSIS_JOB_BACKEND=redis but Redis is unavailable; using in-process jobs")
+                    self._backend = InProcessAnalysisJobBackend(self.result_ttl)
+                logger.info(f"Analysis jobs backend: {type(self._backend).__name__}")
+        return self._backend
+
+    async def enqueue(self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None) -> Dict[str, Any]:
+        if not str(opponent_id).strip() or not str(opponent_name or "").strip():
+            raise ValueError("opponent_id and opponent_name are required")
+        team = team or get_focal_team()
+        return await (await self.backend()).enqueue(str(opponent_id), opponent_name, team.id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await (await self.backend()).get(job_id)
+
+    async def run_job(self, job: Dict[str, Any]) -> None:
+        backend = await self.backend()
+        try:
+            team = get_focal_team(job.get("team_id"))
+            snapshot = await self.snapshots.materialize(job["opponent_id"], job["opponent_name"], team)
+        except Exception as e:
+            logger.error(f"Analysis job {job['id']} failed: {e}")
+            await backend.finish(job, error=str(e))
+            return
+        await backend.finish(job, result=snapshot.get("analysis"))
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                job = await (await self.backend()).claim()
+                if job is not None:
+                    await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Analysis worker {index} error: {e}")
+                await asyncio.sleep(5)
+
+    async def run_workers(self) -> None:
+        """Run `concurrency` workers until cancelled."""
+        workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+
+_svc: Optional[AnalysisJobService] = None
+
+
+def get_analysis_job_service() -> AnalysisJobService:
+    global _svc
+    if _svc is None:
+        _svc = AnalysisJobService()
+    return _svc
@@ -0,0 +1,274 @@
+"""Analysis Snapshot Service
+
+Materialized per-opponent analysis. After each fixtures refresh the next
+`ANALYSIS_SNAPSHOT_OPPONENTS` upcoming opponents are analyzed in the background
+(`MatchAnalysisService.analyze_match`, once per opponent) and the responses of the
+opponent-stats and tactical-plan routes are built from that analysis and stored together
+in Redis with a `generated_at` timestamp.
+
+Routes serve these snapshots and only analyze inline when asked to (`force`). A snapshot
+older than `ANALYSIS_SNAPSHOT_MAX_AGE_SECONDS` is still served while a refresh runs in
+the background. Snapshots are stored per focal team (its cache namespace).
+
+Without Redis a snapshot is kept in this process instead and requests wait for the
+analysis (as they would without snapshots). A failed background analysis is reported to
+the next request (`SnapshotMaterializationError`) instead of another pending response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import get_settings
+from services.cache_service import CacheService, get_cache_service
+from services.focal_team import FocalTeam, get_focal_team
+from services.match_analysis_service import get_match_analysis_service
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+SNAPSHOT_CACHE_TYPE = "analysis_snapshot"
+
+# section name -> builder(opponent_id, opponent_name, full_analysis) -> route response
+SectionBuilder = Callable[[str, str, Dict[str, Any]], Any]
+
+
+def snapshot_key(opponent_id: str, opponent_name: str) -> str:
+    """Cache identifier; ends with the opponent name like the other per-opponent keys."""
+    return f"{opponent_id}_{opponent_name}"
+
+
+class SnapshotMaterializationError(RuntimeError):
+    """The analysis behind a snapshot failed."""
+
+
+def _default_builders() -> Dict[str, SectionBuilder]:
+    # The route modules own the response shapes and import this service, so they are
+    # only imported once a snapshot is built.
+    from api.routes.opponent_stats import build_opponent_stats
+    from api.routes.tactical_plan import build_tactical_plan
+
+    return {"opponent_stats": build_opponent_stats, "tactical_plan": build_tactical_plan}
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except Exception:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class AnalysisSnapshotService:
+    def __init__(
+        self,
+        cache: Optional[CacheService] = None,
+        analysis=None,
+        builders: Optional[Dict[str, SectionBuilder]] = None,
+    ):
+        self.cache = cache or get_cache_service()
+        self._analysis = analysis
+        self._builders = builders
+        self.upcoming_opponents = int(getattr(settings, "ANALYSIS_SNAPSHOT_OPPONENTS", 3) or 0)
+        self.max_age_seconds = int(getattr(settings, "ANALYSIS_SNAPSHOT_MAX_AGE_SECONDS", 21600) or 0)
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._local: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._failures: Dict[Tuple[str, str], str] = {}
+        self._upcoming_tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def analysis(self):
+        if self._analysis is None:
+            self._analysis = get_match_analysis_service()
+        return self._analysis
+
+    @property
+    def builders(self) -> Dict[str, SectionBuilder]:
+        if self._builders is None:
+            self._builders = _default_builders()
+        return self._builders
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    async def get(self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None) -> Optional[Dict[str, Any]]:
+        team = team or get_focal_team()
+        key = snapshot_key(opponent_id, opponent_name)
+        snapshot = await self.cache.get(SNAPSHOT_CACHE_TYPE, key, namespace=team.namespace)
+        if snapshot is None:
+            snapshot = self._local.get((team.namespace, key))
+        return snapshot
+
+    def is_fresh(self, snapshot: Optional[Dict[str, Any]]) -> bool:
+        generated_at = _parse_timestamp((snapshot or {}).get("generated_at"))
+        if generated_at is None:
+            return False
+        age = (datetime.now(timezone.utc) - generated_at).total_seconds()
+        return age <= self.max_age_seconds
+
+    async def serve(
+        self, section: str, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot section as a route response, or None when nothing is materialized yet.
+
+        Stale snapshots are still returned; a background refresh is scheduled for them.
+        """
+        snapshot = await self.get(opponent_id, opponent_name, team)
+        if not snapshot or not isinstance(snapshot.get(section), dict):
+            return None
+
+        if not self.is_fresh(snapshot):
+            self.schedule(opponent_id, opponent_name, team)
+
+        response = dict(snapshot[section])
+        response["generated_at"] = snapshot.get("generated_at")
+        response["snapshot"] = True
+        response["cache_info"] = f"Precomputed analysis snapshot (generated {snapshot.get('generated_at')})"
+        return response
+
+    async def serve_or_schedule(
+        self, section: str, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None
+    ) -> Optional[Dict[str, Any]]:
+        """`serve`, otherwise start materializing; None while that runs in the background.
+
+        Without a cache backend the analysis is awaited and its section returned. Raises
+        `SnapshotMaterializationError` when the last analysis of the opponent failed.
+        """
+        team = team or get_focal_team()
+        served = await self.serve(section, opponent_id, opponent_name, team)
+        if served is not None:
+            return served
+
+        key = (team.namespace, snapshot_key(opponent_id, opponent_name))
+        failure = self._failures.pop(key, None)
+        if failure is not None:
+            raise SnapshotMaterializationError(failure)
+
+        task = self.schedule(opponent_id, opponent_name, team)
+        if await self.cache.is_available():
+            return None
+        if await task is None:
+            raise SnapshotMaterializationError(self._failures.pop(key, "Analysis failed"))
+        return await self.serve(section, opponent_id, opponent_name, team)
+
+    def pending_response(self, opponent_id: str, opponent_name: str) -> Dict[str, Any]:
+        return {
+            "opponent": opponent_name,
+            "opponent_id": opponent_id,
+            "status": "pending",
+            "detail": "Analysis is being prepared in the background; retry shortly or pass force=true.",
+            "retry_after_seconds": 5,
+        }
+
+    # ------------------------------------------------------------------
+    # Materializing
+    # ------------------------------------------------------------------
+    async def materialize(self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None) -> Dict[str, Any]:
+        """Analyze one opponent now and store every section of its snapshot."""
+        team = team or get_focal_team()
+        full_analysis = await self.analysis.analyze_match(str(opponent_id), opponent_name, team)
+
+        snapshot: Dict[str, Any] = {
+            "opponent_id": str(opponent_id),
+            "opponent_name": opponent_name,
+            "focal_team": team.as_dict(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "analysis": full_analysis,
+        }
+        for section, builder in self.builders.items():
+            result = builder(str(opponent_id), opponent_name, full_analysis)
+            if asyncio.iscoroutine(result):
+                result = await result
+            snapshot[section] = result
+
+        key = (team.namespace, snapshot_key(opponent_id, opponent_name))
+        stored = await self.cache.set(SNAPSHOT_CACHE_TYPE, key[1], snapshot, namespace=team.namespace)
+        if stored:
+            self._local.pop(key, None)
+        else:
+            self._local[key] = snapshot
+        self._failures.pop(key, None)
+        logger.info(f"Materialized analysis snapshot for {opponent_name} ({opponent_id}), team {team.id}")
+        return snapshot
+
+    def schedule(self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None) -> asyncio.Task:
+        """Materialize in the background; concurrent requests share one task per opponent and team."""
+        team = team or get_focal_team()
+        key = (team.namespace, snapshot_key(opponent_id, opponent_name))
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            return task
+
+        async def _run():
+            try:
+                return await self.materialize(opponent_id, opponent_name, team)
+            except Exception as e:
+                logger.error(f"Snapshot materialization failed for {opponent_name} ({opponent_id}): {e}")
+                self._failures[key] = str(e) or type(e).__name__
+                return None
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.create_task(_run())
+        self._inflight[key] = task
+        return task
+
+    def upcoming_opponents_from(self, fixtures: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """The next K distinct upcoming opponents, in kickoff order."""
+        upcoming = [f for f in fixtures if isinstance(f, dict) and f.get("status") != "finished"]
+        upcoming.sort(key=lambda f: (f.get("date") or "", f.get("time") or ""))
+
+        opponents: List[Dict[str, str]] = []
+        seen = set()
+        for fixture in upcoming:
+            opponent_id = fixture.get("opponent_id")
+            opponent_name = fixture.get("opponent_name")
+            if opponent_id in (None, "", "None") or not opponent_name or str(opponent_id) in seen:
+                continue
+            seen.add(str(opponent_id))
+            opponents.append({"id": str(opponent_id), "name": str(opponent_name)})
+            if len(opponents) >= self.upcoming_opponents:
+                break
+        return opponents
+
+    async def refresh_upcoming(
+        self, fixtures: List[Dict[str, Any]], force: bool = False, team: Optional[FocalTeam] = None
+    ) -> List[str]:
+        """Materialize the upcoming opponents whose snapshot is missing or stale.
+
+        Opponents are analyzed one after another to keep the upstream request rate flat.
+        Returns the IDs that were (re)materialized.
+        """
+        refreshed: List[str] = []
+        for opponent in self.upcoming_opponents_from(fixtures):
+            if not force and self.is_fresh(await self.get(opponent["id"], opponent["name"], team)):
+                continue
+            result = await self.schedule(opponent["id"], opponent["name"], team)
+            if result is not None:
+                refreshed.append(opponent["id"])
+        return refreshed
+
+    def schedule_upcoming(self, fixtures: List[Dict[str, Any]], team: Optional[FocalTeam] = None) -> Optional[asyncio.Task]:
+        """Run `refresh_upcoming` in the background unless one is already running for the team."""
+        if self.upcoming_opponents <= 0:
+            return None
+        team = team or get_focal_team()
+        task = self._upcoming_tasks.get(team.namespace)
+        if task is not None and not task.done():
+            return task
+        task = asyncio.create_task(self.refresh_upcoming(list(fixtures or []), team=team))
+        self._upcoming_tasks[team.namespace] = task
+        return task
+
+
+_svc: Optional[AnalysisSnapshotService] = None
+
+
+def get_analysis_snapshot_service() -> AnalysisSnapshotService:
+    global _svc
+    if _svc is None:
+        _svc = AnalysisSnapshotService()
+    return _svc
@@ -8,8 +8,18 @@ from typing import Optional, Any, Dict
 from datetime import timedelta
 import redis.asyncio as redis
 
+from services.focal_team import get_focal_team
+
 logger = logging.getLogger(__name__)
 
+_GLOB_SPECIAL = "\\*?[]"
+
+
+def glob_escape(value: str) -> str:
+    """Escape Redis glob metacharacters so `value` only matches itself in `delete_matching`"""
+    return "".join("\\" + ch if ch in _GLOB_SPECIAL else ch for ch in value)
+
+
 class CacheService:
     """Service for caching API responses with Redis"""
     
@@ -24,6 +34,8 @@ class CacheService:
             "opponent_stats": 86400,   # 24 hours - team stats are more stable
             "tactical_plan": 86400,    # 24 hours - tactical analysis remains valid
             "match_details": 7200,     # 2 hours - match details
+            "analysis_snapshot": 604800,  # 7 days - refreshed in the background, served while stale
+            "focal_form": 86400,       # 24 hours - revalidated after the team's next match
         }
     
     async def connect(self):
@@ -41,23 +53,31 @@ class CacheService:
                 logger.error(f"Redis connection failed: {e}")
                 self.redis_client = None
     
+    async def is_available(self) -> bool:
+        """Whether Redis is connected (connecting first if needed)"""
+        if not self.redis_client:
+            await self.connect()
+        return self.redis_client is not None
+
     async def disconnect(self):
         """Close Redis connection"""
         if self.redis_client:
             await self.redis_client.close()
             logger.info("Redis connection closed")
     
-    def _get_cache_key(self, cache_type: str, identifier: str) -> str:
-        """Generate cache key with namespace"""
-        return f"gil_vicente:{cache_type}:{identifier}"
+    def _get_cache_key(self, cache_type: str, identifier: str, namespace: Optional[str] = None) -> str:
+        """Generate cache key with namespace (the focal team's, default team when None)"""
+        namespace = namespace or get_focal_team().namespace
+        return f"gil_vicente:{cache_type}:{namespace}:{identifier}"
     
-    async def get(self, cache_type: str, identifier: str) -> Optional[Dict[str, Any]]:
+    async def get(self, cache_type: str, identifier: str, namespace: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get cached data
         
         Args:
             cache_type: Type of cache (fixtures, opponent_stats, tactical_plan)
             identifier: Unique identifier for the cached item
+            namespace: Focal team namespace (default team when None)
         
         Returns:
             Cached data as dict or None if not found
@@ -70,7 +90,7 @@ class CacheService:
             return None
         
         try:
-            cache_key = self._get_cache_key(cache_type, identifier)
+            cache_key = self._get_cache_key(cache_type, identifier, namespace)
             cached_data = await self.redis_client.get(cache_key)
             
             if cached_data:
@@ -89,7 +109,8 @@ class CacheService:
         cache_type: str, 
         identifier: str, 
         data: Dict[str, Any],
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        namespace: Optional[str] = None,
     ) -> bool:
         """
         Set cached data with TTL
@@ -99,6 +120,7 @@ class CacheService:
             identifier: Unique identifier
             data: Data to cache
             ttl: Time to live in seconds (optional, uses default from TTL_CONFIG)
+            namespace: Focal team namespace (default team when None)
         
         Returns:
             True if cached successfully, False otherwise
@@ -111,7 +133,7 @@ class CacheService:
             return False
         
         try:
-            cache_key = self._get_cache_key(cache_type, identifier)
+            cache_key = self._get_cache_key(cache_type, identifier, namespace)
             
             # Use provided TTL or default from config
             ttl_seconds = ttl or self.TTL_CONFIG.get(cache_type, 3600)
@@ -131,7 +153,7 @@ class CacheService:
             logger.error(f"Cache set error for {cache_type}:{identifier}: {e}")
             return False
     
-    async def delete(self, cache_type: str, identifier: str) -> bool:
+    async def delete(self, cache_type: str, identifier: str, namespace: Optional[str] = None) -> bool:
         """Delete cached item"""
         if not self.redis_client:
             await self.connect()
@@ -140,7 +162,7 @@ class CacheService:
             return False
         
         try:
-            cache_key = self._get_cache_key(cache_type, identifier)
+            cache_key = self._get_cache_key(cache_type, identifier, namespace)
             deleted = await self.redis_client.delete(cache_key)
             
             if deleted:
@@ -152,6 +174,38 @@ class CacheService:
             logger.error(f"Cache delete error: {e}")
             return False
     
+    async def delete_matching(self, cache_type: str, identifier_pattern: str, namespace: Optional[str] = None) -> int:
+        """
+        Delete cached items of one type whose identifier matches a glob pattern
+
+        Args:
+            cache_type: Type of cache
+            identifier_pattern: Redis glob for the identifier (e.g. "*_Moreirense");
+                literal parts taken from data go through `glob_escape`
+            namespace: Focal team namespace, or a glob ("*" for every team)
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self.redis_client:
+            await self.connect()
+
+        if not self.redis_client:
+            return 0
+
+        try:
+            pattern = self._get_cache_key(cache_type, identifier_pattern, namespace)
+            keys = [key async for key in self.redis_client.scan_iter(match=pattern)]
+            if not keys:
+                return 0
+            deleted = await self.redis_client.delete(*keys)
+            logger.info(f"Deleted {deleted} cache entries matching '{pattern}'")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Cache delete error for {cache_type}:{identifier_pattern}: {e}")
+            return 0
+
     async def clear_all(self, cache_type: Optional[str] = None) -> int:
         """
         Clear all cached items of a specific type or all cache
@@ -204,6 +258,7 @@ class CacheService:
             fixtures_count = 0
             opponent_stats_count = 0
             tactical_plan_count = 0
+            snapshot_count = 0
             
             async for key in self.redis_client.scan_iter(match="gil_vicente:*"):
                 if ":fixtures:" in key:
@@ -212,16 +267,19 @@ class CacheService:
                     opponent_stats_count += 1
                 elif ":tactical_plan:" in key:
                     tactical_plan_count += 1
+                elif ":analysis_snapshot:" in key:
+                    snapshot_count += 1
             
             return {
                 "status": "connected",
                 "redis_version": info.get("redis_version"),
                 "connected_clients": info.get("connected_clients"),
                 "used_memory_human": info.get("used_memory_human"),
-                "total_keys": fixtures_count + opponent_stats_count + tactical_plan_count,
+                "total_keys": fixtures_count + opponent_stats_count + tactical_plan_count + snapshot_count,
                 "fixtures_cached": fixtures_count,
                 "opponent_stats_cached": opponent_stats_count,
                 "tactical_plans_cached": tactical_plan_count,
+                "analysis_snapshots_cached": snapshot_count,
             }
             
         except Exception as e:
@@ -0,0 +1,156 @@
+"""Columnar Export Store (read side)
+
+Selective reader for the Parquet store that `scrapper/columnar_store.py` appends to
+(`<export dir>/columnar/`). The manifest lists every part with its team partition, event
+IDs, date range and columns, so a query only opens the parts of one team that overlap the
+requested dates, and only reads the requested columns from them.
+
+pyarrow is optional: without it `available` is False and callers fall back to the JSON
+exports.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+STORE_DIRNAME = "columnar"
+MANIFEST_FILENAME = "manifest.json"
+
+
+def team_slug(name: str) -> str:
+    """Partition key for a team name; must match `scrapper/columnar_store.py`."""
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_") or "unknown"
+
+
+class ColumnarExportStore:
+    def __init__(self, export_dir: str):
+        self.root = os.path.join(export_dir, STORE_DIRNAME)
+        self.manifest_path = os.path.join(self.root, MANIFEST_FILENAME)
+
+    @property
+    def available(self) -> bool:
+        return pq is not None and os.path.isfile(self.manifest_path)
+
+    def _manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except Exception:
+            return {}
+        partitions = manifest.get("partitions") if isinstance(manifest, dict) else None
+        return partitions if isinstance(partitions, dict) else {}
+
+    def has_partition(self, partition: str) -> bool:
+        return bool(self.available and (self._manifest().get(partition) or {}).get("parts"))
+
+    @staticmethod
+    def _overlaps(part: Dict[str, Any], date_from: Optional[str], date_to: Optional[str]) -> bool:
+        if date_from and part.get("date_max") and part["date_max"] < date_from:
+            return False
+        if date_to and part.get("date_min") and part["date_min"] > date_to:
+            return False
+        return True
+
+    def _read(
+        self,
+        partition: str,
+        columns: Optional[Iterable[str]],
+        date_from: Optional[str],
+        date_to: Optional[str],
+        newest_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        if not self.available:
+            return []
+
+        parts = (self._manifest().get(partition) or {}).get("parts") or []
+        if newest_only:
+            parts = parts[-1:]
+        wanted = list(columns) if columns else None
+
+        rows: List[Dict[str, Any]] = []
+        seen_events = set()
+        newest_part = True
+        # Newest part first: it wins for events stored more than once.
+        for part in reversed(parts):
+            if not self._overlaps(part, date_from, date_to):
+                continue
+
+            part_columns = part.get("columns") or []
+            read_columns = None
+            if wanted is not None:
+                read_columns = [c for c in wanted if c in part_columns]
+                for key in ("event_id", "match_date"):
+                    if key in part_columns and key not in read_columns:
+                        read_columns.append(key)
+
+            filters = []
+            if "match_date" in part_columns:
+                if date_from:
+                    filters.append(("match_date", ">=", date_from))
+                if date_to:
+                    filters.append(("match_date", "<=", date_to))
+
+            try:
+                table = pq.read_table(
+                    os.path.join(self.root, part["file"]),
+                    columns=read_columns,
+                    filters=filters or None,
+                )
+            except Exception:
+                continue
+
+            for row in table.to_pylist():
+                event_id = row.get("event_id")
+                if event_id is None:
+                    # Rows without an event ID cannot be deduplicated; keep the newest copy only.
+                    if not newest_part:
+                        continue
+                elif event_id in seen_events:
+                    continue
+                else:
+                    seen_events.add(event_id)
+                rows.append(row)
+            newest_part = False
+
+        return rows
+
+    def read_matches(
+        self,
+        team_name: str,
+        *,
+        columns: Optional[Iterable[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Match rows stored for a team, newest first (dates are ISO `YYYY-MM-DD`)."""
+        rows = self._read(f"matches/team={team_slug(team_name)}", columns, date_from, date_to)
+        rows.sort(key=lambda r: r.get("match_date") or "", reverse=True)
+        return rows[: max(0, int(limit))] if limit is not None else rows
+
+    def read_fixtures(
+        self,
+        *,
+        columns: Optional[Iterable[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fixtures of the newest stored snapshot, in kickoff order.
+
+        Each part is a complete fixtures snapshot, so older parts are not merged in
+        (fixtures dropped or rescheduled since would reappear).
+        """
+        rows = self._read("fixtures", columns, date_from, date_to, newest_only=True)
+        rows.sort(key=lambda r: r.get("match_date") or "")
+        return rows
@@ -0,0 +1,132 @@
+"""Database Engine
+
+Async SQLAlchemy engine and session factory for the models in `models/`.
+
+`DATABASE_URL` keeps its plain form (`postgresql://...`, as in docker-compose) and is
+mapped to an async driver: asyncpg for PostgreSQL, aiosqlite for SQLite (local runs and
+tests). PostgreSQL connections are pooled with `DATABASE_POOL_SIZE` /
+`DATABASE_MAX_OVERFLOW`.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Column, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.visitors import iterate
+
+from config.settings import get_settings
+from models import Base
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """`postgresql://...` -> `postgresql+asyncpg://...`, `sqlite:///x` -> `sqlite+aiosqlite:///x`."""
+    scheme, sep, rest = str(url).partition("://")
+    if not sep:
+        return url
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def create_engine(url: Optional[str] = None) -> AsyncEngine:
+    url = async_database_url(url or settings.DATABASE_URL)
+    kwargs: Dict[str, Any] = {}
+    if url.startswith("sqlite"):
+        if ":memory:" in url or url.endswith("://"):
+            # One shared connection, otherwise every session would see its own empty database.
+            kwargs.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        kwargs.update(
+            pool_size=int(getattr(settings, "DATABASE_POOL_SIZE", 10) or 10),
+            max_overflow=int(getattr(settings, "DATABASE_MAX_OVERFLOW", 20) or 0),
+            pool_pre_ping=True,
+        )
+    return create_async_engine(url, **kwargs)
+
+
+def create_sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _upgrade_tables(conn) -> None:
+    """Add model columns and indexes missing from tables created by an older schema.
+
+    `create_all` skips existing tables, and database/schemas only runs on a fresh
+    PostgreSQL volume, so columns (nullable ones) and indexes added to a model since are
+    added here. A model index is skipped when an existing index or the primary key
+    already covers the same columns.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            existing.add(column.name)
+            logger.info(f"Added column {table.name}.{column.name}")
+
+        unique_sets = [tuple(u["column_names"]) for u in inspector.get_unique_constraints(table.name)]
+        unique_sets += [tuple(i["column_names"]) for i in inspector.get_indexes(table.name) if i.get("unique")]
+        for column in table.columns:
+            if not column.unique or column.name not in existing or (column.name,) in unique_sets:
+                continue
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table.name}_{column.name} ON {table.name}({column.name})"
+            ))
+            logger.info(f"Added unique index on {table.name}.{column.name}")
+
+        covered = {tuple(i["column_names"]) for i in inspector.get_indexes(table.name)}
+        covered.add(tuple(inspector.get_pk_constraint(table.name).get("constrained_columns") or ()))
+        for index in table.indexes:
+            if index.unique:
+                continue
+            columns = tuple(
+                dict.fromkeys(e.name for expr in index.expressions for e in iterate(expr) if isinstance(e, Column))
+            )
+            if columns in covered or not set(columns) <= existing:
+                continue
+            index.create(conn, checkfirst=True)
+            covered.add(columns)
+            logger.info(f"Added index {index.name} on {table.name}({', '.join(columns)})")
+
+
+async def create_tables(engine: AsyncEngine) -> None:
+    """Create missing tables and columns (fresh PostgreSQL volumes get them from database/schemas)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_tables)
+
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_engine()
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker:
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = create_sessionmaker(get_engine())
+    return _sessionmaker
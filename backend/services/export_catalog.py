@@ -0,0 +1,183 @@
+"""Export Catalog
+
+In-memory index of the scraper export files, so finding the newest export for an
+opponent is a dictionary lookup instead of globbing every export directory per request.
+
+Directories are scanned once; afterwards a directory is only rescanned when it changes.
+Change detection uses inotify when `inotify_simple` is installed (Linux) and falls back
+to comparing each directory's mtime, which changes whenever an export is added or
+removed (exports are written once under timestamped names, never rewritten in place).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+    inotify_flags = None
+
+KIND_INDIVIDUAL = "individual"
+KIND_AGGREGATED = "aggregated"
+KIND_FIXTURES = "fixtures"
+
+_OPPONENT_EXPORT_RE = re.compile(
+    r"^gil_vicente_next_opponent_(?P<slug>.+)_(?P<kind>individual|aggregated)_(?P<ts>\d{8}_\d{6})\.(?:json|ndjson|jsonl)$"
+)
+_FIXTURES_EXPORT_RE = re.compile(r"^gil_vicente_fixtures_(?P<ts>\d{8}_\d{6})\.(?:json|ndjson|jsonl)$")
+
+# (timestamp, path); sorting these newest-first orders exports by scrape time.
+_Entry = Tuple[str, str]
+
+
+def opponent_key(opponent_name: str) -> str:
+    """Catalog key for an opponent as it appears in export names ("FC Porto" -> "fc_porto")."""
+    return str(opponent_name or "").strip().replace(" ", "_").lower()
+
+
+class ExportCatalog:
+    """Index of export files by (kind, opponent slug), newest first."""
+
+    def __init__(self, directories: List[str]):
+        self.directories = list(dict.fromkeys(os.path.abspath(d) for d in directories))
+        self._lock = threading.Lock()
+        self._dir_state: Dict[str, Optional[int]] = {}
+        self._dir_entries: Dict[str, Dict[Tuple[str, str], List[_Entry]]] = {}
+        self._dir_legacy: Dict[str, List[_Entry]] = {}
+        self._index: Dict[Tuple[str, str], List[_Entry]] = {}
+        self._legacy_individual: List[_Entry] = []
+
+        self._inotify = None
+        self._watched: Dict[int, str] = {}
+        self._dirty: set = set()
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+            except Exception:
+                self._inotify = None
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+    def _watch(self, directory: str) -> None:
+        if self._inotify is None or directory in self._watched.values():
+            return
+        try:
+            mask = inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MOVED_TO | inotify_flags.MOVED_FROM
+            wd = self._inotify.add_watch(directory, mask)
+            self._watched[wd] = directory
+        except Exception:
+            pass
+
+    def _scan_dir(self, directory: str) -> None:
+        entries: Dict[Tuple[str, str], List[_Entry]] = {}
+        legacy: List[_Entry] = []
+        try:
+            with os.scandir(directory) as it:
+                names = [entry.name for entry in it if entry.is_file()]
+        except OSError:
+            names = []
+
+        for name in names:
+            path = os.path.join(directory, name)
+            match = _OPPONENT_EXPORT_RE.match(name)
+            if match:
+                key = (match.group("kind"), opponent_key(match.group("slug")))
+                entries.setdefault(key, []).append((match.group("ts"), path))
+                continue
+            match = _FIXTURES_EXPORT_RE.match(name)
+            if match:
+                entries.setdefault((KIND_FIXTURES, ""), []).append((match.group("ts"), path))
+                continue
+            if name.endswith((".json", ".ndjson", ".jsonl")) and "individual" in name:
+                # Older exports used free-form names; they are only matched by substring.
+                legacy.append((name, path))
+
+        self._dir_entries[directory] = entries
+        self._dir_legacy[directory] = legacy
+
+    def _changed_directories(self) -> List[str]:
+        changed = []
+        if self._inotify is not None and self._watched:
+            try:
+                for event in self._inotify.read(timeout=0):
+                    directory = self._watched.get(event.wd)
+                    if directory:
+                        self._dirty.add(directory)
+            except Exception:
+                pass
+
+        for directory in self.directories:
+            if directory in self._watched.values() and directory in self._dir_state:
+                if directory in self._dirty:
+                    changed.append(directory)
+                continue
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            if directory not in self._dir_state or self._dir_state[directory] != mtime:
+                self._dir_state[directory] = mtime
+                changed.append(directory)
+        return changed
+
+    def refresh(self) -> None:
+        """Rescan the directories that changed since the last call and rebuild the index."""
+        with self._lock:
+            changed = self._changed_directories()
+            if not changed:
+                return
+
+            for directory in changed:
+                self._dirty.discard(directory)
+                if os.path.isdir(directory):
+                    self._watch(directory)
+                self._scan_dir(directory)
+
+            index: Dict[Tuple[str, str], List[_Entry]] = {}
+            legacy: List[_Entry] = []
+            for directory in self.directories:
+                for key, entries in (self._dir_entries.get(directory) or {}).items():
+                    index.setdefault(key, []).extend(entries)
+                legacy.extend(self._dir_legacy.get(directory) or [])
+            for entries in index.values():
+                entries.sort(reverse=True)
+            legacy.sort(reverse=True)
+
+            self._index = index
+            self._legacy_individual = legacy
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def paths(self, kind: str, opponent_name: str = "") -> List[str]:
+        """Export paths of one kind for an opponent (or fixtures), newest first."""
+        self.refresh()
+        key = (kind, opponent_key(opponent_name) if kind != KIND_FIXTURES else "")
+        return [path for _, path in self._index.get(key, [])]
+
+    def opponent_paths(self, opponent_name: str, kind: str = KIND_INDIVIDUAL) -> List[str]:
+        """Exports for an opponent; falls back to a substring match when no name matches exactly."""
+        paths = self.paths(kind, opponent_name)
+        if paths or kind != KIND_INDIVIDUAL:
+            return paths
+
+        needle = opponent_key(opponent_name)
+        if not needle:
+            return []
+        fuzzy: List[_Entry] = []
+        for (entry_kind, slug), entries in self._index.items():
+            if entry_kind == KIND_INDIVIDUAL and needle in slug:
+                fuzzy.extend(entries)
+        fuzzy.sort(reverse=True)
+        fuzzy_paths = [path for _, path in fuzzy]
+        fuzzy_paths.extend(path for name, path in self._legacy_individual if needle in name.lower())
+        return fuzzy_paths
+
+    def fixture_paths(self) -> List[str]:
+        return self.paths(KIND_FIXTURES)
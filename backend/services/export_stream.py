@@ -0,0 +1,96 @@
+"""Streaming reader for scraper export files.
+
+Yields records one at a time so callers can stop after `limit` records without holding
+the whole file (as text and as a parsed tree) in memory:
+  - NDJSON (`.ndjson` / `.jsonl`): one record per line
+  - JSON arrays (`[{...}, {...}]`): decoded element by element from fixed-size chunks
+  - JSON objects (legacy `{"fixtures": [...]}` caches): loaded whole and the list under
+    `list_key` is iterated
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def _iter_ndjson(fh) -> Iterator[Any]:
+    for line in fh:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+
+def _iter_array(fh, buf: str) -> Iterator[Any]:
+    """Decode the elements of a top-level array; `buf` starts right after the '['."""
+    pos = 0
+    eof = False
+    while True:
+        # Skip separators between elements.
+        while True:
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            chunk = fh.read(CHUNK_SIZE)
+            buf, pos = buf[pos:] + chunk, 0
+            eof = not chunk
+
+        if pos >= len(buf) or buf[pos] == "]":
+            return
+
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except ValueError:
+            value, end = None, None
+
+        # An element that is malformed or ends exactly at the buffer edge may be truncated.
+        if end is None or (end == len(buf) and not eof):
+            if eof:
+                return
+            chunk = fh.read(CHUNK_SIZE)
+            buf, pos = buf[pos:] + chunk, 0
+            eof = not chunk
+            continue
+
+        yield value
+        pos = end
+        if pos > CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def iter_export_records(path: str, list_key: Optional[str] = None) -> Iterator[Any]:
+    """Yield the records of an export file; unreadable files yield nothing."""
+    try:
+        fh = open(path, "r", encoding="utf-8")
+    except OSError:
+        return
+
+    with fh:
+        if path.endswith((".ndjson", ".jsonl")):
+            yield from _iter_ndjson(fh)
+            return
+
+        buf = fh.read(CHUNK_SIZE)
+        stripped = buf.lstrip(_WHITESPACE + "\ufeff")
+        if stripped.startswith("["):
+            yield from _iter_array(fh, stripped[1:])
+            return
+
+        if stripped.startswith("{"):
+            try:
+                data = json.loads(stripped + fh.read())
+            except ValueError:
+                return
+            items = data.get(list_key) if list_key and isinstance(data, dict) else None
+            if isinstance(items, list):
+                yield from items
@@ -0,0 +1,60 @@
+"""Fixture Index
+
+Lookups over a focal team's fixtures (the `fixtures` list of `load_fixtures`), built once
+per fixtures build instead of scanning the list on every request:
+  - `upcoming`: fixtures not finished yet, by kickoff
+  - `by_status`: fixtures per status, by kickoff
+  - `opponent_name`: name of an opponent by its ID
+  - `opponents`: every opponent once, by name
+
+Fixtures are normalized when they are ingested (manual file, SofaScore, scraper exports)
+and cached with an `indexed_at` stamp. An index is kept per focal team namespace and
+reused for as long as the cached fixtures carry the same stamp, so a cache hit neither
+normalizes nor indexes the fixtures again.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+
+def kickoff_key(fixture: Dict[str, Any]) -> tuple:
+    return (fixture.get("date") or "", fixture.get("time") or "")
+
+
+class FixtureIndex:
+    def __init__(self, fixtures: List[Dict[str, Any]], stamp: Optional[float] = None):
+        self.stamp = stamp
+        self.fixtures = sorted((f for f in fixtures if isinstance(f, dict)), key=kickoff_key)
+        self.by_status: Dict[str, List[Dict[str, Any]]] = {}
+        self._names: Dict[str, str] = {}
+        opponents: Dict[Any, Dict[str, Any]] = {}
+
+        for f in self.fixtures:
+            self.by_status.setdefault(f.get("status"), []).append(f)
+            opponent_id = f.get("opponent_id")
+            name = f.get("opponent_name")
+            if opponent_id not in opponents:
+                opponents[opponent_id] = {"id": opponent_id, "name": name}
+            if isinstance(name, str) and name:
+                self._names.setdefault(str(opponent_id), name)
+
+        self.upcoming = [f for f in self.fixtures if f.get("status") != "finished"]
+        self.opponents = sorted(opponents.values(), key=lambda o: o.get("name") or "")
+
+    def opponent_name(self, opponent_id: Any) -> Optional[str]:
+        return self._names.get(str(opponent_id))
+
+
+_indexes: Dict[str, FixtureIndex] = {}
+
+
+def get_fixture_index(namespace: str, data: Dict[str, Any]) -> FixtureIndex:
+    """The index of a fixtures build (`load_fixtures` result), reused while its stamp is unchanged."""
+    stamp = data.get("indexed_at")
+    index = _indexes.get(namespace)
+    if index is None or stamp is None or index.stamp != stamp:
+        index = FixtureIndex(data.get("fixtures") or [], stamp)
+        if stamp is not None:
+            _indexes[namespace] = index
+    return index
@@ -0,0 +1,77 @@
+"""Focal Teams
+
+The club an analysis is prepared for. One deployment serves every team listed in
+`FOCAL_TEAMS_JSON` (`{"<SofaScore team ID>": "<name>"}`); requests pick one with
+`focal_team_id` and fall back to `GIL_VICENTE_TEAM_ID`.
+
+Everything that depends on the focal team (fixtures, analysis snapshots, analysis jobs,
+live tracking) is stored under `FocalTeam.namespace`, so teams never share or duplicate
+each other's entries.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.settings import get_settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+DEFAULT_TEAM_NAME = "Gil Vicente"
+
+
+class UnknownFocalTeamError(LookupError):
+    """The requested team is not configured as a focal team."""
+
+
+@dataclass(frozen=True)
+class FocalTeam:
+    id: int
+    name: str
+
+    @property
+    def namespace(self) -> str:
+        return f"team_{self.id}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name}
+
+
+def default_team_id() -> int:
+    return int(getattr(settings, "GIL_VICENTE_TEAM_ID", 9764) or 9764)
+
+
+_teams: Optional[Dict[int, FocalTeam]] = None
+
+
+def focal_teams() -> Dict[int, FocalTeam]:
+    """Configured focal teams by SofaScore ID (always including the default team)."""
+    global _teams
+    if _teams is None:
+        teams: Dict[int, FocalTeam] = {}
+        raw = str(getattr(settings, "FOCAL_TEAMS_JSON", "") or "").strip()
+        if raw:
+            try:
+                for team_id, name in json.loads(raw).items():
+                    teams[int(team_id)] = FocalTeam(int(team_id), str(name))
+            except Exception as e:
+                logger.error(f"Invalid FOCAL_TEAMS_JSON, serving the default team only: {e}")
+                teams = {}
+        default_id = default_team_id()
+        teams.setdefault(default_id, FocalTeam(default_id, DEFAULT_TEAM_NAME))
+        _teams = teams
+    return _teams
+
+
+def get_focal_team(team_id: Any = None) -> FocalTeam:
+    """The focal team with this SofaScore ID (the default team when None)."""
+    if team_id in (None, ""):
+        return focal_teams()[default_team_id()]
+    try:
+        return focal_teams()[int(team_id)]
+    except (KeyError, TypeError, ValueError):
+        raise UnknownFocalTeamError(f"Team {team_id} is not a configured focal team")
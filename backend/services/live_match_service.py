@@ -0,0 +1,303 @@
+"""Live Match Service
+
+Tracks a focal team's in-progress match (one service per team, see
+`get_live_match_service`). One poller fetches the SofaScore event,
+statistics and incidents endpoints and fans each change out to every subscriber (SSE and
+WebSocket clients), so upstream load does not grow with the number of viewers. The
+poller only runs while someone is subscribed.
+
+Successive payloads are diffed and only the affected parts are recomputed:
+  - statistics payload changed: metrics are re-extracted and the tactical stats rebuilt
+  - only the score/status changed: the tactical stats are rebuilt from the previously
+    extracted metrics and `AdvancedStatsAnalyzer` (which only reads the score) re-runs
+  - incidents: only the ones not seen before are sent
+Subscribers receive a `snapshot` first and then `update` messages that carry just the
+changed sections.
+
+The poll interval adapts: `LIVE_POLL_MIN_SECONDS` right after a change, growing towards
+`LIVE_POLL_MAX_SECONDS` while nothing changes (and at half-time), and
+`LIVE_IDLE_POLL_SECONDS` while no match is in progress.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from config.settings import get_settings
+from services.advanced_stats_analyzer import get_advanced_stats_analyzer
+from services.focal_team import DEFAULT_TEAM_NAME, FocalTeam, default_team_id, get_focal_team
+from services.match_analysis_service import MatchAnalysisService, invalidate_focal_form
+from services.sofascore_service import SofaScoreService, get_sofascore_service
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+_BACKOFF_FACTOR = 1.5
+
+
+def _status_type(event: Dict[str, Any]) -> str:
+    return str((event.get("status") or {}).get("type") or "").lower()
+
+
+def _is_halftime(event: Dict[str, Any]) -> bool:
+    status = event.get("status") or {}
+    return status.get("code") == 31 or "halftime" in str(status.get("description") or "").lower().replace(" ", "")
+
+
+def _changed_sections(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in new.items() if key not in old or old[key] != value}
+
+
+class LiveMatchState:
+    """Incrementally maintained view of one in-progress event."""
+
+    def __init__(self, event_id: int, team_id: int, team_name: str = "Gil Vicente"):
+        self.event_id = int(event_id)
+        self.team_id = int(team_id)
+        self.team_name = team_name
+        self.version = 0
+        self.polled_at: Optional[float] = None
+
+        self.summary: Dict[str, Any] = {}
+        self.tactical_stats: Dict[str, Any] = {}
+        self.advanced_stats: Dict[str, Any] = {}
+        self.incidents: List[Dict[str, Any]] = []
+
+        self._stats_raw: Optional[Dict[str, Any]] = None
+        self._extracted: Optional[Dict[str, Any]] = None
+        self._incident_keys: Set[Any] = set()
+
+    @staticmethod
+    def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+        status = event.get("status") or {}
+        return {
+            "event_id": event.get("id"),
+            "home": (event.get("homeTeam") or {}).get("name"),
+            "away": (event.get("awayTeam") or {}).get("name"),
+            "home_score": (event.get("homeScore") or {}).get("current"),
+            "away_score": (event.get("awayScore") or {}).get("current"),
+            "status": status.get("type"),
+            "status_description": status.get("description"),
+            "start_timestamp": event.get("startTimestamp"),
+        }
+
+    @staticmethod
+    def _incident_key(incident: Dict[str, Any]) -> Any:
+        if incident.get("id") is not None:
+            return incident["id"]
+        return (incident.get("incidentType"), incident.get("time"), incident.get("addedTime"), incident.get("isHome"))
+
+    def apply(
+        self,
+        sofa: SofaScoreService,
+        analyzer,
+        event: Dict[str, Any],
+        stats_raw: Dict[str, Any],
+        incidents: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """Fold one poll into the state; returns the changed parts or None when nothing changed."""
+        self.polled_at = time.time()
+        changes: Dict[str, Any] = {}
+
+        summary = self.summarize_event(event)
+        event_changed = summary != self.summary
+        if event_changed:
+            changes["event"] = summary
+            self.summary = summary
+
+        stats_changed = stats_raw != self._stats_raw
+        if stats_changed:
+            self._stats_raw = stats_raw
+            self._extracted = sofa.extract_event_stats(event=event, team_id=self.team_id, stats_raw=stats_raw or {})
+
+        if stats_changed or event_changed:
+            tactical = sofa.build_tactical_stats(event=event, team_id=self.team_id, stats=self._extracted or {})
+            changed = _changed_sections(self.tactical_stats, tactical)
+            if changed:
+                changes["tactical_stats"] = changed
+            self.tactical_stats = tactical
+
+        if event_changed:
+            match = MatchAnalysisService.event_to_match(event)
+            advanced = analyzer.analyze_game(match, self.team_name) if match else {}
+            changed = _changed_sections(self.advanced_stats, advanced)
+            if changed:
+                changes["advanced_stats"] = changed
+            self.advanced_stats = advanced
+
+        new_incidents = []
+        for incident in incidents or []:
+            if not isinstance(incident, dict):
+                continue
+            key = self._incident_key(incident)
+            if key not in self._incident_keys:
+                self._incident_keys.add(key)
+                new_incidents.append(incident)
+        if new_incidents:
+            changes["incidents"] = new_incidents
+            self.incidents = new_incidents + self.incidents
+
+        if not changes:
+            return None
+        self.version += 1
+        return {"type": "update", "event_id": self.event_id, "version": self.version, **changes}
+
+    def snapshot(self, message_type: str = "snapshot") -> Dict[str, Any]:
+        return {
+            "type": message_type,
+            "event_id": self.event_id,
+            "version": self.version,
+            "polled_at": self.polled_at,
+            "event": self.summary,
+            "tactical_stats": self.tactical_stats,
+            "advanced_stats": self.advanced_stats,
+            "incidents": self.incidents,
+        }
+
+
+class LiveMatchService:
+    def __init__(
+        self,
+        sofa: Optional[SofaScoreService] = None,
+        analyzer=None,
+        team_id: Optional[int] = None,
+        team_name: Optional[str] = None,
+    ):
+        self.sofa = sofa or get_sofascore_service()
+        self.analyzer = analyzer or get_advanced_stats_analyzer()
+        self.team_id = int(team_id or default_team_id())
+        self.team_name = team_name or DEFAULT_TEAM_NAME
+        self.min_interval = float(getattr(settings, "LIVE_POLL_MIN_SECONDS", 10) or 10)
+        self.max_interval = max(self.min_interval, float(getattr(settings, "LIVE_POLL_MAX_SECONDS", 60) or 60))
+        self.idle_interval = float(getattr(settings, "LIVE_IDLE_POLL_SECONDS", 300) or 300)
+        self.queue_size = int(getattr(settings, "LIVE_SUBSCRIBER_QUEUE_SIZE", 100) or 100)
+
+        self.state: Optional[LiveMatchState] = None
+        self.interval = self.idle_interval
+        self._last_poll: Optional[float] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._poller: Optional[asyncio.Task] = None
+        self._poll_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+    async def _current_event(self) -> Optional[Dict[str, Any]]:
+        if self.state is not None:
+            return await self.sofa.get_event(self.state.event_id)
+        return await self.sofa.get_live_event(self.team_id)
+
+    async def poll_once(self) -> List[Dict[str, Any]]:
+        """One upstream round (event, then statistics + incidents); returns the messages to publish."""
+        async with self._poll_lock:
+            self._last_poll = time.time()
+            event = await self._current_event()
+
+            if not event or _status_type(event) != "inprogress":
+                self.interval = self.idle_interval
+                if self.state is None:
+                    return []
+                finished = self.state
+                self.state = None
+                if event:
+                    finished.summary = LiveMatchState.summarize_event(event)
+                logger.info(f"Live match {finished.event_id} is no longer in progress")
+                try:
+                    await invalidate_focal_form(self.team_id)
+                except Exception as e:
+                    logger.warning(f"Focal form invalidation failed for team {self.team_id}: {e}")
+                return [finished.snapshot("finished")]
+
+            messages: List[Dict[str, Any]] = []
+            if self.state is None or self.state.event_id != int(event.get("id") or 0):
+                self.state = LiveMatchState(int(event["id"]), self.team_id, self.team_name)
+                logger.info(f"Tracking live match {self.state.event_id}")
+
+            stats_raw, incidents = await asyncio.gather(
+                self.sofa.get_event_statistics(self.state.event_id),
+                self.sofa.get_event_incidents(self.state.event_id),
+            )
+            first_poll = self.state.polled_at is None
+            update = self.state.apply(self.sofa, self.analyzer, event, stats_raw, incidents)
+
+            if first_poll:
+                messages.append(self.state.snapshot())
+            elif update:
+                messages.append(update)
+
+            self.interval = self._next_interval(event, changed=bool(update))
+            return messages
+
+    def _next_interval(self, event: Dict[str, Any], changed: bool) -> float:
+        if _is_halftime(event):
+            return self.max_interval
+        if changed:
+            return self.min_interval
+        return min(self.max_interval, max(self.min_interval, self.interval) * _BACKOFF_FACTOR)
+
+    async def current(self) -> Dict[str, Any]:
+        """Current snapshot; polls upstream only when nobody else has within `min_interval`."""
+        poller_running = self._poller is not None and not self._poller.done()
+        recent = self._last_poll is not None and time.time() - self._last_poll < self.min_interval
+        if not poller_running and not recent:
+            for message in await self.poll_once():
+                self._publish(message)
+        if self.state is None:
+            return {"type": "idle", "team_id": self.team_id, "detail": "No match in progress"}
+        return self.state.snapshot()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                for message in await self.poll_once():
+                    self._publish(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live match poll failed: {e}")
+                self.interval = self.max_interval
+            await asyncio.sleep(self.interval)
+
+    # ------------------------------------------------------------------
+    # Fan-out
+    # ------------------------------------------------------------------
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client; it gets the current snapshot (if any) and every later message."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.state is not None and self.state.polled_at is not None:
+            queue.put_nowait(self.state.snapshot())
+        self._subscribers.add(queue)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    def _publish(self, message: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers):
+            if not queue.full():
+                queue.put_nowait(message)
+                continue
+            # A client that fell behind is resynced with one snapshot instead of stalling
+            # the poller; the updates it missed are contained in it.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self.state.snapshot() if self.state is not None else message)
+
+
+_services: Dict[int, LiveMatchService] = {}
+
+
+def get_live_match_service(team: Optional[FocalTeam] = None) -> LiveMatchService:
+    """The live tracker of a focal team (default team when None); one per team."""
+    team = team or get_focal_team()
+    if team.id not in _services:
+        _services[team.id] = LiveMatchService(team_id=team.id, team_name=team.name)
+    return _services[team.id]
@@ -1,26 +1,33 @@
-"""Match Analysis Service driven by SofaScore data (no external paid API)."""
-
+"""Match Analysis Service driven by SofaScore data (no external paid API).
+
+The focal team's form (`gil_vicente_form` / `gil_attacking_analysis`) is the same for
+every opponent analyzed in a week, so it is kept per focal team (in this process and in
+the `focal_form` cache) together with the newest finished event and the next kickoff.
+Until that match can have finished (`kickoff + FOCAL_FORM_MATCH_SECONDS`) it is served
+without any upstream request; afterwards the last events are read again and the form is
+only rebuilt when a new match has finished. The live tracker drops it at full time.
+"""
+
+import asyncio
+import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from config.settings import get_settings
 from services.advanced_stats_analyzer import get_advanced_stats_analyzer
+from services.cache_service import get_cache_service
+from services.focal_team import FocalTeam, get_focal_team
+from services.match_history_service import get_match_history_service
 from services.scraper_export_service import get_scraper_export_service
 from services.sofascore_service import get_sofascore_service
 from services.tactical_ai_engine import get_tactical_ai_engine
+from services.tactical_profile_service import profile_from_recent_games
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 settings = get_settings()
 
-
-def _safe_get(d: Dict, *keys, default=None):
-    cur = d
-    for key in keys:
-        if not isinstance(cur, dict):
-            return default
-        cur = cur.get(key)
-    return cur if cur is not None else default
+FOCAL_FORM_CACHE_TYPE = "focal_form"
 
 
 class MatchAnalysisService:
@@ -29,117 +36,94 @@ class MatchAnalysisService:
         self.ai_engine = get_tactical_ai_engine()
         self.sofa = get_sofascore_service()
         self.scraper_exports = get_scraper_export_service()
-
-    def _profile_from_recent_games(self, recent_games_tactical: List[Dict]) -> Dict:
-        """Build a stable opponent profile by averaging per-match tactical stats."""
-        if not recent_games_tactical:
-            return {}
-
-        def _mean(values):
-            values = [v for v in values if isinstance(v, (int, float))]
-            if not values:
-                return None
-            return sum(values) / len(values)
-
-        possession = [_safe_get(m, "possession_control", "possession_percent") for m in recent_games_tactical]
-        pass_acc = [_safe_get(m, "possession_control", "pass_accuracy") for m in recent_games_tactical]
-        ppm = [_safe_get(m, "possession_control", "passes_per_minute") for m in recent_games_tactical]
-
-        shots = [_safe_get(m, "shooting_finishing", "total_shots") for m in recent_games_tactical]
-        shots_on = [_safe_get(m, "shooting_finishing", "shots_on_target") for m in recent_games_tactical]
-        big = [_safe_get(m, "shooting_finishing", "big_chances_created") for m in recent_games_tactical]
-        xg = [_safe_get(m, "expected_metrics", "xG") for m in recent_games_tactical]
-        xg_shot = [_safe_get(m, "expected_metrics", "xG_per_shot") for m in recent_games_tactical]
-
-        corners = [_safe_get(m, "set_pieces", "attacking", "corners_taken") for m in recent_games_tactical]
-        corners_conc = [_safe_get(m, "set_pieces", "defensive", "corners_conceded") for m in recent_games_tactical]
-
-        interceptions = [_safe_get(m, "defensive_actions", "interceptions") for m in recent_games_tactical]
-        clearances = [_safe_get(m, "defensive_actions", "clearances") for m in recent_games_tactical]
-        blocks = [_safe_get(m, "defensive_actions", "blocks") for m in recent_games_tactical]
-
-        latest = recent_games_tactical[0] if isinstance(recent_games_tactical[0], dict) else {}
-
-        profile = {
-            "estimated": any(bool(m.get("estimated", True)) for m in recent_games_tactical),
-            "matches_analyzed": len(recent_games_tactical),
-            "possession_control": {
-                "possession_percent": _mean(possession),
-                "pass_accuracy": _mean(pass_acc),
-                "passes_per_minute": _mean(ppm),
-            },
-            "shooting_finishing": {
-                "total_shots": _mean(shots),
-                "shots_on_target": _mean(shots_on),
-                "big_chances_created": _mean(big),
-            },
-            "expected_metrics": {
-                "xG": _mean(xg),
-                "xG_per_shot": _mean(xg_shot),
-            },
-            "defensive_actions": {
-                "interceptions": _mean(interceptions),
-                "clearances": _mean(clearances),
-                "blocks": _mean(blocks),
-            },
-            "set_pieces": {
-                "attacking": {"corners_taken": _mean(corners)},
-                "defensive": {"corners_conceded": _mean(corners_conc)},
-            },
-        }
-
-        # Keep non-numeric/categorical structures from the latest match (best available signal).
-        for key in ("pressing_structure", "team_shape", "transitions", "context", "match_info"):
-            if key in latest:
-                profile[key] = latest.get(key)
-
-        return profile
-
-    async def analyze_match(self, opponent_id: str, opponent_name: str) -> Dict:
+        self.history = get_match_history_service()
+        self.cache = get_cache_service()
+        self.focal_match_seconds = int(getattr(settings, "FOCAL_FORM_MATCH_SECONDS", 9000) or 9000)
+        self.focal_max_age_seconds = int(getattr(settings, "FOCAL_FORM_MAX_AGE_SECONDS", 86400) or 86400)
+        self._focal_forms: Dict[int, Dict] = {}
+        self._focal_locks: Dict[int, asyncio.Lock] = {}
+
+    async def analyze_match(self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None) -> Dict:
         """Generate comprehensive match analysis using only SofaScore data."""
+        analysis: Dict = {}
+        async for section, payload in self.stream_analysis(opponent_id, opponent_name, team):
+            if section == "complete":
+                analysis = payload
+        return analysis
+
+    async def stream_analysis(
+        self, opponent_id: str, opponent_name: str, team: Optional[FocalTeam] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Yield `(section, payload)` pairs as each stage of the analysis finishes.
+
+        Sections, in order: `gil_vicente_form`, `opponent_form`, one `recent_game_tactical`
+        per analyzed event, `opponent_advanced_stats`, `ai_recommendations` and finally
+        `complete` with the same response `analyze_match` returns. `team` is the focal team
+        (default team when None); its form keeps the `gil_vicente_form` keys.
+        """
         try:
-            gil_id = str(getattr(settings, "GIL_VICENTE_TEAM_ID", 9764) or 9764)
+            team = team or get_focal_team()
 
-            gil_events = await self.sofa.get_last_finished_events(int(gil_id), limit=10)
-            opp_events = await self.sofa.get_last_finished_events(int(opponent_id), limit=10)
+            focal = await self.focal_form(team)
+            gil_form = focal["gil_vicente_form"]
+            gil_attacking = focal["gil_attacking_analysis"]
+            yield "gil_vicente_form", {"gil_vicente_form": gil_form, "gil_attacking_analysis": gil_attacking}
 
-            gil_matches = [self._event_to_match(ev) for ev in gil_events if ev]
-            opp_matches = [self._event_to_match(ev) for ev in opp_events if ev]
-
-            gil_matches = [m for m in gil_matches if m]
-            opp_matches = [m for m in opp_matches if m]
-
-            gil_form = self._build_form(gil_matches, gil_id, "Gil Vicente")
+            opp_events = await self.history.last_finished_events(int(opponent_id), limit=10)
+            opp_matches = [m for m in (self.event_to_match(ev) for ev in opp_events if ev) if m]
             opp_form = self._build_form(opp_matches, opponent_id, opponent_name)
+            defensive_vulnerabilities = self._analyze_defensive_vulnerabilities(opp_form)
+            game_plan = self._generate_game_plan(gil_form, opp_form)
+            yield "opponent_form", {
+                "opponent_form": opp_form,
+                "defensive_vulnerabilities": defensive_vulnerabilities,
+                "tactical_game_plan": game_plan,
+            }
 
             opponent_advanced_stats: Dict[str, any] = {}
             if opp_matches:
                 opponent_advanced_stats = self.stats_analyzer.analyze_last_game(opp_matches, opponent_name)
 
-            recent_games_tactical = await self.sofa.get_recent_games_tactical(
-                opponent_name, limit=5, team_id=int(opponent_id)
-            )
+            recent_games_tactical: List[Dict] = []
             data_source = "sofascore"
+            async for game in self.history.iter_recent_games_tactical(
+                opponent_name, limit=5, team_id=int(opponent_id), events=opp_events
+            ):
+                recent_games_tactical.append(game)
+                yield "recent_game_tactical", {"index": len(recent_games_tactical) - 1, "game": game, "data_source": data_source}
+
             if not recent_games_tactical:
                 recent_games_tactical = self.scraper_exports.load_recent_games_tactical(opponent_name, limit=5)
                 if recent_games_tactical:
                     data_source = "scraper_export"
+                    for index, game in enumerate(recent_games_tactical):
+                        yield "recent_game_tactical", {"index": index, "game": game, "data_source": data_source}
 
             if recent_games_tactical:
-                opponent_advanced_stats = self._profile_from_recent_games(recent_games_tactical) or recent_games_tactical[0]
+                stored_profile = None
+                if data_source == "sofascore":
+                    stored_profile = await self.history.tactical_profile(
+                        int(opponent_id), games_in_hand=len(recent_games_tactical)
+                    )
+                opponent_advanced_stats = (
+                    stored_profile or profile_from_recent_games(recent_games_tactical) or recent_games_tactical[0]
+                )
+            yield "opponent_advanced_stats", {"opponent_advanced_stats": opponent_advanced_stats, "data_source": data_source}
 
             ai_recommendations = self.ai_engine.generate_recommendations(
                 opponent_advanced_stats,
                 None,
             )
+            yield "ai_recommendations", {"ai_recommendations": ai_recommendations}
 
-            return {
-                "match": f"Gil Vicente vs {opponent_name}",
+            yield "complete", {
+                "match": f"{team.name} vs {opponent_name}",
+                "focal_team": team.as_dict(),
                 "gil_vicente_form": gil_form,
                 "opponent_form": opp_form,
-                "defensive_vulnerabilities": self._analyze_defensive_vulnerabilities(opp_form),
-                "gil_attacking_analysis": self._analyze_gil_attacking(gil_form),
-                "tactical_game_plan": self._generate_game_plan(gil_form, opp_form),
+                "defensive_vulnerabilities": defensive_vulnerabilities,
+                "gil_attacking_analysis": gil_attacking,
+                "tactical_game_plan": game_plan,
                 "opponent_advanced_stats": opponent_advanced_stats,
                 "recent_games_tactical": recent_games_tactical,
                 "data_source": data_source,
@@ -151,7 +135,61 @@ class MatchAnalysisService:
             logger.error(f"Analysis error: {str(e)}")
             raise
 
-    def _event_to_match(self, event: Dict) -> Optional[Dict]:
+    # ------------------------------------------------------------------
+    # Focal team form (shared by every opponent analysis)
+    # ------------------------------------------------------------------
+    async def focal_form(self, team: FocalTeam) -> Dict:
+        """`gil_vicente_form` and `gil_attacking_analysis` of the focal team (see module docstring)."""
+        lock = self._focal_locks.setdefault(team.id, asyncio.Lock())
+        async with lock:
+            now = time.time()
+            entry = self._focal_forms.get(team.id)
+            if entry is None:
+                entry = await self.cache.get(FOCAL_FORM_CACHE_TYPE, "current", namespace=team.namespace)
+            if entry and now < float(entry.get("check_after") or 0):
+                self._focal_forms[team.id] = entry
+                return entry
+
+            events = await self.history.last_finished_events(team.id, limit=10)
+            finished = [ev for ev in events if isinstance(ev, dict) and ev.get("id")]
+            last_event_id = max(finished, key=lambda ev: ev.get("startTimestamp") or 0)["id"] if finished else None
+            if not entry or last_event_id is None or entry.get("last_event_id") != last_event_id:
+                matches = [m for m in (self.event_to_match(ev) for ev in events if ev) if m]
+                form = self._build_form(matches, str(team.id), team.name)
+                entry = {
+                    "gil_vicente_form": form,
+                    "gil_attacking_analysis": self._analyze_gil_attacking(form),
+                    "last_event_id": last_event_id,
+                    "computed_at": now,
+                }
+                logger.info(f"Focal form rebuilt for team {team.id} (last event {last_event_id})")
+            entry = {**entry, "check_after": await self._focal_check_after(team, now)}
+
+            self._focal_forms[team.id] = entry
+            await self.cache.set(
+                FOCAL_FORM_CACHE_TYPE, "current", entry, ttl=self.focal_max_age_seconds, namespace=team.namespace
+            )
+            return entry
+
+    async def _focal_check_after(self, team: FocalTeam, now: float) -> float:
+        """When a new match of the team can first have finished (its next kickoff + match time)."""
+        try:
+            upcoming = await self.sofa.get_upcoming_events(team.id, limit=1, max_pages=1)
+        except Exception as e:
+            logger.warning(f"Next event lookup failed for team {team.id}: {e}")
+            upcoming = []
+        kickoff = (upcoming[0] or {}).get("startTimestamp") if upcoming else None
+        if not isinstance(kickoff, (int, float)):
+            return now + self.focal_max_age_seconds
+        return min(max(float(kickoff), now) + self.focal_match_seconds, now + self.focal_max_age_seconds)
+
+    async def invalidate_focal_form(self, team_id: int) -> None:
+        """Drop the team's form (a new match of the team has finished)."""
+        self._focal_forms.pop(int(team_id), None)
+        await self.cache.delete(FOCAL_FORM_CACHE_TYPE, "current", namespace=f"team_{int(team_id)}")
+
+    @staticmethod
+    def event_to_match(event: Dict) -> Optional[Dict]:
         """Convert a SofaScore event into the lightweight match shape used by analyzers."""
         if not isinstance(event, dict):
             return None
@@ -315,3 +353,9 @@ def get_match_analysis_service() -> MatchAnalysisService:
     if _service is None:
         _service = MatchAnalysisService()
     return _service
+
+
+async def invalidate_focal_form(team_id: int) -> None:
+    """Drop the team's shared form in this process (no-op before any analysis ran)."""
+    if _service is not None:
+        await _service.invalidate_focal_form(team_id)
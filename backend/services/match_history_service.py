@@ -0,0 +1,235 @@
+"""Match History Service
+
+Team match history for the analyses, read from the database and topped up from
+SofaScore:
+  - finished events: a team synced within `MATCH_HISTORY_SYNC_SECONDS` is served from
+    the `matches` table alone; otherwise the newest events page is fetched and
+    bulk-upserted first (a full backfill only while fewer than `limit` are stored)
+  - per-event statistics: only events without stored statistics are requested upstream;
+    the metrics extracted for both sides are stored with the match and folded into both
+    teams' tactical profiles (see tactical_profile_service.py)
+
+When the database is disabled (`MATCH_HISTORY_DB_ENABLED`) or unreachable, everything is
+fetched from SofaScore as before; an unreachable database is retried after a cooldown.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from config.settings import get_settings
+from services.match_repository import MatchRepository, get_match_repository
+from services.sofascore_service import SofaScoreService, get_sofascore_service
+from services.tactical_profile_service import TacticalProfileService
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+DB_RETRY_SECONDS = 60
+
+
+def _event_team_id(event: Dict[str, Any], side: str) -> int:
+    try:
+        return int((event.get(f"{side}Team") or {}).get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _games_covered(profile: Optional[Dict[str, Any]]) -> int:
+    return int((profile or {}).get("matches_analyzed") or 0)
+
+
+class MatchHistoryService:
+    def __init__(
+        self,
+        sofa: Optional[SofaScoreService] = None,
+        repository: Optional[MatchRepository] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.sofa = sofa or get_sofascore_service()
+        self._repository = repository
+        self.enabled = bool(getattr(settings, "MATCH_HISTORY_DB_ENABLED", True)) if enabled is None else enabled
+        self.sync_seconds = int(getattr(settings, "MATCH_HISTORY_SYNC_SECONDS", 900) or 0)
+        self._synced_at: Dict[int, float] = {}
+        self._retry_at = 0.0
+        self.profiles: Optional[TacticalProfileService] = None
+
+    async def repository(self) -> Optional[MatchRepository]:
+        """The repository, or None while the database is disabled or unreachable."""
+        if not self.enabled or time.time() < self._retry_at:
+            return None
+        if self._repository is None:
+            self._repository = get_match_repository()
+        try:
+            await self._repository.init()
+        except Exception as e:
+            self._unavailable(e)
+            return None
+        if self.profiles is None:
+            self.profiles = TacticalProfileService(self._repository)
+        return self._repository
+
+    def _unavailable(self, error: Exception) -> None:
+        logger.warning(f"Match history database unavailable, using SofaScore only: {error}")
+        self._retry_at = time.time() + DB_RETRY_SECONDS
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+    async def last_finished_events(self, team_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """The team's last `limit` finished events in SofaScore shape, oldest first."""
+        team_id = int(team_id)
+        repo = await self.repository()
+        if repo is None:
+            return await self.sofa.get_last_finished_events(team_id, limit=limit)
+
+        try:
+            stored = await repo.finished_events(team_id, limit)
+            synced_at = self._synced_at.get(team_id)
+            if len(stored) >= limit and synced_at is not None and time.time() - synced_at < self.sync_seconds:
+                return stored
+
+            max_pages = 1 if len(stored) >= limit else 3
+            fetched = await self.sofa.get_last_finished_events(team_id, limit=max(limit, 100), max_pages=max_pages)
+            if fetched:
+                await repo.upsert_events(fetched)
+            self._synced_at[team_id] = time.time()
+            return await repo.finished_events(team_id, limit)
+        except Exception as e:
+            self._unavailable(e)
+            return await self.sofa.get_last_finished_events(team_id, limit=limit)
+
+    async def ingest_events(
+        self,
+        events: List[Dict[str, Any]],
+        statistics: Optional[Dict[int, Dict[str, Dict[str, Any]]]] = None,
+    ) -> int:
+        """Upsert events (with their extracted statistics) and fold finished ones into the teams' profiles."""
+        repo = await self.repository()
+        if repo is None:
+            return 0
+        statistics = statistics or {}
+        written = await repo.upsert_events(events, statistics)
+
+        games: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        for ev in events:
+            stats = statistics.get(int(ev.get("id") or 0))
+            if not stats or str((ev.get("status") or {}).get("type") or "").lower() != "finished":
+                continue
+            for side in ("home", "away"):
+                team_id = _event_team_id(ev, side)
+                if team_id and stats.get(side):
+                    game = self.sofa.build_tactical_stats(event=ev, team_id=team_id, stats=stats[side])
+                    games.setdefault(team_id, []).append((int(ev["id"]), game))
+        for team_id, team_games in games.items():
+            await self.profiles.fold(team_id, team_games)
+        return written
+
+    # ------------------------------------------------------------------
+    # Tactical stats
+    # ------------------------------------------------------------------
+    async def tactical_profile(self, team_id: int, games_in_hand: int = 0) -> Optional[Dict[str, Any]]:
+        """The team's stored profile over its last games, or None without one.
+
+        A profile covering fewer games than the caller has in hand (e.g. statistics stored
+        before profiles were maintained were never folded) is first backfilled from the
+        stored statistics; None when it still covers fewer.
+        """
+        repo = await self.repository()
+        if repo is None:
+            return None
+        team_id = int(team_id)
+        needed = min(int(games_in_hand), self.profiles.window)
+        try:
+            profile = await self.profiles.get(team_id)
+            if _games_covered(profile) < needed:
+                await self._backfill_profile(repo, team_id)
+                profile = await self.profiles.get(team_id)
+        except Exception as e:
+            self._unavailable(e)
+            return None
+        return profile if _games_covered(profile) >= max(needed, 1) else None
+
+    async def _backfill_profile(self, repo: MatchRepository, team_id: int) -> None:
+        """Fold the team's last stored events with statistics into its profile."""
+        events = await repo.finished_events(team_id, self.profiles.window)
+        stored = await repo.event_statistics(int(ev["id"]) for ev in events)
+        games = []
+        for ev in events:
+            stats = stored.get(int(ev["id"])) or {}
+            side = "home" if _event_team_id(ev, "home") == team_id else "away"
+            if stats.get(side):
+                games.append((int(ev["id"]), self.sofa.build_tactical_stats(event=ev, team_id=team_id, stats=stats[side])))
+        await self.profiles.fold(team_id, games)
+
+    async def _event_statistics(self, repo: Optional[MatchRepository], event: Dict[str, Any]) -> Dict[str, Any]:
+        """Extracted metrics of both sides, fetched from SofaScore (and stored when possible)."""
+        stats_raw = await self.sofa.get_event_statistics(int(event["id"]))
+        if not stats_raw:
+            return {}
+        stats = {
+            side: self.sofa.extract_event_stats(event=event, team_id=_event_team_id(event, side), stats_raw=stats_raw)
+            for side in ("home", "away")
+        }
+        if repo is not None:
+            try:
+                await self.ingest_events([event], {int(event["id"]): stats})
+            except Exception as e:
+                self._unavailable(e)
+        return stats
+
+    async def iter_recent_games_tactical(
+        self,
+        team_name: str,
+        limit: int = 5,
+        team_id: Optional[int] = None,
+        events: Optional[List[Dict[str, Any]]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Normalized tactical stats of the team's last `limit` games, newest first.
+
+        `events` (e.g. from `last_finished_events`) avoids fetching the event list again.
+        """
+        if not self.sofa.enabled:
+            return
+
+        resolved_id = int(team_id) if team_id else await self.sofa.resolve_team_id(team_name)
+        if not resolved_id:
+            return
+        if events is None:
+            events = await self.last_finished_events(resolved_id, limit=limit)
+
+        recent = [ev for ev in events if isinstance(ev, dict) and ev.get("id")]
+        recent.sort(key=lambda ev: ev.get("startTimestamp") or 0, reverse=True)
+        recent = recent[: int(limit)]
+
+        repo = await self.repository()
+        stored: Dict[int, Dict[str, Any]] = {}
+        if repo is not None:
+            try:
+                stored = await repo.event_statistics(int(ev["id"]) for ev in recent)
+            except Exception as e:
+                self._unavailable(e)
+                repo = None
+
+        for ev in recent:
+            ev_id = int(ev["id"])
+            try:
+                stats = stored.get(ev_id) or await self._event_statistics(repo, ev)
+                if not stats:
+                    continue
+                side = "home" if _event_team_id(ev, "home") == resolved_id else "away"
+                yield self.sofa.build_tactical_stats(event=ev, team_id=resolved_id, stats=stats[side])
+            except Exception as e:
+                logger.warning(f"Tactical stats failed for event={ev_id}: {e}")
+
+
+_svc: Optional[MatchHistoryService] = None
+
+
+def get_match_history_service() -> MatchHistoryService:
+    global _svc
+    if _svc is None:
+        _svc = MatchHistoryService()
+    return _svc
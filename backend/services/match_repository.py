@@ -0,0 +1,438 @@
+"""Match Repository
+
+Persistence of SofaScore events in the `teams` / `matches` tables, and access to the
+per-team `tactical_profiles` rows.
+
+Events are bulk-upserted by `api_fixture_id` (the SofaScore event ID) and can be read
+back in the SofaScore event shape, so analysis code consumes stored and fetched events
+the same way. Per-event statistics are stored separately in `matches.tactical_data` as
+the metrics extracted for each side (`SofaScoreService.extract_event_stats`); the typed
+possession/shots/xG columns are filled from them. Re-upserting an event never clears
+stored statistics.
+
+Team history is read through the team-match view (`models/team_match.py`): each side
+is a top-N query on its (team, date DESC) index, so "last N matches of a team, home or
+away, before a date" never scans other teams' matches.
+
+Writes are set-based: PostgreSQL gets multi-row `INSERT ... ON CONFLICT DO UPDATE`
+statements of `DATABASE_BULK_BATCH_SIZE` rows, SQLite the single-row upsert through
+executemany (see scripts/benchmark_match_ingestion.py).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import aliased
+
+from config.settings import get_settings
+from models import Match, TacticalProfile, Team, team_match_select
+from services.database import create_tables, get_engine, get_sessionmaker
+from services.focal_team import focal_teams
+
+settings = get_settings()
+
+FINISHED = "finished"
+
+# asyncpg sends at most 32767 bind parameters per statement.
+MAX_BIND_PARAMETERS = 32767
+
+
+def _dialect_insert(dialect_name: str):
+    return pg_insert if dialect_name == "postgresql" else sqlite_insert
+
+
+def _utc_datetime(timestamp: Any) -> Optional[datetime]:
+    if not isinstance(timestamp, (int, float)):
+        return None
+    return datetime.fromtimestamp(float(timestamp), tz=timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+    return _utc_datetime(value)
+
+
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_STATISTICS_COLUMNS = (
+    "tactical_data",
+    "home_possession",
+    "away_possession",
+    "home_shots",
+    "away_shots",
+    "home_shots_on_target",
+    "away_shots_on_target",
+    "home_xg",
+    "away_xg",
+)
+
+
+def _statistics_columns(stats: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """`matches` columns for the extracted metrics of both sides (all None without statistics)."""
+    if not stats:
+        return dict.fromkeys(_STATISTICS_COLUMNS)
+    home = stats.get("home") or {}
+    away = stats.get("away") or {}
+    return {
+        "tactical_data": {"home": home, "away": away},
+        "home_possession": home.get("ball_poss"),
+        "away_possession": away.get("ball_poss"),
+        "home_shots": _int(home.get("total_shots")),
+        "away_shots": _int(away.get("total_shots")),
+        "home_shots_on_target": _int(home.get("shots_on")),
+        "away_shots_on_target": _int(away.get("shots_on")),
+        "home_xg": home.get("xg"),
+        "away_xg": away.get("xg"),
+    }
+
+
+def _team(event: Dict[str, Any], side: str) -> Dict[str, Any]:
+    return event.get(f"{side}Team") or {}
+
+
+def _score(event: Dict[str, Any], side: str) -> Optional[int]:
+    return _int((event.get(f"{side}Score") or {}).get("current"))
+
+
+class MatchRepository:
+    def __init__(self, sessionmaker: Optional[async_sessionmaker] = None, batch_size: Optional[int] = None):
+        self._sessionmaker = sessionmaker
+        self.batch_size = max(1, int(batch_size or getattr(settings, "DATABASE_BULK_BATCH_SIZE", 500) or 500))
+        self._schema_ready = False
+
+    @property
+    def sessionmaker(self) -> async_sessionmaker:
+        if self._sessionmaker is None:
+            self._sessionmaker = get_sessionmaker()
+        return self._sessionmaker
+
+    async def init(self) -> None:
+        """Create the tables on first use (no-op when they already exist)."""
+        if self._schema_ready:
+            return
+        engine = self.sessionmaker.kw.get("bind") or get_engine()
+        await create_tables(engine)
+        self._schema_ready = True
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    async def _bulk_upsert(
+        self,
+        session,
+        model,
+        rows: List[Dict[str, Any]],
+        key: str,
+        update_columns: Iterable[str],
+        keep_existing: Iterable[str] = (),
+    ) -> None:
+        """INSERT ... ON CONFLICT (key) DO UPDATE for many rows (all with the same columns).
+
+        `keep_existing` columns are only overwritten by non-NULL values. PostgreSQL gets one
+        multi-row statement per batch; SQLite runs the single-row upsert via executemany.
+        """
+        if not rows:
+            return
+        table = model.__table__
+        dialect = session.bind.dialect.name
+        insert = _dialect_insert(dialect)
+        now = datetime.utcnow()
+
+        def _on_conflict(stmt):
+            excluded = stmt.excluded
+            set_ = {column: excluded[column] for column in update_columns}
+            set_.update({column: func.coalesce(excluded[column], table.c[column]) for column in keep_existing})
+            set_["updated_at"] = now
+            return stmt.on_conflict_do_update(index_elements=[table.c[key]], set_=set_)
+
+        if dialect == "postgresql":
+            size = max(1, min(self.batch_size, MAX_BIND_PARAMETERS // len(rows[0])))
+            for start in range(0, len(rows), size):
+                await session.execute(_on_conflict(insert(table).values(rows[start : start + size])))
+        else:
+            await session.execute(_on_conflict(insert(table)), rows)
+
+    async def upsert_teams(self, session, teams: Iterable[Dict[str, Any]]) -> Dict[int, int]:
+        """Insert/rename teams by SofaScore ID; returns {api_team_id: teams.id}."""
+        focal_ids = set(focal_teams())
+        rows: Dict[int, Dict[str, Any]] = {}
+        for team in teams:
+            try:
+                api_id = int(team.get("id"))
+            except (TypeError, ValueError):
+                continue
+            country = team.get("country")
+            rows[api_id] = {
+                "api_team_id": api_id,
+                "name": str(team.get("name") or api_id),
+                "country": country.get("name") if isinstance(country, dict) else None,
+                "is_gil_vicente": 1 if api_id in focal_ids else 0,
+            }
+        if not rows:
+            return {}
+
+        await self._bulk_upsert(session, Team, list(rows.values()), "api_team_id", ("name",), ("country",))
+
+        team_ids: Dict[int, int] = {}
+        api_ids = list(rows)
+        for start in range(0, len(api_ids), self.batch_size):
+            result = await session.execute(
+                select(Team.api_team_id, Team.id).where(Team.api_team_id.in_(api_ids[start : start + self.batch_size]))
+            )
+            team_ids.update(result.all())
+        return team_ids
+
+    async def upsert_events(
+        self,
+        events: Iterable[Dict[str, Any]],
+        statistics: Optional[Dict[int, Dict[str, Dict[str, Any]]]] = None,
+    ) -> int:
+        """Bulk-upsert SofaScore events (and their teams); returns the number of rows written.
+
+        `statistics` maps event IDs to `{"home": {...}, "away": {...}}` extracted metrics.
+        Events without an entry keep the statistics already stored for them.
+        """
+        events = [ev for ev in events if isinstance(ev, dict) and ev.get("id") and _utc_datetime(ev.get("startTimestamp"))]
+        if not events:
+            return 0
+        statistics = statistics or {}
+
+        async with self.sessionmaker() as session:
+            team_ids = await self.upsert_teams(
+                session, [_team(ev, side) for ev in events for side in ("home", "away")]
+            )
+
+            rows: Dict[int, Dict[str, Any]] = {}
+            for ev in events:
+                home_id = team_ids.get(int(_team(ev, "home").get("id") or 0))
+                away_id = team_ids.get(int(_team(ev, "away").get("id") or 0))
+                if home_id is None or away_id is None:
+                    continue
+                event_id = int(ev["id"])
+                rows[event_id] = {
+                    "api_fixture_id": event_id,
+                    "home_team_id": home_id,
+                    "away_team_id": away_id,
+                    "match_date": _utc_datetime(ev.get("startTimestamp")),
+                    "venue": (ev.get("venue") or {}).get("name"),
+                    "referee": (ev.get("referee") or {}).get("name"),
+                    "status": str((ev.get("status") or {}).get("type") or "").lower() or None,
+                    "home_score": _score(ev, "home"),
+                    "away_score": _score(ev, "away"),
+                    **_statistics_columns(statistics.get(event_id)),
+                }
+            if not rows:
+                return 0
+
+            await self._bulk_upsert(
+                session,
+                Match,
+                list(rows.values()),
+                "api_fixture_id",
+                ("match_date", "status", "home_score", "away_score"),
+                _STATISTICS_COLUMNS,
+            )
+            await session.commit()
+            return len(rows)
+
+    async def update_tactical_profile(self, api_team_id: int, apply: Callable[[TacticalProfile], None]) -> None:
+        """Run `apply` on the team's profile row (created when missing) in one transaction."""
+        async with self.sessionmaker() as session:
+            team_id = (
+                await session.execute(select(Team.id).where(Team.api_team_id == int(api_team_id)))
+            ).scalar_one_or_none()
+            if team_id is None:
+                return
+
+            insert = _dialect_insert(session.bind.dialect.name)
+            await session.execute(
+                insert(TacticalProfile).values(team_id=team_id).on_conflict_do_nothing(index_elements=[TacticalProfile.team_id])
+            )
+            row = (
+                await session.execute(select(TacticalProfile).where(TacticalProfile.team_id == team_id).with_for_update())
+            ).scalar_one()
+            apply(row)
+            await session.commit()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def _window_statement(
+        self,
+        api_team_id: int,
+        limit: int,
+        before: Optional[datetime],
+        venues: Iterable[str],
+        status: Optional[str],
+        merge: bool = True,
+    ):
+        """The team's last `limit` matches per venue (and overall when `merge`), newest first.
+
+        Each venue is a top-N query on one side of the team-match view, served by that
+        side's (team, date DESC) index. Only view columns are read, which that index covers
+        on PostgreSQL (index-only scans); the <= 2 * limit rows are then merged and joined
+        to both teams.
+        """
+        team_id = select(Team.id).where(Team.api_team_id == int(api_team_id)).scalar_subquery()
+        sides = []
+        for venue in venues:
+            side = team_match_select(venue).where(
+                (Match.home_team_id if venue == "home" else Match.away_team_id) == team_id
+            )
+            if status is not None:
+                side = side.where(Match.status == status)
+            if before is not None:
+                side = side.where(Match.match_date < before)
+            sides.append(select(side.order_by(Match.match_date.desc()).limit(int(limit)).subquery()))
+        window = (union_all(*sides) if len(sides) > 1 else sides[0]).subquery("window")
+
+        team, opponent = aliased(Team, name="team"), aliased(Team, name="opponent")
+        stmt = (
+            select(window, team, opponent)
+            .join(team, window.c.team_id == team.id)
+            .join(opponent, window.c.opponent_id == opponent.id)
+            .order_by(window.c.match_date.desc(), window.c.api_fixture_id.desc())
+        )
+        return stmt.limit(int(limit)) if merge else stmt
+
+    async def _window(
+        self,
+        api_team_id: int,
+        limit: int,
+        before: Any = None,
+        venue: Optional[str] = None,
+        status: Optional[str] = FINISHED,
+        merge: bool = True,
+    ) -> List[Any]:
+        if venue not in (None, "home", "away"):
+            raise ValueError(f"venue must be 'home', 'away' or None, got {venue!r}")
+        stmt = self._window_statement(
+            api_team_id, limit, _as_datetime(before), (venue,) if venue else ("home", "away"), status, merge
+        )
+        async with self.sessionmaker() as session:
+            return (await session.execute(stmt)).all()
+
+    async def finished_events(
+        self,
+        api_team_id: int,
+        limit: int = 10,
+        *,
+        before: Any = None,
+        venue: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """The team's last `limit` finished events in SofaScore shape, oldest first.
+
+        `before` (datetime or epoch seconds) ends the window; `venue` keeps only its
+        `"home"` or `"away"` games.
+        """
+        rows = await self._window(api_team_id, limit, before, venue)
+        return [self._to_event(row) for row in reversed(rows)]
+
+    async def team_window(
+        self,
+        api_team_id: int,
+        limit: int = 10,
+        *,
+        before: Any = None,
+        venue: Optional[str] = None,
+        status: Optional[str] = FINISHED,
+    ) -> List[Dict[str, Any]]:
+        """The team's last `limit` matches from its own side (goals for/against, result), newest first."""
+        rows = await self._window(api_team_id, limit, before, venue, status)
+        return [self._to_team_match(row) for row in rows]
+
+    async def home_away_split(
+        self, api_team_id: int, limit: int = 5, *, before: Any = None, status: Optional[str] = FINISHED
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """`{"home": [...], "away": [...]}`: the team's last `limit` matches at each venue (one query)."""
+        rows = await self._window(api_team_id, limit, before, None, status, merge=False)
+        split: Dict[str, List[Dict[str, Any]]] = {"home": [], "away": []}
+        for row in rows:
+            team_match = self._to_team_match(row)
+            split[team_match["venue"]].append(team_match)
+        return split
+
+    async def event_statistics(self, api_fixture_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Stored `{"home": {...}, "away": {...}}` metrics by event ID (events without statistics are omitted)."""
+        ids = [int(i) for i in api_fixture_ids]
+        if not ids:
+            return {}
+        stmt = select(Match.api_fixture_id, Match.tactical_data).where(
+            Match.api_fixture_id.in_(ids), Match.tactical_data.is_not(None)
+        )
+        async with self.sessionmaker() as session:
+            rows = (await session.execute(stmt)).all()
+        return {fixture_id: data for fixture_id, data in rows if isinstance(data, dict) and data}
+
+    async def tactical_profile(self, api_team_id: int) -> Optional[Dict[str, Any]]:
+        """The stored window profile of a team (one indexed row lookup)."""
+        stmt = (
+            select(TacticalProfile.profile)
+            .join(Team, TacticalProfile.team_id == Team.id)
+            .where(Team.api_team_id == int(api_team_id))
+        )
+        async with self.sessionmaker() as session:
+            profile = (await session.execute(stmt)).scalar_one_or_none()
+        return profile or None
+
+    # Window rows carry the team-match view columns plus the `team` and `opponent` rows.
+    @staticmethod
+    def _to_team_match(row: Any) -> Dict[str, Any]:
+        goals_for, goals_against = row.goals_for, row.goals_against
+        result = None
+        if goals_for is not None and goals_against is not None:
+            result = "W" if goals_for > goals_against else "L" if goals_for < goals_against else "D"
+        return {
+            "event_id": row.api_fixture_id,
+            "timestamp": _timestamp(row.match_date),
+            "status": row.status,
+            "venue": "home" if row.is_home else "away",
+            "team": {"id": row.team.api_team_id, "name": row.team.name},
+            "opponent": {"id": row.opponent.api_team_id, "name": row.opponent.name},
+            "goals_for": goals_for,
+            "goals_against": goals_against,
+            "result": result,
+        }
+
+    @staticmethod
+    def _to_event(row: Any) -> Dict[str, Any]:
+        home, away = (row.team, row.opponent) if row.is_home else (row.opponent, row.team)
+        home_score, away_score = (row.goals_for, row.goals_against) if row.is_home else (row.goals_against, row.goals_for)
+        return {
+            "id": row.api_fixture_id,
+            "homeTeam": {"id": home.api_team_id, "name": home.name},
+            "awayTeam": {"id": away.api_team_id, "name": away.name},
+            "homeScore": {"current": home_score},
+            "awayScore": {"current": away_score},
+            "status": {"type": row.status},
+            "startTimestamp": _timestamp(row.match_date),
+        }
+
+
+
+_repo: Optional[MatchRepository] = None
+
+
+def get_match_repository() -> MatchRepository:
+    global _repo
+    if _repo is None:
+        _repo = MatchRepository()
+    return _repo
@@ -11,16 +11,21 @@ This keeps the frontend + AI pipeline working even when direct API scraping is d
 
 from __future__ import annotations
 
+import copy
 import json
 import os
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from glob import glob
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from config.settings import get_settings
+from services.columnar_export_store import ColumnarExportStore
+from services.export_catalog import ExportCatalog
+from services.export_stream import iter_export_records
 
 settings = get_settings()
 
@@ -201,10 +206,70 @@ def _parse_time(value: Any) -> Optional[str]:
     return None
 
 
+# Export column base names per metric, in priority order (Portuguese exports first).
+# `other_team` metrics read the opposing side's column (e.g. corners conceded).
+_EXPORT_METRICS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "possession": (("posse_de_bola", "ball_possession", "possession", "match_overview_ball_possession"), False),
+    "total_passes": (("passes", "total_passes", "match_overview_passes"), False),
+    "accurate_passes": (("passes_precisos", "passes_accurate_passes", "accurate_passes"), False),
+    "pass_accuracy": (("pass_accuracy", "precisao_de_passe", "precisão_de_passe"), False),
+    "total_shots": (("total_de_remates", "total_shots", "shots_total_shots"), False),
+    "shots_on": (("remates_enquadrados", "shots_on_target", "shots_shots_on_target"), False),
+    "shots_in": (("remates_dentro_da_área", "shots_inside_box", "shots_shots_inside_box"), False),
+    "shots_out": (("remates_fora_da_área", "shots_outside_box", "shots_shots_outside_box"), False),
+    "big_chances": (("grandes_oportunidades", "big_chances", "match_overview_big_chances"), False),
+    "big_missed": (("grandes_oportunidades_falhadas", "big_chances_missed"), False),
+    "xg": (("golos_esperados_xg", "xg", "expected_goals_xg"), False),
+    "corners": (("cantos", "corner_kicks", "match_overview_corner_kicks"), False),
+    "corners_conceded": (("cantos", "corner_kicks", "match_overview_corner_kicks"), True),
+    "interceptions": (("interceções", "interceptions", "defending_interceptions"), False),
+    "clearances": (("cortes", "clearances", "defending_clearances", "alívios"), False),
+    "blocks": (("remates_bloqueados", "blocked_shots", "defending_blocks"), False),
+}
+
+
+class StatKeyResolver:
+    """Column map for one export schema (the keys of its rows), compiled once per export.
+
+    For each metric and opponent side it keeps only the candidate columns that exist in
+    the schema, as ready-made key strings, so extracting a row is a few dict lookups.
+    """
+
+    def __init__(self, keys: Iterable[str]):
+        self.keys = frozenset(keys)
+        present = self.keys
+        self.columns: Dict[str, List[Tuple[Tuple[str, ...], ...]]] = {}
+        for side, other in (("home", "away"), ("away", "home")):
+            plan = []
+            for metric, (bases, other_team) in _EXPORT_METRICS.items():
+                column_side = other if other_team else side
+                candidates = tuple(k for k in (f"{base}_{column_side}" for base in bases) if k in present)
+                plan.append((metric, candidates))
+            self.columns[side] = plan
+
+    def covers(self, raw: Dict[str, Any]) -> bool:
+        """Whether `raw` has exactly this schema's columns."""
+        return raw.keys() == self.keys
+
+    def extract(self, raw: Dict[str, Any], side: str) -> Dict[str, Any]:
+        """Raw (unparsed) value per metric for the opponent playing on `side`."""
+        out: Dict[str, Any] = {}
+        for metric, candidates in self.columns[side]:
+            value = None
+            for key in candidates:
+                candidate = raw.get(key)
+                if candidate is not None and candidate != "":
+                    value = candidate
+                    break
+            out[metric] = value
+        return out
+
+
 @dataclass(frozen=True)
 class ScraperExportMatch:
     raw: Dict[str, Any]
     opponent_name: str
+    resolver: Optional[StatKeyResolver] = field(default=None, compare=False, repr=False)
 
     @property
     def home_team(self) -> str:
@@ -229,21 +294,6 @@ class ScraperExportMatch:
             return False
         return None
 
-    def _side(self) -> str:
-        # Default to away when unknown; we'll still try to populate.
-        return "home" if self.is_opponent_home else "away"
-
-    def _other_side(self) -> str:
-        return "away" if self._side() == "home" else "home"
-
-    def _pick(self, base_keys: List[str], *, other_team: bool = False) -> Any:
-        side = self._other_side() if other_team else self._side()
-        for base in base_keys:
-            key = f"{base}_{side}"
-            if key in self.raw and self.raw.get(key) not in (None, ""):
-                return self.raw.get(key)
-        return None
-
     def to_tactical_stats(self) -> Dict[str, Any]:
         # Match opponent + determine context
         is_home = self.is_opponent_home
@@ -251,14 +301,16 @@ class ScraperExportMatch:
         opp_name = self.away_team if is_home else self.home_team if is_home is not None else None
 
         # Core metrics (best-effort mapping from Portuguese exports)
-        possession = _parse_percent(
-            self._pick(["posse_de_bola", "ball_possession", "possession", "match_overview_ball_possession"])
-        )
+        # Unknown side: read the away columns, the stats are still populated.
+        resolver = self.resolver or StatKeyResolver(self.raw)
+        values = resolver.extract(self.raw, "home" if is_home else "away")
+
+        possession = _parse_percent(values["possession"])
 
-        total_passes = _parse_number(self._pick(["passes", "total_passes", "match_overview_passes"]))
-        accurate_passes = _parse_number(self._pick(["passes_precisos", "passes_accurate_passes", "accurate_passes"]))
+        total_passes = _parse_number(values["total_passes"])
+        accurate_passes = _parse_number(values["accurate_passes"])
 
-        pass_accuracy = _parse_percent(self._pick(["pass_accuracy", "precisao_de_passe", "precisão_de_passe"]))
+        pass_accuracy = _parse_percent(values["pass_accuracy"])
         if pass_accuracy is None and total_passes is not None and total_passes > 0 and accurate_passes is not None:
             pass_accuracy = round((float(accurate_passes) / float(total_passes)) * 100.0, 1)
 
@@ -266,28 +318,22 @@ class ScraperExportMatch:
         if total_passes is not None:
             passes_per_min = round(float(total_passes) / 90.0, 2)
 
-        total_shots = _parse_number(
-            self._pick(["total_de_remates", "total_shots", "shots_total_shots"])
-        )
-        shots_on = _parse_number(
-            self._pick(["remates_enquadrados", "shots_on_target", "shots_shots_on_target"])
-        )
-        shots_in = _parse_number(self._pick(["remates_dentro_da_área", "shots_inside_box", "shots_shots_inside_box"]))
-        shots_out = _parse_number(self._pick(["remates_fora_da_área", "shots_outside_box", "shots_shots_outside_box"]))
+        total_shots = _parse_number(values["total_shots"])
+        shots_on = _parse_number(values["shots_on"])
+        shots_in = _parse_number(values["shots_in"])
+        shots_out = _parse_number(values["shots_out"])
 
-        big_chances = _parse_number(self._pick(["grandes_oportunidades", "big_chances", "match_overview_big_chances"]))
-        big_missed = _parse_number(self._pick(["grandes_oportunidades_falhadas", "big_chances_missed"]))
+        big_chances = _parse_number(values["big_chances"])
+        big_missed = _parse_number(values["big_missed"])
 
-        xg = _parse_number(self._pick(["golos_esperados_xg", "xg", "expected_goals_xg"]))
+        xg = _parse_number(values["xg"])
 
-        corners = _parse_number(self._pick(["cantos", "corner_kicks", "match_overview_corner_kicks"]))
-        corners_conceded = _parse_number(
-            self._pick(["cantos", "corner_kicks", "match_overview_corner_kicks"], other_team=True)
-        )
+        corners = _parse_number(values["corners"])
+        corners_conceded = _parse_number(values["corners_conceded"])
 
-        interceptions = _parse_number(self._pick(["interceções", "interceptions", "defending_interceptions"]))
-        clearances = _parse_number(self._pick(["cortes", "clearances", "defending_clearances", "alívios"]))
-        blocks = _parse_number(self._pick(["remates_bloqueados", "blocked_shots", "defending_blocks"]))
+        interceptions = _parse_number(values["interceptions"])
+        clearances = _parse_number(values["clearances"])
+        blocks = _parse_number(values["blocks"])
 
         xg_per_shot = None
         if xg is not None and total_shots is not None and total_shots > 0:
@@ -412,11 +458,37 @@ class ScraperExportMatch:
         }
 
 
+class _LRUCache:
+    """Small thread-safe LRU for parsed exports (keys include path, mtime and size)."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._data: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
 class ScraperExportService:
     """Find and parse `scrapper/scrapper.py` exports as a backend data source."""
 
     def __init__(self):
         self.export_dir = str(getattr(settings, "SCRAPER_EXPORT_DIR", "") or "").strip()
+        self.columnar = ColumnarExportStore(self.export_dir or self._default_export_dir())
+        self.catalog = ExportCatalog(self._export_dirs())
+        self._parsed = _LRUCache(int(getattr(settings, "SCRAPER_EXPORT_CACHE_SIZE", 64) or 64))
 
     def _default_export_dir(self) -> str:
         # Default to a dedicated data folder if present, otherwise repo root.
@@ -435,51 +507,25 @@ class ScraperExportService:
         # Fallback to backend root (useful in containerized runs).
         return backend_root
 
-    def _candidate_paths(self, opponent_name: str) -> List[str]:
-        if self.export_dir:
-            base_dirs = [self.export_dir]
-        else:
-            here = os.path.dirname(os.path.abspath(__file__))
-            backend_root = os.path.abspath(os.path.join(here, ".."))
-            repo_root = os.path.abspath(os.path.join(backend_root, ".."))
-            base_dirs = [
-                os.path.join(backend_root, "data", "scraper_exports"),
-                os.path.join(repo_root, "data", "scraper_exports"),
-                backend_root,  # backwards-compat: older exports were written to backend root
-                repo_root,  # backwards-compat: older exports were written to repo root
-            ]
-
-        slug = str(opponent_name or "").replace(" ", "_")
-        paths: List[str] = []
-        for export_dir in base_dirs:
-            patterns = [
-                os.path.join(export_dir, f"gil_vicente_next_opponent_{slug}_individual_*.json"),
-                os.path.join(export_dir, f"*{slug}*individual*.json"),
-            ]
-            for pattern in patterns:
-                paths.extend(glob(pattern))
-        # Newest first (filenames include timestamp)
-        paths.sort(reverse=True)
-        return paths
-
-    def _fixture_paths(self) -> List[str]:
+    def _export_dirs(self) -> List[str]:
         if self.export_dir:
-            base_dirs = [self.export_dir]
-        else:
-            here = os.path.dirname(os.path.abspath(__file__))
-            repo_root = os.path.abspath(os.path.join(here, "..", ".."))
-            base_dirs = [
-                os.path.join(repo_root, "data", "scraper_exports"),
-                repo_root,
-            ]
+            return [self.export_dir]
+        here = os.path.dirname(os.path.abspath(__file__))
+        backend_root = os.path.abspath(os.path.join(here, ".."))
+        repo_root = os.path.abspath(os.path.join(backend_root, ".."))
+        return [
+            os.path.join(backend_root, "data", "scraper_exports"),
+            os.path.join(repo_root, "data", "scraper_exports"),
+            backend_root,  # backwards-compat: older exports were written to backend root
+            repo_root,  # backwards-compat: older exports were written to repo root
+        ]
 
-        paths: List[str] = []
-        for export_dir in base_dirs:
-            pattern = os.path.join(export_dir, "gil_vicente_fixtures_*.json")
-            paths.extend(glob(pattern))
+    def _candidate_paths(self, opponent_name: str) -> List[str]:
+        # Newest first (by the timestamp in the filename)
+        return self.catalog.opponent_paths(opponent_name)
 
-        paths.sort(reverse=True)
-        return paths
+    def _fixture_paths(self) -> List[str]:
+        return self.catalog.fixture_paths()
 
     def _normalize_fixture(self, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if not isinstance(raw, dict):
@@ -545,55 +591,130 @@ class ScraperExportService:
 
         return fixture
 
-    def load_fixtures(self, limit: int = 100) -> List[Dict[str, Any]]:
-        paths = self._fixture_paths()
-        if not paths:
-            return []
-
-        path = paths[0]
+    def _file_key(self, path: str) -> Optional[Tuple[str, int, int]]:
         try:
-            raw = json.loads(open(path, "r", encoding="utf-8").read())
-        except Exception:
-            return []
-
-        if isinstance(raw, dict):
-            fixtures_raw = raw.get("fixtures") or []
-        elif isinstance(raw, list):
-            fixtures_raw = raw
-        else:
-            fixtures_raw = []
-
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def _memoized(self, key: Optional[Tuple], build: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Return the parsed result for `key`, building it on a miss (empty results are not kept)."""
+        if key is None:
+            return build()
+        cached = self._parsed.get(key)
+        if cached is None:
+            cached = build()
+            if cached:
+                self._parsed.put(key, cached)
+        return cached
+
+    def _parse_fixtures_file(self, path: str, limit: int) -> List[Dict[str, Any]]:
+        limit = max(0, int(limit))
         out: List[Dict[str, Any]] = []
-        for item in fixtures_raw[: max(0, int(limit))]:
+        if not limit:
+            return out
+        # Streamed: only the first `limit` fixtures are ever decoded.
+        for item in iter_export_records(path, list_key="fixtures"):
             fixture = self._normalize_fixture(item)
             if fixture:
                 out.append(fixture)
+                if len(out) >= limit:
+                    break
 
         return out
 
-    def load_recent_games_tactical(self, opponent_name: str, limit: int = 5) -> List[Dict[str, Any]]:
-        paths = self._candidate_paths(opponent_name)
-        if not paths:
-            return []
+    def _parse_fixtures_columnar(self, limit: int) -> List[Dict[str, Any]]:
+        out = []
+        for item in self.columnar.read_fixtures()[: max(0, int(limit))]:
+            fixture = self._normalize_fixture(item)
+            if fixture:
+                out.append(fixture)
+        return out
 
-        # Pick newest export
-        path = paths[0]
-        try:
-            raw = json.loads(open(path, "r", encoding="utf-8").read())
-        except Exception:
-            return []
+    def load_fixtures(self, limit: int = 100) -> List[Dict[str, Any]]:
+        if self.columnar.has_partition("fixtures"):
+            key = self._file_key(self.columnar.manifest_path)
+            fixtures = self._memoized(
+                key and ("fixtures", "columnar", key, limit), lambda: self._parse_fixtures_columnar(limit)
+            )
+        else:
+            paths = self._fixture_paths()
+            if not paths:
+                return []
+            key = self._file_key(paths[0])
+            fixtures = self._memoized(
+                key and ("fixtures", "json", key, limit), lambda: self._parse_fixtures_file(paths[0], limit)
+            )
+
+        # Callers normalize fixtures in place; hand out copies of the cached rows.
+        return [dict(f) for f in fixtures]
+
+    def load_matches(
+        self,
+        opponent_name: str,
+        *,
+        columns: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Raw export rows for a team from the columnar store (only the requested columns/dates)."""
+        return self.columnar.read_matches(
+            opponent_name, columns=columns, date_from=date_from, date_to=date_to, limit=limit
+        )
 
-        if not isinstance(raw, list):
-            return []
+    @staticmethod
+    def _tactical_stats(rows: Iterable[Any], opponent_name: str) -> Iterator[Dict[str, Any]]:
+        """Tactical stats per export row; the column map is compiled once per schema."""
+        resolver: Optional[StatKeyResolver] = None
+        for raw in rows:
+            if not isinstance(raw, dict):
+                continue
+            if resolver is None or not resolver.covers(raw):
+                resolver = StatKeyResolver(raw)
+            yield ScraperExportMatch(raw=raw, opponent_name=opponent_name, resolver=resolver).to_tactical_stats()
 
+    def _parse_tactical_file(self, path: str, opponent_name: str, limit: int) -> List[Dict[str, Any]]:
+        limit = max(0, int(limit))
         out: List[Dict[str, Any]] = []
-        for item in raw[: max(0, int(limit))]:
-            if not isinstance(item, dict):
-                continue
-            out.append(ScraperExportMatch(raw=item, opponent_name=opponent_name).to_tactical_stats())
+        if not limit:
+            return out
+        # Streamed: stop reading once `limit` matches are normalized.
+        for stats in self._tactical_stats(iter_export_records(path), opponent_name):
+            out.append(stats)
+            if len(out) >= limit:
+                break
 
         return out
 
+    def _parse_tactical_columnar(self, opponent_name: str, limit: int) -> List[Dict[str, Any]]:
+        rows = self.load_matches(opponent_name, limit=limit)
+        return list(self._tactical_stats(rows, opponent_name))
+
+    def load_recent_games_tactical(self, opponent_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        games: List[Dict[str, Any]] = []
+        if self.columnar.available:
+            key = self._file_key(self.columnar.manifest_path)
+            games = self._memoized(
+                key and ("tactical", "columnar", key, opponent_name, limit),
+                lambda: self._parse_tactical_columnar(opponent_name, limit),
+            )
+
+        if not games:
+            paths = self._candidate_paths(opponent_name)
+            if not paths:
+                return []
+            # Pick newest export
+            key = self._file_key(paths[0])
+            games = self._memoized(
+                key and ("tactical", "json", key, opponent_name, limit),
+                lambda: self._parse_tactical_file(paths[0], opponent_name, limit),
+            )
+
+        # Nested stat dicts are shared with the cache; callers get their own copy.
+        return copy.deepcopy(games)
+
 
 _svc: Optional[ScraperExportService] = None
 
@@ -0,0 +1,178 @@
+"""Scraper Jobs Service
+
+Bridge between the API and the scraper daemon (`scrapper/daemon.py`):
+  - on-demand jobs are inserted into the daemon's persistent SQLite queue, which lives in
+    the scraper export folder shared with the backend (`.scraper_jobs.sqlite3`). The
+    daemon owns the queue schema (`scrapper/job_queue.py`); the backend only opens a
+    queue the daemon has created and never creates or migrates the table itself
+  - completion events published by the daemon on Redis invalidate the cache entries
+    built from the refreshed exports
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+from urllib.request import pathname2url
+
+from services.cache_service import CacheService, get_cache_service, glob_escape
+from services.scraper_export_service import get_scraper_export_service
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+JOB_QUEUE_FILENAME = ".scraper_jobs.sqlite3"
+SCRAPER_EVENTS_CHANNEL = "gil_vicente:scraper_events"
+JOB_KINDS = ("next_opponent", "league")
+
+
+class ScraperQueueUnavailableError(RuntimeError):
+    """The daemon has not created its job queue in the export folder yet."""
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    for key in ("payload", "result"):
+        try:
+            job[key] = json.loads(job[key]) if job.get(key) else None
+        except Exception:
+            pass
+    return job
+
+
+class ScraperJobService:
+    """Enqueue scraper jobs and react to their completion events."""
+
+    def __init__(self, queue_path: Optional[str] = None, cache: Optional[CacheService] = None):
+        if queue_path is None:
+            exports = get_scraper_export_service()
+            export_dir = exports.export_dir or exports._default_export_dir()
+            queue_path = os.path.join(export_dir, JOB_QUEUE_FILENAME)
+        self.queue_path = queue_path
+        self.cache = cache or get_cache_service()
+
+    def _connect(self) -> sqlite3.Connection:
+        # mode=rw: a missing file is an error instead of an empty database.
+        uri = f"file:{pathname2url(os.path.abspath(self.queue_path))}?mode=rw"
+        try:
+            conn = sqlite3.connect(uri, uri=True, timeout=10, isolation_level=None)
+        except sqlite3.OperationalError as e:
+            raise ScraperQueueUnavailableError(f"Scraper job queue not found at {self.queue_path}: {e}") from e
+        conn.row_factory = sqlite3.Row
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scrape_jobs'").fetchone() is None:
+            conn.close()
+            raise ScraperQueueUnavailableError(f"Scraper job queue at {self.queue_path} has no scrape_jobs table")
+        return conn
+
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue an on-demand job; an identical pending job is returned instead of a duplicate.
+
+        Raises `ScraperQueueUnavailableError` until the daemon has started once.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown scraper job kind '{kind}' (expected one of {', '.join(JOB_KINDS)})")
+
+        payload_json = json.dumps(payload or {}, sort_keys=True)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM scrape_jobs WHERE kind = ? AND payload = ? AND status = 'pending'",
+                (kind, payload_json),
+            ).fetchone()
+            if row is None:
+                cur = conn.execute(
+                    "INSERT INTO scrape_jobs (kind, payload, source, run_after, created_at, updated_at) "
+                    "VALUES (?, ?, 'api', ?, ?, ?)",
+                    (kind, payload_json, now, now, now),
+                )
+                row = conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (cur.lastrowid,)).fetchone()
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return _row_to_job(row)
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (int(job_id),)).fetchone()
+        finally:
+            conn.close()
+        return _row_to_job(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT * FROM scrape_jobs ORDER BY id DESC LIMIT ?", (int(limit),)).fetchall()
+        finally:
+            conn.close()
+        return [_row_to_job(row) for row in rows]
+
+    async def invalidate_for_event(self, event: Dict[str, Any]) -> int:
+        """Drop cache entries derived from the exports a finished job rewrote."""
+        if event.get("status") != "done":
+            return 0
+
+        deleted = 0
+        for opponent_name in event.get("opponents") or []:
+            # Snapshot identifiers end with the opponent name: "<id>_<name>". Every focal
+            # team's analysis of that opponent read the rewritten export.
+            deleted += await self.cache.delete_matching("analysis_snapshot", f"*_{glob_escape(opponent_name)}", namespace="*")
+
+        # Scraper fixture exports are the default team's.
+        if event.get("fixtures") or event.get("kind") == "next_opponent":
+            if await self.cache.delete("fixtures", "all"):
+                deleted += 1
+
+        logger.info(f"Scraper job {event.get('job_id')} ({event.get('kind')}) invalidated {deleted} cache entries")
+        return deleted
+
+    async def listen_for_completions(self) -> None:
+        """Subscribe to daemon completion events until cancelled (reconnects on errors)."""
+        while True:
+            pubsub = None
+            try:
+                if not self.cache.redis_client:
+                    await self.cache.connect()
+                if not self.cache.redis_client:
+                    await asyncio.sleep(30)
+                    continue
+
+                pubsub = self.cache.redis_client.pubsub()
+                await pubsub.subscribe(SCRAPER_EVENTS_CHANNEL)
+                logger.info(f"Listening for scraper events on '{SCRAPER_EVENTS_CHANNEL}'")
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        event = json.loads(message.get("data") or "{}")
+                    except Exception:
+                        continue
+                    await self.invalidate_for_event(event)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scraper event listener error: {e}")
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+
+_svc: Optional[ScraperJobService] = None
+
+
+def get_scraper_job_service() -> ScraperJobService:
+    global _svc
+    if _svc is None:
+        _svc = ScraperJobService()
+    return _svc
@@ -15,9 +15,11 @@ import re
 import urllib.parse
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import httpx
+import numpy as np
 
 from config.settings import get_settings
 from utils.logger import setup_logger
@@ -145,7 +147,7 @@ def _parse_count_and_percent(value: Any) -> Tuple[Optional[float], Optional[floa
         return None, None
 
     # 345 (82%)
-    parts = re.findall(r"-?\d+(?:\.\d+)?", s)
+    parts = _NUM_RE.findall(s)
     if not parts:
         return None, None
 
@@ -167,6 +169,253 @@ def _parse_count_and_percent(value: Any) -> Tuple[Optional[float], Optional[floa
     return count, pct
 
 
+@lru_cache(maxsize=1024)
+def _stat_key(name: str) -> str:
+    slug = _slug(name)
+    return _STAT_NAME_NORMALIZATION.get(slug) or f"raw::{slug}"
+
+
+def _iter_stat_items(raw: Dict[str, Any]) -> Iterable[Tuple[str, Any, Any]]:
+    """Yield (name, home, away) for every statistics item, values still wrapped.
+
+    SofaScore has changed the shape of match statistics over time. This walk is
+    intentionally tolerant:
+    - raw["statistics"] can be a list or a dict
+    - groups can appear under different keys
+    - item values can be raw scalars or nested dicts like {value, displayValue}
+    """
+    stats = raw.get("statistics")
+    if isinstance(stats, list):
+        blocks = stats
+    elif isinstance(stats, dict):
+        blocks = [stats]
+    else:
+        blocks = []
+
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+
+        groups = block.get("groups") or block.get("statisticsGroups") or block.get("periods") or []
+        if isinstance(groups, dict):
+            groups = [groups]
+
+        for group in (groups or []):
+            if not isinstance(group, dict):
+                continue
+
+            items = group.get("statisticsItems") or group.get("items") or group.get("statistics") or []
+            if isinstance(items, dict):
+                items = [items]
+
+            for item in (items or []):
+                if not isinstance(item, dict):
+                    continue
+
+                name = item.get("name") or item.get("label") or item.get("title")
+                if not name:
+                    continue
+
+                home = item.get("home")
+                away = item.get("away")
+
+                # alternate keys across versions
+                if home is None and "homeValue" in item:
+                    home = item.get("homeValue")
+                if away is None and "awayValue" in item:
+                    away = item.get("awayValue")
+                if home is None and "homeTeamValue" in item:
+                    home = item.get("homeTeamValue")
+                if away is None and "awayTeamValue" in item:
+                    away = item.get("awayTeamValue")
+
+                yield name, home, away
+
+
+# Tactical metric spec: (normalized stat key, side, parser, output names).
+# `side` is "team" for the analysed team's value and "other" for its opponent's; a
+# parser returning a tuple fills several outputs from one raw value.
+_TACTICAL_METRICS: List[Tuple[str, str, Any, Tuple[str, ...]]] = [
+    ("ball_possession", "team", _parse_percent, ("ball_poss",)),
+    ("total_shots", "team", _parse_number, ("total_shots",)),
+    ("shots_on_target", "team", _parse_number, ("shots_on",)),
+    ("shots_inside_box", "team", _parse_number, ("shots_in",)),
+    ("shots_outside_box", "team", _parse_number, ("shots_out",)),
+    ("big_chances", "team", _parse_number, ("big_chances",)),
+    ("big_chances_missed", "team", _parse_number, ("big_missed",)),
+    ("xg", "team", _parse_number, ("xg",)),
+    ("total_passes", "team", _parse_number, ("passes_total",)),
+    # accurate passes might be a plain count, while accuracy can be present separately.
+    ("accurate_passes", "team", _parse_count_and_percent, ("acc_passes", "acc_pass_pct")),
+    ("pass_accuracy", "team", _parse_percent, ("pass_acc",)),
+    ("long_balls", "team", _parse_number, ("long_attempted",)),
+    ("accurate_long_balls", "team", _parse_number, ("long_completed",)),
+    ("corners", "team", _parse_number, ("corners",)),
+    ("corners", "other", _parse_number, ("corners_conceded",)),
+    ("tackles", "team", _parse_number, ("tackles",)),
+    ("interceptions", "team", _parse_number, ("interceptions",)),
+    ("clearances", "team", _parse_number, ("clearances",)),
+    ("blocked_shots", "team", _parse_number, ("blocks",)),
+    ("duels_won", "team", _parse_number, ("duels_won",)),
+    ("key_passes", "team", _parse_number, ("key_passes",)),
+    ("crosses", "team", _parse_number, ("crosses",)),
+    ("accurate_crosses", "team", _parse_number, ("accurate_crosses",)),
+]
+
+
+class _TacticalStatsExtractor:
+    """`_TACTICAL_METRICS` compiled into a per-stat-key plan for one pass over the items.
+
+    Only the sides a metric needs are unwrapped and each is parsed once. Like
+    `_flatten_stats`, a stat that appears again later in the payload overrides the
+    earlier value.
+    """
+
+    def __init__(self, spec: List[Tuple[str, str, Any, Tuple[str, ...]]]):
+        self.outputs: Tuple[str, ...] = tuple(name for *_, names in spec for name in names)
+        self.plan: Dict[str, List[Tuple[bool, Any, Tuple[str, ...]]]] = {}
+        for stat_key, side, parser, names in spec:
+            self.plan.setdefault(stat_key, []).append((side == "other", parser, names))
+
+    def extract(self, stats_raw: Dict[str, Any], is_home: bool) -> Dict[str, Any]:
+        values: Dict[str, Any] = dict.fromkeys(self.outputs)
+        plan = self.plan
+        for name, home, away in _iter_stat_items(stats_raw):
+            steps = plan.get(_stat_key(name))
+            if steps is None:
+                continue
+            for other, parser, names in steps:
+                raw = (away if is_home else home) if other else (home if is_home else away)
+                parsed = parser(_unwrap_stat_value(raw))
+                if len(names) == 1:
+                    values[names[0]] = parsed
+                else:
+                    values.update(zip(names, parsed))
+        return values
+
+
+_tactical_stats_extractor = _TacticalStatsExtractor(_TACTICAL_METRICS)
+
+
+# Column registry of the feature matrix: dotted paths into the normalized tactical stats
+# dict, in a fixed order. Append new columns at the end so indexes stay stable.
+TACTICAL_FEATURE_COLUMNS: Tuple[str, ...] = (
+    "possession_control.possession_percent",
+    "possession_control.pass_accuracy",
+    "possession_control.passes_per_minute",
+    "possession_control.long_balls_attempted",
+    "possession_control.long_balls_completed",
+    "shooting_finishing.total_shots",
+    "shooting_finishing.shots_on_target",
+    "shooting_finishing.shot_conversion_rate",
+    "shooting_finishing.shots_inside_box",
+    "shooting_finishing.shots_outside_box",
+    "shooting_finishing.big_chances_created",
+    "shooting_finishing.big_chances_missed",
+    "expected_metrics.xG",
+    "expected_metrics.xG_per_shot",
+    "chance_creation.key_passes",
+    "chance_creation.crosses_attempted",
+    "chance_creation.crosses_accurate",
+    "defensive_actions.tackles_attempted",
+    "defensive_actions.interceptions",
+    "defensive_actions.blocks",
+    "defensive_actions.clearances",
+    "defensive_actions.duels_won",
+    "set_pieces.attacking.corners_taken",
+    "set_pieces.defensive.corners_conceded",
+)
+
+# Feature column -> extractor output it is copied from (derived columns are computed).
+_FEATURE_SOURCES: Dict[str, str] = {
+    "possession_control.possession_percent": "ball_poss",
+    "possession_control.long_balls_attempted": "long_attempted",
+    "possession_control.long_balls_completed": "long_completed",
+    "shooting_finishing.total_shots": "total_shots",
+    "shooting_finishing.shots_on_target": "shots_on",
+    "shooting_finishing.shots_inside_box": "shots_in",
+    "shooting_finishing.shots_outside_box": "shots_out",
+    "shooting_finishing.big_chances_created": "big_chances",
+    "shooting_finishing.big_chances_missed": "big_missed",
+    "expected_metrics.xG": "xg",
+    "chance_creation.key_passes": "key_passes",
+    "chance_creation.crosses_attempted": "crosses",
+    "chance_creation.crosses_accurate": "accurate_crosses",
+    "defensive_actions.tackles_attempted": "tackles",
+    "defensive_actions.interceptions": "interceptions",
+    "defensive_actions.blocks": "blocks",
+    "defensive_actions.clearances": "clearances",
+    "defensive_actions.duels_won": "duels_won",
+    "set_pieces.attacking.corners_taken": "corners",
+    "set_pieces.defensive.corners_conceded": "corners_conceded",
+}
+
+
+def _number_or_nan(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+@dataclass(frozen=True)
+class TacticalFeatureMatrix:
+    """Dense (matches x metrics) view of normalized tactical stats.
+
+    `values` is a float array with NaN where a metric is missing and `missing` marks those
+    cells, so aggregates can use NaN-aware reductions instead of per-metric list passes.
+    """
+
+    columns: Tuple[str, ...]
+    values: np.ndarray
+    missing: np.ndarray
+
+    @classmethod
+    def from_values(cls, columns: Iterable[str], values: np.ndarray) -> "TacticalFeatureMatrix":
+        columns = tuple(columns)
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2:
+            values = values.reshape(-1, len(columns))
+        return cls(columns=columns, values=values, missing=np.isnan(values))
+
+    @classmethod
+    def from_tactical_stats(
+        cls, matches: List[Dict[str, Any]], columns: Iterable[str] = TACTICAL_FEATURE_COLUMNS
+    ) -> "TacticalFeatureMatrix":
+        """Build the matrix from normalized tactical stats dicts (any data source)."""
+        columns = tuple(columns)
+        paths = [tuple(column.split(".")) for column in columns]
+        values = np.full((len(matches), len(columns)), np.nan)
+        for i, match in enumerate(matches):
+            row = values[i]
+            for j, path in enumerate(paths):
+                cur: Any = match
+                for key in path:
+                    if not isinstance(cur, dict):
+                        cur = None
+                        break
+                    cur = cur.get(key)
+                row[j] = _number_or_nan(cur)
+        return cls.from_values(columns, values)
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    def index(self, column: str) -> int:
+        return self.columns.index(column)
+
+    def column(self, column: str) -> np.ndarray:
+        return self.values[:, self.index(column)]
+
+    def means(self) -> Dict[str, Optional[float]]:
+        """NaN-aware mean per column; None for columns without any value."""
+        counts = (~self.missing).sum(axis=0)
+        sums = np.where(self.missing, 0.0, self.values).sum(axis=0)
+        return {
+            column: (float(sums[j] / counts[j]) if counts[j] else None)
+            for j, column in enumerate(self.columns)
+        }
+
+
 @dataclass(frozen=True)
 class SofaScoreResolvedTeam:
     id: int
@@ -390,87 +639,42 @@ class SofaScoreService:
         data = await self._get(f"/event/{int(event_id)}/statistics")
         return data or {}
 
-    def _flatten_stats(self, raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        """Return a dict: normalized_name -> {home: raw, away: raw, originalName: str}.
-
-        SofaScore has changed the shape of match statistics over time. This parser is
-        intentionally tolerant:
-        - raw["statistics"] can be a list or a dict
-        - groups can appear under different keys
-        - item values can be raw scalars or nested dicts like {value, displayValue}
-        """
-        out: Dict[str, Dict[str, Any]] = {}
-
-        stats = raw.get("statistics")
-        if isinstance(stats, list):
-            blocks = stats
-        elif isinstance(stats, dict):
-            blocks = [stats]
-        else:
-            blocks = []
-
-        for block in blocks:
-            if not isinstance(block, dict):
-                continue
-
-            groups = block.get("groups") or block.get("statisticsGroups") or block.get("periods") or []
-            if isinstance(groups, dict):
-                groups = [groups]
-
-            for group in (groups or []):
-                if not isinstance(group, dict):
-                    continue
-
-                items = group.get("statisticsItems") or group.get("items") or group.get("statistics") or []
-                if isinstance(items, dict):
-                    items = [items]
-
-                for item in (items or []):
-                    if not isinstance(item, dict):
-                        continue
-
-                    name = item.get("name") or item.get("label") or item.get("title")
-                    if not name:
-                        continue
-
-                    key = _STAT_NAME_NORMALIZATION.get(_slug(name), None)
-                    if not key:
-                        key = f"raw::{_slug(name)}"
+    async def get_event(self, event_id: int) -> Dict[str, Any]:
+        if not self.enabled:
+            return {}
 
-                    home = item.get("home")
-                    away = item.get("away")
+        data = await self._get(f"/event/{int(event_id)}")
+        return data.get("event") or {}
 
-                    # alternate keys across versions
-                    if home is None and "homeValue" in item:
-                        home = item.get("homeValue")
-                    if away is None and "awayValue" in item:
-                        away = item.get("awayValue")
-                    if home is None and "homeTeamValue" in item:
-                        home = item.get("homeTeamValue")
-                    if away is None and "awayTeamValue" in item:
-                        away = item.get("awayTeamValue")
+    async def get_event_incidents(self, event_id: int) -> List[Dict[str, Any]]:
+        if not self.enabled:
+            return []
 
-                    home = _unwrap_stat_value(home)
-                    away = _unwrap_stat_value(away)
+        data = await self._get(f"/event/{int(event_id)}/incidents")
+        return data.get("incidents") or []
 
-                    out[key] = {"home": home, "away": away, "originalName": name}
+    async def get_live_event(self, team_id: int) -> Optional[Dict[str, Any]]:
+        """The team's in-progress event, if any (live events are listed first in `events/next`)."""
+        for ev in await self.get_upcoming_events(team_id, limit=3, max_pages=1):
+            if str((ev.get("status") or {}).get("type") or "").lower() == "inprogress":
+                return ev
+        return None
 
+    def _flatten_stats(self, raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Return a dict: normalized_name -> {home: raw, away: raw, originalName: str}."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, home, away in _iter_stat_items(raw):
+            out[_stat_key(name)] = {
+                "home": _unwrap_stat_value(home),
+                "away": _unwrap_stat_value(away),
+                "originalName": name,
+            }
         return out
 
-
-    def _pick_side(self, stat: Dict[str, Any], is_home: bool) -> Any:
-        return _unwrap_stat_value(stat.get("home") if is_home else stat.get("away"))
-
-    def _pick_side_other(self, stat: Dict[str, Any], is_home: bool) -> Any:
-        return _unwrap_stat_value(stat.get("away") if is_home else stat.get("home"))
-
-    def normalize_event_tactical_stats(self, *, event: Dict[str, Any], team_id: int, stats_raw: Dict[str, Any]) -> Dict[str, Any]:
-        home_team = event.get("homeTeam") or {}
-        away_team = event.get("awayTeam") or {}
-
-        is_home = int(home_team.get("id") or 0) == int(team_id)
-        team_name = home_team.get("name") if is_home else away_team.get("name")
-        opp_name = away_team.get("name") if is_home else home_team.get("name")
+    @staticmethod
+    def _event_side(event: Dict[str, Any], team_id: int) -> Tuple[bool, int, int]:
+        """(is_home, team_score, opp_score) of `team_id` in an event; missing scores count as 0."""
+        is_home = int((event.get("homeTeam") or {}).get("id") or 0) == int(team_id)
 
         home_score = (event.get("homeScore") or {}).get("current")
         away_score = (event.get("awayScore") or {}).get("current")
@@ -483,55 +687,47 @@ class SofaScoreService:
         except Exception:
             aws = 0
 
-        team_score = hs if is_home else aws
-        opp_score = aws if is_home else hs
+        return is_home, (hs if is_home else aws), (aws if is_home else hs)
 
-        result = "W" if team_score > opp_score else "L" if team_score < opp_score else "D"
-
-        start_ts = event.get("startTimestamp")
-        # keep as epoch seconds if present; otherwise empty string
-        date = start_ts if isinstance(start_ts, int) else ""
+    def extract_event_stats(self, *, event: Dict[str, Any], team_id: int, stats_raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Raw tactical metrics of `team_id`'s side (the input of `build_tactical_stats`)."""
+        is_home = self._event_side(event, team_id)[0]
+        return _tactical_stats_extractor.extract(stats_raw, is_home)
 
-        flat = self._flatten_stats(stats_raw)
+    def normalize_event_tactical_stats(self, *, event: Dict[str, Any], team_id: int, stats_raw: Dict[str, Any]) -> Dict[str, Any]:
+        stats = self.extract_event_stats(event=event, team_id=team_id, stats_raw=stats_raw)
+        return self.build_tactical_stats(event=event, team_id=team_id, stats=stats)
 
-        ball_poss = _parse_percent(self._pick_side(flat.get("ball_possession", {}), is_home))
+    def build_tactical_stats(self, *, event: Dict[str, Any], team_id: int, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Tactical stats from already extracted metrics; only the event (score, sides) is re-read.
 
-        total_shots = _parse_number(self._pick_side(flat.get("total_shots", {}), is_home))
-        shots_on = _parse_number(self._pick_side(flat.get("shots_on_target", {}), is_home))
-        shots_in = _parse_number(self._pick_side(flat.get("shots_inside_box", {}), is_home))
-        shots_out = _parse_number(self._pick_side(flat.get("shots_outside_box", {}), is_home))
+        Live tracking reuses the extracted metrics while only the score changes.
+        """
+        home_team = event.get("homeTeam") or {}
+        away_team = event.get("awayTeam") or {}
 
-        big_chances = _parse_number(self._pick_side(flat.get("big_chances", {}), is_home))
-        big_missed = _parse_number(self._pick_side(flat.get("big_chances_missed", {}), is_home))
+        is_home, team_score, opp_score = self._event_side(event, team_id)
+        team_name = home_team.get("name") if is_home else away_team.get("name")
+        opp_name = away_team.get("name") if is_home else home_team.get("name")
 
-        xg = _parse_number(self._pick_side(flat.get("xg", {}), is_home))
+        result = "W" if team_score > opp_score else "L" if team_score < opp_score else "D"
 
-        passes_total = _parse_number(self._pick_side(flat.get("total_passes", {}), is_home))
+        start_ts = event.get("startTimestamp")
+        # keep as epoch seconds if present; otherwise empty string
+        date = start_ts if isinstance(start_ts, int) else ""
 
-        # accurate passes might be a plain count, while accuracy can be present separately.
-        acc_passes_val = self._pick_side(flat.get("accurate_passes", {}), is_home)
-        acc_passes, acc_pass_pct = _parse_count_and_percent(acc_passes_val)
+        ball_poss = stats["ball_poss"]
+        total_shots = stats["total_shots"]
+        xg = stats["xg"]
+        passes_total = stats["passes_total"]
 
-        pass_acc = _parse_percent(self._pick_side(flat.get("pass_accuracy", {}), is_home))
-        if pass_acc is None and acc_pass_pct is not None:
-            pass_acc = acc_pass_pct
+        acc_passes = stats["acc_passes"]
+        pass_acc = stats["pass_acc"]
+        if pass_acc is None and stats["acc_pass_pct"] is not None:
+            pass_acc = stats["acc_pass_pct"]
         if acc_passes is None and passes_total is not None and pass_acc is not None:
             acc_passes = round((passes_total * pass_acc) / 100.0, 0)
 
-        long_balls_val = self._pick_side(flat.get("long_balls", {}), is_home)
-        long_attempted, _ = _parse_count_and_percent(long_balls_val)
-        acc_long_val = self._pick_side(flat.get("accurate_long_balls", {}), is_home)
-        long_completed, _ = _parse_count_and_percent(acc_long_val)
-
-        corners = _parse_number(self._pick_side(flat.get("corners", {}), is_home))
-        corners_conceded = _parse_number(self._pick_side_other(flat.get("corners", {}), is_home))
-
-        tackles = _parse_number(self._pick_side(flat.get("tackles", {}), is_home))
-        interceptions = _parse_number(self._pick_side(flat.get("interceptions", {}), is_home))
-        clearances = _parse_number(self._pick_side(flat.get("clearances", {}), is_home))
-        blocks = _parse_number(self._pick_side(flat.get("blocked_shots", {}), is_home))
-
-        duels_won = _parse_number(self._pick_side(flat.get("duels_won", {}), is_home))
         duels_total = None
         # If we only have duels won, don't fake total.
 
@@ -582,19 +778,19 @@ class SofaScoreService:
                 "time_in_opponent_half": None,
                 "pass_accuracy": pass_acc,
                 "passes_per_minute": passes_per_min,
-                "long_balls_attempted": long_attempted,
-                "long_balls_completed": long_completed,
+                "long_balls_attempted": stats["long_attempted"],
+                "long_balls_completed": stats["long_completed"],
                 "tempo_rating": tempo_rating,
                 "tactical_insight": possession_insight,
             },
             "shooting_finishing": {
                 "total_shots": total_shots,
-                "shots_on_target": shots_on,
+                "shots_on_target": stats["shots_on"],
                 "shot_conversion_rate": shot_conv,
-                "shots_inside_box": shots_in,
-                "shots_outside_box": shots_out,
-                "big_chances_created": big_chances,
-                "big_chances_missed": big_missed,
+                "shots_inside_box": stats["shots_in"],
+                "shots_outside_box": stats["shots_out"],
+                "big_chances_created": stats["big_chances"],
+                "big_chances_missed": stats["big_missed"],
                 "tactical_insight": shooting_insight,
             },
             "expected_metrics": {
@@ -606,25 +802,25 @@ class SofaScoreService:
                 "performance_rating": None,
             },
             "chance_creation": {
-                "key_passes": _parse_number(self._pick_side(flat.get("key_passes", {}), is_home)),
+                "key_passes": stats["key_passes"],
                 "progressive_passes": None,
                 "passes_into_final_third": None,
                 "passes_into_penalty_area": None,
-                "crosses_attempted": _parse_number(self._pick_side(flat.get("crosses", {}), is_home)),
-                "crosses_accurate": _parse_number(self._pick_side(flat.get("accurate_crosses", {}), is_home)),
+                "crosses_attempted": stats["crosses"],
+                "crosses_accurate": stats["accurate_crosses"],
                 "cutbacks": None,
                 "creation_quality": None,
             },
             "defensive_actions": {
-                "tackles_attempted": tackles,
+                "tackles_attempted": stats["tackles"],
                 "tackles_won": None,
                 "tackle_success_rate": None,
-                "interceptions": interceptions,
-                "blocks": blocks,
-                "clearances": clearances,
+                "interceptions": stats["interceptions"],
+                "blocks": stats["blocks"],
+                "clearances": stats["clearances"],
                 "defensive_duels_won_percent": None,
                 "defensive_rating": None,
-                "duels_won": duels_won,
+                "duels_won": stats["duels_won"],
                 "duels_total": duels_total,
             },
             "pressing_structure": {
@@ -646,14 +842,14 @@ class SofaScoreService:
             "transitions": None,
             "set_pieces": {
                 "attacking": {
-                    "corners_taken": corners,
+                    "corners_taken": stats["corners"],
                     "xG_from_corners": None,
                     "first_contact_success": None,
                     "second_ball_recoveries": None,
                     "set_piece_goals": None,
                 },
                 "defensive": {
-                    "corners_conceded": corners_conceded,
+                    "corners_conceded": stats["corners_conceded"],
                     "marking_type": None,
                     "clearances_under_pressure": None,
                     "shots_conceded_after_set_pieces": None,
@@ -669,21 +865,63 @@ class SofaScoreService:
             },
         }
 
-    async def get_recent_games_tactical(self, team_name: str, limit: int = 5, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Resolve a team by name (or use an explicit team_id) and return normalized tactical stats for its last games."""
+    def normalize_events_matrix(
+        self,
+        *,
+        events: List[Dict[str, Any]],
+        team_id: int,
+        stats_payloads: List[Dict[str, Any]],
+    ) -> TacticalFeatureMatrix:
+        """Batch counterpart of `normalize_event_tactical_stats`.
+
+        Turns N (event, statistics payload) pairs into a `TacticalFeatureMatrix` with the
+        `TACTICAL_FEATURE_COLUMNS` registry; derived metrics are computed column-wise.
+        Raises `ValueError` when `events` and `stats_payloads` differ in length.
+        """
+        if len(events) != len(stats_payloads):
+            raise ValueError(
+                f"normalize_events_matrix: {len(events)} events but {len(stats_payloads)} statistics payloads"
+            )
+        extractor = _tactical_stats_extractor
+        outputs = extractor.outputs
+        raw = np.full((len(events), len(outputs)), np.nan)
+        goals = np.zeros(len(events))
+        for i, (event, payload) in enumerate(zip(events, stats_payloads)):
+            is_home, team_score, _ = self._event_side(event, team_id)
+            goals[i] = team_score
+            values = extractor.extract(payload or {}, is_home)
+            raw[i] = [_number_or_nan(values[name]) for name in outputs]
+
+        src = {name: raw[:, j] for j, name in enumerate(outputs)}
+        shots = src["total_shots"]
+        has_shots = shots > 0
+        safe_shots = np.where(has_shots, shots, 1.0)
+
+        derived = {
+            "possession_control.pass_accuracy": np.where(np.isnan(src["pass_acc"]), src["acc_pass_pct"], src["pass_acc"]),
+            "possession_control.passes_per_minute": np.round(src["passes_total"] / 90.0, 2),
+            "shooting_finishing.shot_conversion_rate": np.where(has_shots, np.round(goals / safe_shots * 100.0, 1), np.nan),
+            "expected_metrics.xG_per_shot": np.where(has_shots, np.round(src["xg"] / safe_shots, 3), np.nan),
+        }
+
+        matrix = np.empty((len(events), len(TACTICAL_FEATURE_COLUMNS)))
+        for j, column in enumerate(TACTICAL_FEATURE_COLUMNS):
+            matrix[:, j] = derived[column] if column in derived else src[_FEATURE_SOURCES[column]]
+        return TacticalFeatureMatrix.from_values(TACTICAL_FEATURE_COLUMNS, matrix)
+
+    async def iter_recent_games_tactical(
+        self, team_name: str, limit: int = 5, team_id: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield normalized tactical stats for a team's last games, one event at a time."""
         if not self.enabled:
-            return []
+            return
 
         resolved_id = int(team_id) if team_id else await self.resolve_team_id(team_name)
         if not resolved_id:
-            return []
+            return
 
         events = await self.get_last_finished_events(resolved_id, limit=limit)
-        if not events:
-            return []
-
-        out: List[Dict[str, Any]] = []
-        for ev in events:
+        for ev in events or []:
             ev_id = ev.get("id")
             if not ev_id:
                 continue
@@ -691,11 +929,13 @@ class SofaScoreService:
                 stats_raw = await self.get_event_statistics(int(ev_id))
                 if not stats_raw:
                     continue
-                out.append(self.normalize_event_tactical_stats(event=ev, team_id=int(resolved_id), stats_raw=stats_raw))
+                yield self.normalize_event_tactical_stats(event=ev, team_id=int(resolved_id), stats_raw=stats_raw)
             except Exception as e:
                 logger.warning(f"SofaScore normalize failed for event={ev_id}: {e}")
 
-        return out
+    async def get_recent_games_tactical(self, team_name: str, limit: int = 5, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Resolve a team by name (or use an explicit team_id) and return normalized tactical stats for its last games."""
+        return [game async for game in self.iter_recent_games_tactical(team_name, limit=limit, team_id=team_id)]
 
 
 _sofascore_service: Optional[SofaScoreService] = None
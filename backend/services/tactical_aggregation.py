@@ -0,0 +1,192 @@
+"""Tactical Aggregation
+
+Columnar aggregation of per-match tactical stats (the dicts produced by
+`SofaScoreService.normalize_event_tactical_stats`, the scraper export loader and the
+advanced stats analyzer).
+
+Aggregates are declared as nested specs whose leaves are `(dotted path, statistic)`
+pairs, e.g. `{"xG_avg": ("expected_metrics.xG", MEAN)}`. A `TacticalAggregator` collects
+the paths of one or more specs and extracts them from the matches in a single traversal:
+numeric paths into a `TacticalFeatureMatrix` (NaN for missing), categorical paths into
+label columns. Means, modes and distributions are then computed column-wise, and
+`summarize` fills a spec from those columns. Spec leaves that are not pairs (e.g. None
+for fields the data cannot provide) are copied as-is.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from services.sofascore_service import TacticalFeatureMatrix
+
+MEAN = "mean"
+MODE = "mode"
+DISTRIBUTION = "distribution"
+
+_CATEGORICAL_STATS = (MODE, DISTRIBUTION)
+
+
+def _is_metric(leaf: Any) -> bool:
+    return (
+        isinstance(leaf, tuple)
+        and len(leaf) == 2
+        and isinstance(leaf[0], str)
+        and leaf[1] in (MEAN, MODE, DISTRIBUTION)
+    )
+
+
+def metric_paths(spec: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """(numeric paths, categorical paths) referenced by a spec, in declaration order."""
+    numeric: List[str] = []
+    categorical: List[str] = []
+
+    def _walk(node: Any) -> None:
+        if isinstance(node, dict):
+            for child in node.values():
+                _walk(child)
+        elif _is_metric(node):
+            path, stat = node
+            target = categorical if stat in _CATEGORICAL_STATS else numeric
+            if path not in target:
+                target.append(path)
+
+    _walk(spec)
+    return numeric, categorical
+
+
+def _lookup(match: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    cur: Any = match
+    for key in path:
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(key)
+    return cur
+
+
+class TacticalColumns:
+    """Columns extracted from a list of per-match tactical stats."""
+
+    def __init__(
+        self,
+        count: int,
+        estimated: bool,
+        matrix: TacticalFeatureMatrix,
+        labels: Dict[str, np.ndarray],
+    ):
+        self.count = count
+        self.estimated = estimated
+        self.matrix = matrix
+        self.labels = labels
+        self._means: Optional[Dict[str, Optional[float]]] = None
+        self._counts: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def column(self, path: str) -> np.ndarray:
+        """Numeric column (NaN where missing)."""
+        return self.matrix.column(path)
+
+    def mean(self, path: str) -> Optional[float]:
+        if self._means is None:
+            self._means = self.matrix.means()
+        return self._means[path]
+
+    def _label_counts(self, path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if path not in self._counts:
+            labels = self.labels[path]
+            if labels.size:
+                self._counts[path] = np.unique(labels, return_index=True, return_counts=True)
+            else:
+                empty = np.array([], dtype=int)
+                self._counts[path] = (np.array([], dtype=str), empty, empty)
+        return self._counts[path]
+
+    def mode(self, path: str) -> Optional[str]:
+        """Most frequent label; ties go to the alphabetically first one."""
+        uniques, _, counts = self._label_counts(path)
+        if not uniques.size:
+            return None
+        return str(uniques[int(np.argmax(counts))])
+
+    def distribution(self, path: str) -> Dict[str, int]:
+        """Label -> occurrences, in order of first appearance."""
+        uniques, first, counts = self._label_counts(path)
+        return {str(uniques[k]): int(counts[k]) for k in np.argsort(first, kind="stable")}
+
+
+class TacticalAggregator:
+    """Paths of one or more aggregate specs, compiled once and extracted in one pass.
+
+    `numeric` / `categorical` add paths that are used outside the specs, and `parsers`
+    maps a numeric path to a converter for string values such as "65%".
+    """
+
+    def __init__(
+        self,
+        *specs: Dict[str, Any],
+        numeric: Iterable[str] = (),
+        categorical: Iterable[str] = (),
+        parsers: Optional[Dict[str, Callable[[Any], Optional[float]]]] = None,
+    ):
+        numeric_paths: List[str] = []
+        categorical_paths: List[str] = []
+        for spec in specs:
+            spec_numeric, spec_categorical = metric_paths(spec)
+            numeric_paths.extend(spec_numeric)
+            categorical_paths.extend(spec_categorical)
+        numeric_paths.extend(numeric)
+        categorical_paths.extend(categorical)
+
+        self.numeric: Tuple[str, ...] = tuple(dict.fromkeys(numeric_paths))
+        self.categorical: Tuple[str, ...] = tuple(dict.fromkeys(categorical_paths))
+        parsers = parsers or {}
+        self._numeric_plan = [(tuple(p.split(".")), parsers.get(p)) for p in self.numeric]
+        self._categorical_plan = [tuple(p.split(".")) for p in self.categorical]
+
+    def extract(self, matches: List[Dict[str, Any]]) -> TacticalColumns:
+        values = np.full((len(matches), len(self.numeric)), np.nan)
+        labels: List[List[str]] = [[] for _ in self.categorical]
+        estimated = False
+
+        for i, match in enumerate(matches):
+            if not isinstance(match, dict):
+                continue
+            estimated = estimated or bool(match.get("estimated", True))
+
+            row = values[i]
+            for j, (path, parser) in enumerate(self._numeric_plan):
+                value = _lookup(match, path)
+                if parser is not None:
+                    value = parser(value)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row[j] = value
+
+            for j, path in enumerate(self._categorical_plan):
+                value = _lookup(match, path)
+                if isinstance(value, str) and value:
+                    labels[j].append(value)
+
+        return TacticalColumns(
+            count=len(matches),
+            estimated=estimated,
+            matrix=TacticalFeatureMatrix.from_values(self.numeric, values),
+            labels={path: np.array(col, dtype=str) for path, col in zip(self.categorical, labels)},
+        )
+
+
+def summarize(columns: TacticalColumns, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill a spec with the aggregates of `columns` (paths must have been extracted)."""
+
+    def _fill(node: Any) -> Any:
+        if isinstance(node, dict):
+            return {key: _fill(child) for key, child in node.items()}
+        if _is_metric(node):
+            path, stat = node
+            if stat == MEAN:
+                return columns.mean(path)
+            if stat == MODE:
+                return columns.mode(path)
+            return columns.distribution(path)
+        return node
+
+    return _fill(spec)
@@ -28,9 +28,9 @@ class TacticalAIEngine:
     # FORMATIONS
     # ------------------------------------------------------------------
     def _recommend_formation(self, stats: Dict) -> Dict:
-        pressing = stats.get('pressing_structure', {})
-        defense = stats.get('defensive_actions', {})
-        shape = stats.get('team_shape', {})
+        pressing = (stats.get('pressing_structure') or {})
+        defense = (stats.get('defensive_actions') or {})
+        shape = (stats.get('team_shape') or {})
 
         try:
             ppda = float(pressing.get('PPDA', 12) or 12)
@@ -103,9 +103,9 @@ class TacticalAIEngine:
             "current_formation": "4-2-3-1"
         }
     def _recommend_pressing(self, stats: Dict) -> Dict:
-        pressing = stats.get('pressing_structure', {})
-        possession = stats.get('possession_control', {})
-        shooting = stats.get('shooting_finishing', {})
+        pressing = (stats.get('pressing_structure') or {})
+        possession = (stats.get('possession_control') or {})
+        shooting = (stats.get('shooting_finishing') or {})
 
         try:
             ppda = float(pressing.get('PPDA', 12) or 12)
@@ -200,8 +200,8 @@ class TacticalAIEngine:
             ]
         }
     def _recommend_player_roles(self, stats: Dict) -> List[Dict]:
-        shape = stats.get('team_shape', {})
-        set_pieces = stats.get('set_pieces', {})
+        shape = (stats.get('team_shape') or {})
+        set_pieces = (stats.get('set_pieces') or {})
 
         roles = []
 
@@ -219,14 +219,14 @@ class TacticalAIEngine:
                 "reason": "Stretch compact midfield block"
             })
 
-        if shape.get('defensive_line_height', 40) > 48:
+        if (shape.get('defensive_line_height') or 40) > 48:
             roles.append({
                 "position": "Striker",
                 "role_change": "False 9",
                 "reason": "Exploit space behind high line"
             })
 
-        if shape.get('defensive_line_height', 40) < 38:
+        if (shape.get('defensive_line_height') or 40) < 38:
             roles.append({
                 "position": "Attacking Midfielder",
                 "role_change": "Advanced Playmaker",
@@ -246,8 +246,8 @@ class TacticalAIEngine:
     # TARGET ZONES
     # ------------------------------------------------------------------
     def _identify_target_zones(self, stats: Dict) -> Dict:
-        shape = stats.get('team_shape', {})
-        transitions = stats.get('transitions', {})
+        shape = (stats.get('team_shape') or {})
+        transitions = (stats.get('transitions') or {})
 
         zones = []
 
@@ -284,8 +284,8 @@ class TacticalAIEngine:
     # SUBSTITUTIONS
     # ------------------------------------------------------------------
     def _recommend_substitutions(self, stats: Dict) -> Dict:
-        context = stats.get('context', {})
-        pressing = stats.get('pressing_structure', {})
+        context = (stats.get('context') or {})
+        pressing = (stats.get('pressing_structure') or {})
 
         subs = []
 
@@ -313,8 +313,8 @@ class TacticalAIEngine:
     # IN-GAME SWITCHES
     # ------------------------------------------------------------------
     def _recommend_in_game_switches(self, stats: Dict) -> List[Dict]:
-        pressing = stats.get('pressing_structure', {})
-        possession = stats.get('possession_control', {})
+        pressing = (stats.get('pressing_structure') or {})
+        possession = (stats.get('possession_control') or {})
 
         try:
             ppda = float(pressing.get('PPDA', 12) or 12)
@@ -368,10 +368,10 @@ class TacticalAIEngine:
             "reason": "No tactical emergency"
         }]
     def _identify_exploitable_weaknesses(self, stats: Dict) -> List[Dict]:
-        pressing = stats.get('pressing_structure', {})
-        defense = stats.get('defensive_actions', {})
-        set_pieces = stats.get('set_pieces', {})
-        transitions = stats.get('transitions', {})
+        pressing = (stats.get('pressing_structure') or {})
+        defense = (stats.get('defensive_actions') or {})
+        set_pieces = (stats.get('set_pieces') or {})
+        transitions = (stats.get('transitions') or {})
 
         try:
             ppda = float(pressing.get('PPDA', 12) or 12)
@@ -435,9 +435,9 @@ class TacticalAIEngine:
 
         return weaknesses
     def _calculate_confidence(self, stats: Dict) -> Dict:
-        pressing = stats.get('pressing_structure', {})
-        defense = stats.get('defensive_actions', {})
-        possession = stats.get('possession_control', {})
+        pressing = (stats.get('pressing_structure') or {})
+        defense = (stats.get('defensive_actions') or {})
+        possession = (stats.get('possession_control') or {})
         matches_analyzed = stats.get("matches_analyzed")
         try:
             matches_analyzed = int(matches_analyzed) if matches_analyzed is not None else 1
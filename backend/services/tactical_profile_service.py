@@ -0,0 +1,230 @@
+"""Tactical Profile Service
+
+Opponent profiles (per-metric means over a team's last `TACTICAL_PROFILE_WINDOW` games
+plus the categorical sections of its latest game) kept up to date in `tactical_profiles`
+as finished events are ingested, instead of being recomputed from every game on each
+analysis.
+
+Each team has one row. Folding a new event only touches that row:
+  - `window_stats`: metric vectors of the last N games, newest first; the window profile
+    is recomputed from these N vectors and stored in `profile`
+  - `running_totals`: all-time sums and counts per metric, home/away points and
+    formation counts, from which `possession_style`, `home_performance_avg` /
+    `away_performance_avg` and `formation_frequency` are derived
+Reading a profile is a lookup of that row. `profile_from_recent_games` builds the same
+profile from a list of games when no stored one is available.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import get_settings
+from services.sofascore_service import TacticalFeatureMatrix
+from services.tactical_aggregation import MEAN, TacticalAggregator, TacticalColumns, summarize
+
+settings = get_settings()
+
+# Averaged opponent profile built from the per-match tactical stats.
+PROFILE_SPEC = {
+    "possession_control": {
+        "possession_percent": ("possession_control.possession_percent", MEAN),
+        "pass_accuracy": ("possession_control.pass_accuracy", MEAN),
+        "passes_per_minute": ("possession_control.passes_per_minute", MEAN),
+    },
+    "shooting_finishing": {
+        "total_shots": ("shooting_finishing.total_shots", MEAN),
+        "shots_on_target": ("shooting_finishing.shots_on_target", MEAN),
+        "big_chances_created": ("shooting_finishing.big_chances_created", MEAN),
+    },
+    "expected_metrics": {
+        "xG": ("expected_metrics.xG", MEAN),
+        "xG_per_shot": ("expected_metrics.xG_per_shot", MEAN),
+    },
+    "defensive_actions": {
+        "interceptions": ("defensive_actions.interceptions", MEAN),
+        "clearances": ("defensive_actions.clearances", MEAN),
+        "blocks": ("defensive_actions.blocks", MEAN),
+    },
+    "set_pieces": {
+        "attacking": {"corners_taken": ("set_pieces.attacking.corners_taken", MEAN)},
+        "defensive": {"corners_conceded": ("set_pieces.defensive.corners_conceded", MEAN)},
+    },
+}
+PROFILE_AGGREGATOR = TacticalAggregator(PROFILE_SPEC)
+
+# Non-numeric sections copied from the latest game (best available signal).
+LATEST_SECTIONS = ("pressing_structure", "team_shape", "transitions", "context", "match_info")
+
+_POINTS = {"W": 3, "D": 1, "L": 0}
+_POSSESSION = "possession_control.possession_percent"
+
+
+def _profile(columns: TacticalColumns, latest: Dict[str, Any]) -> Dict[str, Any]:
+    profile = {
+        "estimated": columns.estimated,
+        "matches_analyzed": columns.count,
+        **summarize(columns, PROFILE_SPEC),
+    }
+    for key in LATEST_SECTIONS:
+        if key in latest:
+            profile[key] = latest.get(key)
+    return profile
+
+
+def profile_from_recent_games(recent_games_tactical: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Profile of a list of per-match tactical stats (newest first)."""
+    if not recent_games_tactical:
+        return {}
+    latest = recent_games_tactical[0] if isinstance(recent_games_tactical[0], dict) else {}
+    return _profile(PROFILE_AGGREGATOR.extract(recent_games_tactical), latest)
+
+
+def _vector(game: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    row = PROFILE_AGGREGATOR.extract([game]).matrix.values[0]
+    return {path: (None if math.isnan(value) else float(value)) for path, value in zip(PROFILE_AGGREGATOR.numeric, row)}
+
+
+def _timestamp(game: Dict[str, Any]) -> int:
+    date = (game.get("match_info") or {}).get("date")
+    return int(date) if isinstance(date, (int, float)) else 0
+
+
+class ProfileState:
+    """The incremental state stored in one `tactical_profiles` row."""
+
+    def __init__(self, window_stats: Optional[List[Dict]], running_totals: Optional[Dict], window: int):
+        self.window = window
+        self.entries: List[Dict[str, Any]] = list(window_stats or [])
+        totals = dict(running_totals or {})
+        self.event_ids: List[int] = list(totals.get("event_ids") or [])
+        self.metrics: Dict[str, List[float]] = {k: list(v) for k, v in (totals.get("metrics") or {}).items()}
+        self.points: Dict[str, List[int]] = {k: list(v) for k, v in (totals.get("points") or {}).items()}
+        self.formations: Dict[str, int] = dict(totals.get("formations") or {})
+        self.latest: Dict[str, Any] = dict(totals.get("latest") or {})
+
+    def _add_metrics(self, values: Dict[str, Optional[float]], sign: int) -> None:
+        for path, value in values.items():
+            if value is None:
+                continue
+            total = self.metrics.setdefault(path, [0.0, 0])
+            total[0] += sign * value
+            total[1] += sign
+
+    def fold(self, event_id: int, game: Dict[str, Any]) -> None:
+        """Add one finished game (or replace its statistics when it was folded before)."""
+        values = _vector(game)
+        timestamp = _timestamp(game)
+        entry = {
+            "event_id": event_id,
+            "timestamp": timestamp,
+            "estimated": bool(game.get("estimated", True)),
+            "values": values,
+        }
+
+        known = event_id in self.event_ids
+        previous = next((e for e in self.entries if e["event_id"] == event_id), None)
+        if known and previous is None:
+            # Already counted and older than the window: nothing left to update.
+            return
+
+        if previous is not None:
+            self._add_metrics(previous["values"], -1)
+            self.entries.remove(previous)
+        else:
+            self.event_ids.append(event_id)
+            info = game.get("match_info") or {}
+            side = "home" if info.get("location") == "Home" else "away"
+            points = self.points.setdefault(side, [0, 0])
+            points[0] += _POINTS.get(info.get("result"), 0)
+            points[1] += 1
+            formation = (game.get("team_shape") or {}).get("formation_detected")
+            if isinstance(formation, str) and formation:
+                self.formations[formation] = self.formations.get(formation, 0) + 1
+        self._add_metrics(values, 1)
+
+        self.entries.append(entry)
+        self.entries.sort(key=lambda e: (e["timestamp"], e["event_id"]), reverse=True)
+        del self.entries[self.window :]
+
+        if timestamp >= int(self.latest.get("timestamp") or 0):
+            self.latest = {
+                "timestamp": timestamp,
+                "sections": {key: game.get(key) for key in LATEST_SECTIONS if key in game},
+            }
+
+    def profile(self) -> Dict[str, Any]:
+        values = np.array(
+            [[np.nan if e["values"].get(p) is None else e["values"][p] for p in PROFILE_AGGREGATOR.numeric] for e in self.entries],
+            dtype=float,
+        ).reshape(len(self.entries), len(PROFILE_AGGREGATOR.numeric))
+        columns = TacticalColumns(
+            count=len(self.entries),
+            estimated=any(e["estimated"] for e in self.entries),
+            matrix=TacticalFeatureMatrix.from_values(PROFILE_AGGREGATOR.numeric, values),
+            labels={},
+        )
+        return _profile(columns, self.latest.get("sections") or {})
+
+    def running_mean(self, path: str) -> Optional[float]:
+        total, count = self.metrics.get(path, (0.0, 0))
+        return total / count if count else None
+
+    def points_per_game(self, side: str) -> Optional[float]:
+        total, count = self.points.get(side, (0, 0))
+        return total / count if count else None
+
+    def formation_frequency(self) -> Dict[str, float]:
+        games = sum(self.formations.values())
+        ranked = sorted(self.formations.items(), key=lambda item: (-item[1], item[0]))
+        return {formation: round(count / games, 3) for formation, count in ranked} if games else {}
+
+    def running_totals(self) -> Dict[str, Any]:
+        return {
+            "event_ids": self.event_ids,
+            "metrics": self.metrics,
+            "points": self.points,
+            "formations": self.formations,
+            "latest": self.latest,
+        }
+
+
+class TacticalProfileService:
+    def __init__(self, repository, window: Optional[int] = None):
+        self.repository = repository
+        self.window = max(1, int(window or getattr(settings, "TACTICAL_PROFILE_WINDOW", 5) or 5))
+
+    def apply(self, row, games: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Fold `(event_id, tactical stats)` games into a `TacticalProfile` row."""
+        state = ProfileState(row.window_stats, row.running_totals, self.window)
+        for event_id, game in sorted(games, key=lambda g: (_timestamp(g[1]), g[0])):
+            state.fold(int(event_id), game)
+
+        frequency = state.formation_frequency()
+        formations = list(frequency)
+        latest_ts = int(state.latest.get("timestamp") or 0)
+
+        row.window_stats = state.entries
+        row.running_totals = state.running_totals()
+        row.profile = state.profile()
+        row.matches_analyzed = len(state.event_ids)
+        row.possession_style = state.running_mean(_POSSESSION)
+        row.home_performance_avg = state.points_per_game("home")
+        row.away_performance_avg = state.points_per_game("away")
+        row.formation_frequency = frequency or None
+        row.primary_formation = formations[0] if formations else None
+        row.secondary_formation = formations[1] if len(formations) > 1 else None
+        row.last_analysis_date = datetime.utcfromtimestamp(latest_ts) if latest_ts else None
+        row.confidence_score = round(min(1.0, len(state.entries) / self.window), 2)
+
+    async def fold(self, api_team_id: int, games: List[Tuple[int, Dict[str, Any]]]) -> None:
+        if games:
+            await self.repository.update_tactical_profile(api_team_id, lambda row: self.apply(row, games))
+
+    async def get(self, api_team_id: int) -> Optional[Dict[str, Any]]:
+        """Stored window profile of a team, or None when nothing was folded for it yet."""
+        return await self.repository.tactical_profile(api_team_id)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import unittest
+
+from services.analysis_jobs_service import (
+    AnalysisJobService,
+    InProcessAnalysisJobBackend,
+    RedisAnalysisJobBackend,
+    _RELEASE_SCRIPT,
+)
+from services.focal_team import FocalTeam, get_focal_team
+
+
+class FakeSnapshots:
+    def __init__(self, fail_for=()):
+        self.calls = []
+        self.fail_for = set(fail_for)
+        self.active = 0
+        self.max_active = 0
+        self.release = asyncio.Event()
+
+    async def materialize(self, opponent_id, opponent_name, team=None):
+        self.calls.append(opponent_id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+            if opponent_id in self.fail_for:
+                raise RuntimeError("SofaScore unavailable")
+            return {"analysis": {"match": f"{team.name} vs {opponent_name}"}}
+        finally:
+            self.active -= 1
+
+
+class AnalysisJobServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.snapshots = FakeSnapshots(fail_for={"3003"})
+        self.svc = AnalysisJobService(
+            backend=InProcessAnalysisJobBackend(),
+            snapshots=self.snapshots,
+            cache=object(),
+            concurrency=2,
+        )
+
+    async def _wait_for(self, job_id, status):
+        for _ in range(200):
+            job = await self.svc.get(job_id)
+            if job["status"] == status:
+                return job
+            await asyncio.sleep(0.01)
+        self.fail(f"job {job_id} never reached {status}")
+
+    async def test_pending_duplicates_share_one_job(self):
+        first = await self.svc.enqueue("3001", "Moreirense")
+        second = await self.svc.enqueue("3001", "Moreirense")
+        other = await self.svc.enqueue("3002", "Braga")
+
+        self.assertEqual(first["status"], "pending")
+        self.assertEqual(first["id"], second["id"])
+        self.assertNotEqual(first["id"], other["id"])
+
+    async def test_jobs_are_deduplicated_per_focal_team(self):
+        default = await self.svc.enqueue("3001", "Moreirense")
+        braga = await self.svc.enqueue("3001", "Moreirense", FocalTeam(3002, "SC Braga"))
+
+        self.assertNotEqual(default["id"], braga["id"])
+        self.assertEqual(braga["team_id"], 3002)
+        self.assertEqual(default["team_id"], get_focal_team().id)
+
+    async def test_workers_respect_concurrency_and_store_results(self):
+        jobs = [await self.svc.enqueue(str(3000 + i), f"Team {i}") for i in range(1, 5)]
+        workers = asyncio.create_task(self.svc.run_workers())
+        try:
+            await self._wait_for(jobs[1]["id"], "running")
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.snapshots.max_active, 2)
+
+            self.snapshots.release.set()
+            done = await self._wait_for(jobs[0]["id"], "done")
+            failed = await self._wait_for(jobs[2]["id"], "failed")
+            await self._wait_for(jobs[3]["id"], "done")
+        finally:
+            workers.cancel()
+
+        self.assertEqual(done["result"], {"match": "Gil Vicente vs Team 1"})
+        self.assertIn("SofaScore unavailable", failed["error"])
+        self.assertEqual(self.snapshots.max_active, 2)
+
+        # A finished job no longer deduplicates: asking again queues a fresh analysis.
+        again = await self.svc.enqueue("3001", "Team 1")
+        self.assertNotEqual(again["id"], jobs[0]["id"])
+
+    async def test_missing_job_and_invalid_request(self):
+        self.assertIsNone(await self.svc.get("missing"))
+        with self.assertRaises(ValueError):
+            await self.svc.enqueue("3001", "")
+
+
+class FakeRedis:
+    """The commands the Redis job backend uses; `eval` runs the release script's logic."""
+
+    def __init__(self):
+        self.data = {}
+        self.lists = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def eval(self, script, numkeys, active_key, job_key, job_id):
+        assert script == _RELEASE_SCRIPT
+        if self.data.get(active_key) != job_id:
+            return 0
+        raw = self.data.get(job_key)
+        if raw and json.loads(raw)["status"] in ("pending", "running"):
+            return 0
+        return await self.delete(active_key)
+
+
+class RedisAnalysisJobBackendTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.backend = RedisAnalysisJobBackend(self.redis)
+        self.active_key = self.backend._dedup_key("9764:3001_Moreirense")
+
+    async def test_claimed_entry_always_points_to_a_stored_job(self):
+        original_set = self.redis.set
+        seen = []
+
+        async def set_and_check(key, value, nx=False, ex=None):
+            if key == self.active_key:
+                seen.append(await self.backend.get(value))
+            return await original_set(key, value, nx=nx, ex=ex)
+
+        self.redis.set = set_and_check
+        job = await self.backend.enqueue("3001", "Moreirense", 9764)
+        self.assertEqual(seen[0]["id"], job["id"])
+        self.assertEqual(await self.backend.enqueue("3001", "Moreirense", 9764), job)
+        # The losing enqueue does not leave its job document behind.
+        self.assertEqual(len([k for k in self.redis.data if ":job:" in k]), 1)
+
+    async def test_only_finished_jobs_release_the_entry(self):
+        first = await self.backend.enqueue("3001", "Moreirense", 9764)
+        # An entry pointing to an active job is never released.
+        self.assertFalse(await self.backend._release(self.active_key, first["id"]))
+
+        await self.backend.finish(first, result={})
+        self.assertNotIn(self.active_key, self.redis.data)
+        second = await self.backend.enqueue("3001", "Moreirense", 9764)
+
+        # Finishing an older job does not drop the newer job's entry.
+        await self.backend.finish(first, result={})
+        self.assertEqual(self.redis.data[self.active_key], second["id"])
+
+        # A stale entry (finished job) is replaced by the next enqueue.
+        await self.backend._save({**second, "status": "done"})
+        third = await self.backend.enqueue("3001", "Moreirense", 9764)
+        self.assertNotEqual(third["id"], second["id"])
+        self.assertEqual(self.redis.data[self.active_key], third["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from services.analysis_snapshot_service import AnalysisSnapshotService, SnapshotMaterializationError
+from services.focal_team import FocalTeam, get_focal_team
+
+
+class FakeCache:
+    def __init__(self, available=True):
+        self.store = {}
+        self.available = available
+
+    async def is_available(self):
+        return self.available
+
+    async def get(self, cache_type, identifier, namespace=None):
+        return self.store.get((cache_type, namespace, identifier))
+
+    async def set(self, cache_type, identifier, data, ttl=None, namespace=None):
+        if not self.available:
+            return False
+        self.store[(cache_type, namespace, identifier)] = data
+        return True
+
+
+class FakeAnalysis:
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    async def analyze_match(self, opponent_id, opponent_name, team=None):
+        self.calls.append(opponent_id)
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return {"match": f"{team.name} vs {opponent_name}", "data_source": "sofascore"}
+
+
+def _builders():
+    return {
+        "opponent_stats": lambda oid, name, analysis: {"opponent": name, "data_source": analysis["data_source"]},
+        "tactical_plan": lambda oid, name, analysis: {"opponent": name, "tactical_plan": {}},
+    }
+
+
+class AnalysisSnapshotServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = FakeCache()
+        self.analysis = FakeAnalysis()
+        self.svc = AnalysisSnapshotService(cache=self.cache, analysis=self.analysis, builders=_builders())
+        self.svc.upcoming_opponents = 2
+
+    async def test_materialize_stores_every_section_once(self):
+        snapshot = await self.svc.materialize("3001", "Moreirense")
+
+        self.assertEqual(self.analysis.calls, ["3001"])
+        self.assertEqual(snapshot["opponent_stats"]["opponent"], "Moreirense")
+        self.assertIn("tactical_plan", snapshot)
+
+        served = await self.svc.serve("tactical_plan", "3001", "Moreirense")
+        self.assertTrue(served["snapshot"])
+        self.assertEqual(served["generated_at"], snapshot["generated_at"])
+        self.assertIsNone(await self.svc.serve("tactical_plan", "3002", "Braga"))
+
+    async def test_concurrent_schedules_share_one_analysis(self):
+        first = self.svc.schedule("3001", "Moreirense")
+        second = self.svc.schedule("3001", "Moreirense")
+        self.assertIs(first, second)
+        await first
+        self.assertEqual(self.analysis.calls, ["3001"])
+
+    async def test_refresh_upcoming_skips_finished_and_fresh_opponents(self):
+        await self.svc.materialize("3003", "Porto")
+        self.analysis.calls.clear()
+        fixtures = [
+            {"status": "finished", "date": "2025-01-01", "opponent_id": "3009", "opponent_name": "Benfica"},
+            {"status": "upcoming", "date": "2025-02-08", "opponent_id": "3001", "opponent_name": "Moreirense"},
+            {"status": "upcoming", "date": "2025-02-01", "opponent_id": "3003", "opponent_name": "Porto"},
+            {"status": "upcoming", "date": "2025-02-15", "opponent_id": "3002", "opponent_name": "Braga"},
+        ]
+
+        self.assertEqual([o["id"] for o in self.svc.upcoming_opponents_from(fixtures)], ["3003", "3001"])
+        self.assertEqual(await self.svc.refresh_upcoming(fixtures), ["3001"])
+        self.assertEqual(self.analysis.calls, ["3001"])
+
+    async def test_stale_snapshot_is_served_and_refreshed(self):
+        snapshot = await self.svc.materialize("3001", "Moreirense")
+        snapshot["generated_at"] = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        self.analysis.calls.clear()
+
+        served = await self.svc.serve("opponent_stats", "3001", "Moreirense")
+        self.assertEqual(served["generated_at"], snapshot["generated_at"])
+        await asyncio.gather(*self.svc._inflight.values())
+        self.assertEqual(self.analysis.calls, ["3001"])
+
+    async def test_snapshots_are_kept_per_focal_team(self):
+        braga = FocalTeam(3002, "SC Braga")
+        await self.svc.materialize("3001", "Moreirense")
+        self.assertIsNone(await self.svc.serve("tactical_plan", "3001", "Moreirense", braga))
+
+        first = self.svc.schedule("3001", "Moreirense", braga)
+        self.assertIsNot(first, self.svc.schedule("3001", "Moreirense"))
+        snapshot = await first
+        self.assertEqual(snapshot["analysis"]["match"], "SC Braga vs Moreirense")
+        self.assertEqual(snapshot["focal_team"], {"id": 3002, "name": "SC Braga"})
+        self.assertEqual(
+            sorted(namespace for _, namespace, _ in self.cache.store),
+            [braga.namespace, get_focal_team().namespace],
+        )
+
+    async def test_missing_snapshot_is_scheduled_and_pending(self):
+        self.assertIsNone(await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense"))
+        await asyncio.gather(*self.svc._inflight.values())
+        served = await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense")
+        self.assertTrue(served["snapshot"])
+        self.assertEqual(self.analysis.calls, ["3001"])
+
+    async def test_without_redis_the_analysis_is_awaited_and_kept_locally(self):
+        self.cache.available = False
+        served = await self.svc.serve_or_schedule("opponent_stats", "3001", "Moreirense")
+        self.assertEqual(served["opponent"], "Moreirense")
+
+        # Later requests are served from the process-local snapshot.
+        self.assertTrue((await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense"))["snapshot"])
+        self.assertEqual(self.analysis.calls, ["3001"])
+        self.assertEqual(self.cache.store, {})
+
+    async def test_failed_analysis_is_reported_once(self):
+        self.analysis.error = RuntimeError("upstream down")
+        self.assertIsNone(await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense"))
+        await asyncio.gather(*self.svc._inflight.values())
+
+        with self.assertRaisesRegex(SnapshotMaterializationError, "upstream down"):
+            await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense")
+        # The next request retries.
+        self.assertIsNone(await self.svc.serve_or_schedule("tactical_plan", "3001", "Moreirense"))
+        await asyncio.gather(*self.svc._inflight.values())
+        self.assertEqual(self.analysis.calls, ["3001", "3001"])
+
+        self.cache.available = False
+        with self.assertRaises(SnapshotMaterializationError):
+            await self.svc.serve_or_schedule("tactical_plan", "3002", "Braga")
+
+
+if __name__ == "__main__":
+    unittest.main()
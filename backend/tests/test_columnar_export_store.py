@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+
+from services.columnar_export_store import ColumnarExportStore, pq, team_slug
+
+if pq is not None:
+    import pyarrow as pa
+
+
+@unittest.skipIf(pq is None, "pyarrow not installed")
+class ColumnarExportStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "columnar")
+        self.parts = {}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_part(self, partition, name, rows):
+        relative = f"{partition}/{name}.parquet"
+        path = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pylist(rows)
+        pq.write_table(table, path)
+        dates = sorted(r["match_date"] for r in rows if r.get("match_date"))
+        self.parts.setdefault(partition, {"parts": []})["parts"].append(
+            {
+                "file": relative,
+                "rows": len(rows),
+                "event_ids": [r["event_id"] for r in rows],
+                "date_min": dates[0] if dates else None,
+                "date_max": dates[-1] if dates else None,
+                "columns": table.column_names,
+            }
+        )
+        with open(os.path.join(self.root, "manifest.json"), "w", encoding="utf-8") as fh:
+            json.dump({"version": 1, "partitions": self.parts}, fh)
+
+    def test_team_slug_matches_scraper_partitions(self):
+        self.assertEqual(team_slug("Vitória SC"), "vitoria_sc")
+        self.assertEqual(team_slug("FC Porto"), "fc_porto")
+
+    def test_read_matches_selects_team_columns_and_dates(self):
+        partition = "matches/team=fc_porto"
+        self._write_part(partition, "part-1", [
+            {"event_id": 1, "match_date": "2025-01-10", "ball_possession_home": "51%", "corners_home": "3"},
+            {"event_id": 2, "match_date": "2025-02-10", "ball_possession_home": "52%", "corners_home": "4"},
+        ])
+        self._write_part(partition, "part-2", [
+            {"event_id": 2, "match_date": "2025-02-10", "ball_possession_home": "60%", "corners_home": "4"},
+            {"event_id": 3, "match_date": "2025-03-10", "ball_possession_home": "53%", "corners_home": "5"},
+        ])
+        self._write_part("matches/team=braga", "part-1", [
+            {"event_id": 9, "match_date": "2025-02-11", "ball_possession_home": "40%"},
+        ])
+
+        store = ColumnarExportStore(self.tmp.name)
+        rows = store.read_matches(
+            "FC Porto", columns=["ball_possession_home"], date_from="2025-02-01", date_to="2025-03-31"
+        )
+
+        self.assertEqual([r["event_id"] for r in rows], [3, 2])
+        # The newest part wins for events stored twice.
+        self.assertEqual(rows[1]["ball_possession_home"], "60%")
+        self.assertNotIn("corners_home", rows[0])
+        self.assertEqual(len(store.read_matches("FC Porto", limit=2)), 2)
+        self.assertEqual(store.read_matches("Benfica"), [])
+
+    def test_read_fixtures_uses_the_newest_snapshot_only(self):
+        self._write_part("fixtures", "part-1", [
+            {"event_id": 1, "match_date": "2025-03-01", "opponent": "Braga"},
+            {"event_id": 2, "match_date": "2025-03-08", "opponent": "Porto"},
+        ])
+        self._write_part("fixtures", "part-2", [
+            {"event_id": 3, "match_date": "2025-03-15", "opponent": "Benfica"},
+            {"event_id": 1, "match_date": "2025-03-04", "opponent": "Braga"},
+        ])
+
+        rows = ColumnarExportStore(self.tmp.name).read_fixtures()
+        self.assertEqual([(r["event_id"], r["match_date"]) for r in rows], [(1, "2025-03-04"), (3, "2025-03-15")])
+
+    def test_unavailable_without_manifest(self):
+        store = ColumnarExportStore(self.tmp.name)
+        self.assertFalse(store.available)
+        self.assertEqual(store.read_fixtures(), [])
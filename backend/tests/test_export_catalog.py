@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from services.export_catalog import ExportCatalog
+
+
+class ExportCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dirs = [os.path.join(self.tmp.name, "exports"), os.path.join(self.tmp.name, "legacy")]
+        for directory in self.dirs:
+            os.makedirs(directory)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _touch(self, directory, name):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write("[]")
+        # Make sure the directory mtime moves even on coarse-grained filesystems.
+        stat = os.stat(directory)
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        return path
+
+    def test_indexes_by_opponent_kind_and_timestamp(self):
+        old = self._touch(self.dirs[1], "gil_vicente_next_opponent_FC_Porto_individual_20250101_120000.json")
+        new = self._touch(self.dirs[0], "gil_vicente_next_opponent_FC_Porto_individual_20250301_120000.json")
+        self._touch(self.dirs[0], "gil_vicente_next_opponent_FC_Porto_aggregated_20250301_120000.json")
+        self._touch(self.dirs[0], "gil_vicente_next_opponent_Braga_individual_20250401_120000.json")
+        fixtures = self._touch(self.dirs[0], "gil_vicente_fixtures_20250402_120000.json")
+
+        catalog = ExportCatalog(self.dirs)
+
+        self.assertEqual(catalog.opponent_paths("FC Porto"), [new, old])
+        self.assertEqual(len(catalog.opponent_paths("fc porto", kind="aggregated")), 1)
+        self.assertEqual(catalog.fixture_paths(), [fixtures])
+
+    def test_refresh_picks_up_new_exports(self):
+        catalog = ExportCatalog(self.dirs)
+        self.assertEqual(catalog.opponent_paths("Braga"), [])
+
+        path = self._touch(self.dirs[0], "gil_vicente_next_opponent_Braga_individual_20250401_120000.json")
+        self.assertEqual(catalog.opponent_paths("Braga"), [path])
+
+    def test_substring_fallback_for_partial_names(self):
+        exact = self._touch(self.dirs[0], "gil_vicente_next_opponent_SC_Braga_individual_20250401_120000.json")
+        legacy = self._touch(self.dirs[1], "braga_individual_old.json")
+
+        catalog = ExportCatalog(self.dirs)
+
+        self.assertEqual(catalog.opponent_paths("Braga"), [exact, legacy])
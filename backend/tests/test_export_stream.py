@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from services import export_stream
+from services.export_stream import iter_export_records
+
+
+class ExportStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.records = [{"id": i, "note": "a, ] } [" * i, "nested": [{"x": i}]} for i in range(30)]
+        # Tiny chunks force elements to straddle chunk boundaries.
+        patcher = patch.object(export_stream, "CHUNK_SIZE", 16)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        return path
+
+    def test_json_array_is_decoded_element_by_element(self):
+        path = self._write("export.json", json.dumps(self.records, indent=2))
+        self.assertEqual(list(iter_export_records(path)), self.records)
+
+    def test_ndjson(self):
+        path = self._write("export.ndjson", "\n".join(json.dumps(r) for r in self.records) + "\n\n")
+        self.assertEqual(list(iter_export_records(path)), self.records)
+
+    def test_object_root_uses_list_key(self):
+        path = self._write("fixtures.json", json.dumps({"fixtures": self.records[:3]}))
+        self.assertEqual(list(iter_export_records(path, list_key="fixtures")), self.records[:3])
+        self.assertEqual(list(iter_export_records(path)), [])
+
+    def test_consumer_can_stop_before_the_end_of_the_file(self):
+        # Everything after the second record is garbage; it is never decoded.
+        path = self._write("partial.json", json.dumps(self.records[:2])[:-1] + ", {broken")
+        records = iter_export_records(path)
+        self.assertEqual([next(records), next(records)], self.records[:2])
+        self.assertEqual(list(records), [])
+
+    def test_missing_file_yields_nothing(self):
+        self.assertEqual(list(iter_export_records(os.path.join(self.tmp.name, "nope.json"))), [])
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from api.routes import real_fixtures
+from services import fixture_index
+from services.fixture_index import FixtureIndex, get_fixture_index
+from services.focal_team import get_focal_team
+
+
+def _fixture(match_id, date, opponent_id, name, status="upcoming"):
+    return {
+        "id": match_id,
+        "date": date,
+        "time": "20:15:00",
+        "status": status,
+        "opponent_id": opponent_id,
+        "opponent_name": name,
+    }
+
+
+FIXTURES = [
+    _fixture(3, "2025-10-20", "12", "Porto"),
+    _fixture(1, "2025-08-10", "11", "Benfica", "finished"),
+    _fixture(4, "2025-09-02", "13", None, "postponed"),
+    _fixture(2, "2025-09-01", "12", "Porto", "finished"),
+    _fixture(5, "2025-11-03", "11", "Benfica"),
+]
+
+
+class FixtureIndexTests(unittest.TestCase):
+    def test_lookups(self):
+        index = FixtureIndex(FIXTURES)
+
+        self.assertEqual([f["id"] for f in index.fixtures], [1, 2, 4, 3, 5])
+        self.assertEqual([f["id"] for f in index.upcoming], [4, 3, 5])
+        self.assertEqual([f["id"] for f in index.by_status["finished"]], [1, 2])
+        self.assertEqual(index.opponent_name(12), "Porto")
+        self.assertIsNone(index.opponent_name("13"))
+        self.assertIsNone(index.opponent_name("99"))
+        self.assertEqual(
+            index.opponents,
+            [{"id": "13", "name": None}, {"id": "11", "name": "Benfica"}, {"id": "12", "name": "Porto"}],
+        )
+
+    def test_index_is_reused_while_the_stamp_is_unchanged(self):
+        self.addCleanup(fixture_index._indexes.clear)
+        data = {"fixtures": list(FIXTURES), "indexed_at": 100.0}
+
+        index = get_fixture_index("team_1", data)
+        self.assertIs(get_fixture_index("team_1", {**data, "data_source": "cache"}), index)
+        self.assertIsNot(get_fixture_index("team_2", data), index)
+
+        rebuilt = get_fixture_index("team_1", {"fixtures": FIXTURES[:1], "indexed_at": 200.0})
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(len(rebuilt.fixtures), 1)
+
+        # Builds without a stamp (cached before indexing) are indexed but not kept.
+        self.assertIsNot(get_fixture_index("team_1", {"fixtures": FIXTURES}), rebuilt)
+        self.assertIs(get_fixture_index("team_1", {"fixtures": [], "indexed_at": 200.0}), rebuilt)
+
+
+class FakeCache:
+    def __init__(self):
+        self.sets = 0
+
+    async def set(self, *args, **kwargs):
+        self.sets += 1
+        return True
+
+
+class ManualFixturesTests(unittest.IsolatedAsyncioTestCase):
+    async def test_manual_build_is_reused_until_the_file_changes(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "manual_fixtures.json")
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"fixtures": [{"date": "2030-01-01", "opponent_id": "12", "opponent_name": "Porto"}]}, fh)
+
+        cache = FakeCache()
+        normalize = mock.Mock(side_effect=real_fixtures._normalize_fixture)
+        self.addCleanup(real_fixtures._manual_build.clear)
+        with mock.patch.dict(os.environ, {"MANUAL_FIXTURES_PATH": path}), \
+                mock.patch.object(real_fixtures, "get_cache_service", return_value=cache), \
+                mock.patch.object(real_fixtures, "_normalize_fixture", normalize), \
+                mock.patch.object(real_fixtures, "_materialize_upcoming") as materialize:
+            first = await real_fixtures.load_fixtures(get_focal_team())
+            second = await real_fixtures.load_fixtures(get_focal_team())
+            self.assertIs(second, first)
+            self.assertEqual((normalize.call_count, cache.sets, materialize.call_count), (1, 1, 1))
+
+            os.utime(path, (first["indexed_at"] + 10, first["indexed_at"] + 10))
+            third = await real_fixtures.load_fixtures(get_focal_team())
+            self.assertIsNot(third, first)
+            self.assertEqual((normalize.call_count, cache.sets, materialize.call_count), (2, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
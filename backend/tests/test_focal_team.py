@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+
+from services import focal_team
+from services.cache_service import CacheService
+from services.focal_team import FocalTeam, UnknownFocalTeamError, get_focal_team
+
+
+class FocalTeamTests(unittest.TestCase):
+    def setUp(self):
+        focal_team._teams = None
+        self.addCleanup(setattr, focal_team, "_teams", None)
+
+    def test_configured_teams_and_default(self):
+        with mock.patch.object(focal_team.settings, "FOCAL_TEAMS_JSON", '{"3002": "SC Braga"}'):
+            self.assertEqual(get_focal_team(), FocalTeam(9764, "Gil Vicente"))
+            self.assertEqual(get_focal_team("3002"), FocalTeam(3002, "SC Braga"))
+            with self.assertRaises(UnknownFocalTeamError):
+                get_focal_team(3003)
+
+    def test_invalid_configuration_serves_the_default_team(self):
+        with mock.patch.object(focal_team.settings, "FOCAL_TEAMS_JSON", "not json"):
+            self.assertEqual(list(focal_team.focal_teams()), [9764])
+
+    def test_cache_keys_are_namespaced_per_team(self):
+        cache = CacheService()
+        self.assertEqual(cache._get_cache_key("fixtures", "all"), "gil_vicente:fixtures:team_9764:all")
+        self.assertEqual(
+            cache._get_cache_key("fixtures", "all", FocalTeam(3002, "SC Braga").namespace),
+            "gil_vicente:fixtures:team_3002:all",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import copy
+import unittest
+from unittest import mock
+
+from fastapi import WebSocketDisconnect
+
+from api.routes import live_match
+from services.advanced_stats_analyzer import AdvancedStatsAnalyzer
+from services.live_match_service import LiveMatchService
+from services.sofascore_service import SofaScoreService
+
+GIL_ID = 9764
+
+
+def _stats(shots, possession=55):
+    return {
+        "statistics": [
+            {
+                "period": "ALL",
+                "groups": [
+                    {
+                        "statisticsItems": [
+                            {"name": "Ball possession", "home": f"{possession}%", "away": f"{100 - possession}%"},
+                            {"name": "Total shots", "home": str(shots), "away": "4"},
+                        ]
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FakeSofa(SofaScoreService):
+    def __init__(self):
+        super().__init__()
+        self.event = {
+            "id": 555,
+            "homeTeam": {"id": GIL_ID, "name": "Gil Vicente"},
+            "awayTeam": {"id": 3001, "name": "Moreirense"},
+            "homeScore": {"current": 0},
+            "awayScore": {"current": 0},
+            "status": {"type": "inprogress", "description": "1st half"},
+            "startTimestamp": 1_700_000_000,
+        }
+        self.stats = _stats(3)
+        self.incidents = [{"id": 1, "incidentType": "period", "time": 0}]
+        self.requests = []
+        self.extractions = 0
+
+    async def get_live_event(self, team_id):
+        self.requests.append("live")
+        return copy.deepcopy(self.event)
+
+    async def get_event(self, event_id):
+        self.requests.append("event")
+        return copy.deepcopy(self.event)
+
+    async def get_event_statistics(self, event_id):
+        self.requests.append("statistics")
+        return copy.deepcopy(self.stats)
+
+    async def get_event_incidents(self, event_id):
+        self.requests.append("incidents")
+        return copy.deepcopy(self.incidents)
+
+    def extract_event_stats(self, **kwargs):
+        self.extractions += 1
+        return super().extract_event_stats(**kwargs)
+
+
+class LiveMatchServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sofa = FakeSofa()
+        self.svc = LiveMatchService(sofa=self.sofa, analyzer=AdvancedStatsAnalyzer(), team_id=GIL_ID)
+        self.svc.min_interval, self.svc.max_interval = 10, 60
+
+    async def test_only_changed_parts_are_recomputed_and_sent(self):
+        [snapshot] = await self.svc.poll_once()
+        self.assertEqual(snapshot["type"], "snapshot")
+        self.assertEqual(snapshot["tactical_stats"]["shooting_finishing"]["total_shots"], 3)
+        self.assertEqual(self.sofa.extractions, 1)
+
+        # Nothing changed: no message, no re-extraction, and the interval backs off.
+        self.assertEqual(await self.svc.poll_once(), [])
+        self.assertEqual(self.sofa.extractions, 1)
+        self.assertGreater(self.svc.interval, 10)
+
+        # Goal: the score-dependent parts are rebuilt from the cached metrics.
+        self.sofa.event["homeScore"]["current"] = 1
+        self.sofa.incidents.insert(0, {"id": 2, "incidentType": "goal", "time": 23})
+        [update] = await self.svc.poll_once()
+        self.assertEqual(self.sofa.extractions, 1)
+        self.assertEqual(update["event"]["home_score"], 1)
+        self.assertEqual(update["tactical_stats"]["match_info"]["score"], "1-0")
+        self.assertNotIn("possession_control", update["tactical_stats"])
+        self.assertIn("advanced_stats", update)
+        self.assertEqual([i["id"] for i in update["incidents"]], [2])
+        self.assertEqual(self.svc.interval, 10)
+
+        # New statistics only: metrics are re-extracted, the advanced analysis is left alone.
+        self.sofa.stats = _stats(5)
+        [update] = await self.svc.poll_once()
+        self.assertEqual(self.sofa.extractions, 2)
+        self.assertEqual(set(update), {"type", "event_id", "version", "tactical_stats"})
+        self.assertEqual(update["tactical_stats"]["shooting_finishing"]["total_shots"], 5)
+
+    async def test_subscribers_share_one_poller_and_get_finished(self):
+        first = self.svc.subscribe()
+        second = self.svc.subscribe()
+        try:
+            snapshot = await first.get()
+            self.assertEqual(await second.get(), snapshot)
+            self.assertEqual(self.sofa.requests.count("statistics"), 1)
+        finally:
+            self.svc.unsubscribe(first)
+            self.svc.unsubscribe(second)
+        self.assertIsNone(self.svc._poller)
+
+        self.sofa.event["status"] = {"type": "finished", "description": "Ended"}
+        [finished] = await self.svc.poll_once()
+        self.assertEqual(finished["type"], "finished")
+        self.assertIsNone(self.svc.state)
+        self.assertEqual(self.svc.interval, self.svc.idle_interval)
+
+    async def test_idle_without_live_match(self):
+        self.sofa.event["status"] = {"type": "notstarted"}
+        current = await self.svc.current()
+        self.assertEqual(current["type"], "idle")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.closed = asyncio.Event()
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive_text(self):
+        await self.closed.wait()
+        raise WebSocketDisconnect(1000)
+
+
+class LiveMatchWebSocketTests(unittest.IsolatedAsyncioTestCase):
+    async def test_disconnect_unsubscribes_while_no_match_is_live(self):
+        sofa = FakeSofa()
+        sofa.event = None
+        svc = LiveMatchService(sofa=sofa, analyzer=AdvancedStatsAnalyzer(), team_id=GIL_ID)
+        websocket = FakeWebSocket()
+
+        with mock.patch.object(live_match, "get_live_match_service", return_value=svc):
+            handler = asyncio.create_task(live_match.live_match_websocket(websocket, team=None))
+            await asyncio.sleep(0.01)
+            self.assertEqual(len(svc._subscribers), 1)
+
+            websocket.closed.set()
+            await asyncio.wait_for(handler, timeout=1)
+
+        self.assertEqual(websocket.sent, [])
+        self.assertEqual(svc._subscribers, set())
+        self.assertIsNone(svc._poller)
+
+
+if __name__ == "__main__":
+    unittest.main()
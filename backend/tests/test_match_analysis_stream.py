@@ -0,0 +1,185 @@
+import time
+import unittest
+
+from services.match_analysis_service import MatchAnalysisService
+from services.match_history_service import MatchHistoryService
+from services.sofascore_service import SofaScoreService
+from services.advanced_stats_analyzer import get_advanced_stats_analyzer
+from services.focal_team import get_focal_team
+from services.tactical_ai_engine import get_tactical_ai_engine
+
+
+def _event(event_id, home_id, away_id, home_score, away_score, ts):
+    return {
+        "id": event_id,
+        "homeTeam": {"id": home_id, "name": f"Team {home_id}"},
+        "awayTeam": {"id": away_id, "name": f"Team {away_id}"},
+        "homeScore": {"current": home_score},
+        "awayScore": {"current": away_score},
+        "status": {"type": "finished"},
+        "startTimestamp": ts,
+    }
+
+
+class FakeSofa(SofaScoreService):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.played = {}
+        self.next_kickoff = None
+
+    async def get_last_finished_events(self, team_id, limit=10, max_pages=3):
+        self.calls.append(("events", team_id))
+        played = self.played.get(team_id, 3)
+        return [_event(team_id * 10 + i, team_id, 1, 2, i, 1_700_000_000 + i) for i in range(played)]
+
+    async def get_upcoming_events(self, team_id, limit=5, max_pages=2):
+        self.calls.append(("upcoming", team_id))
+        if self.next_kickoff is None:
+            return []
+        return [{"id": 1, "startTimestamp": self.next_kickoff, "status": {"type": "notstarted"}}]
+
+    async def get_event_statistics(self, event_id):
+        self.calls.append(("stats", event_id))
+        if event_id % 10 == 0:
+            return {}
+        possession = 50 + event_id % 10 - 1
+        return {
+            "statistics": [
+                {
+                    "period": "ALL",
+                    "groups": [
+                        {
+                            "statisticsItems": [
+                                {"name": "Ball possession", "home": f"{possession}%", "away": f"{100 - possession}%"},
+                                {"name": "Total shots", "home": "10", "away": "4"},
+                            ]
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+class FakeCache:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, cache_type, identifier, namespace=None):
+        return self.store.get((cache_type, namespace, identifier))
+
+    async def set(self, cache_type, identifier, data, ttl=None, namespace=None):
+        self.store[(cache_type, namespace, identifier)] = data
+        return True
+
+    async def delete(self, cache_type, identifier, namespace=None):
+        return self.store.pop((cache_type, namespace, identifier), None) is not None
+
+
+class FakeExports:
+    def load_recent_games_tactical(self, opponent_name, limit=5):
+        return []
+
+
+class MatchAnalysisStreamTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.svc = MatchAnalysisService.__new__(MatchAnalysisService)
+        self.svc.sofa = FakeSofa()
+        self.svc.scraper_exports = FakeExports()
+        self.svc.stats_analyzer = get_advanced_stats_analyzer()
+        self.svc.ai_engine = get_tactical_ai_engine()
+        self.svc.history = MatchHistoryService(sofa=self.svc.sofa, enabled=False)
+        self.svc.cache = FakeCache()
+        self.svc.focal_match_seconds = 9000
+        self.svc.focal_max_age_seconds = 86400
+        self.svc._focal_forms = {}
+        self.svc._focal_locks = {}
+
+    async def test_sections_are_emitted_as_each_stage_finishes(self):
+        sections = []
+        async for section, payload in self.svc.stream_analysis("3001", "Moreirense"):
+            if section == "gil_vicente_form":
+                # Nothing about the opponent has been fetched before the first section.
+                self.assertEqual({team_id for _, team_id in self.svc.sofa.calls}, {9764})
+            sections.append((section, payload))
+
+        names = [name for name, _ in sections]
+        self.assertEqual(
+            names,
+            [
+                "gil_vicente_form",
+                "opponent_form",
+                "recent_game_tactical",
+                "recent_game_tactical",
+                "opponent_advanced_stats",
+                "ai_recommendations",
+                "complete",
+            ],
+        )
+        self.assertEqual([p["index"] for n, p in sections if n == "recent_game_tactical"], [0, 1])
+        # The opponent's event list is fetched once and reused for the per-event statistics.
+        self.assertEqual([c for c in self.svc.sofa.calls if c[0] == "events"], [("events", 9764), ("events", 3001)])
+
+        complete = sections[-1][1]
+        self.assertEqual(complete["match"], "Gil Vicente vs Moreirense")
+        self.assertEqual(complete["data_source"], "sofascore")
+        self.assertEqual(len(complete["recent_games_tactical"]), 2)
+        self.assertEqual(complete["opponent_advanced_stats"]["possession_control"]["possession_percent"], 50.5)
+
+    async def test_analyze_match_returns_the_complete_section(self):
+        analysis = await self.svc.analyze_match("3001", "Moreirense")
+        self.assertEqual(
+            set(analysis),
+            {
+                "match",
+                "focal_team",
+                "gil_vicente_form",
+                "opponent_form",
+                "defensive_vulnerabilities",
+                "gil_attacking_analysis",
+                "tactical_game_plan",
+                "opponent_advanced_stats",
+                "recent_games_tactical",
+                "data_source",
+                "ai_recommendations",
+                "generated_at",
+            },
+        )
+
+    async def test_focal_form_is_computed_once_for_several_opponents(self):
+        self.svc.sofa.next_kickoff = time.time() + 3 * 86400
+        for opponent_id in range(3001, 3006):
+            analysis = await self.svc.analyze_match(str(opponent_id), f"Opponent {opponent_id}")
+            self.assertEqual(analysis["gil_vicente_form"]["team_name"], "Gil Vicente")
+
+        focal_calls = [c for c in self.svc.sofa.calls if c[1] == 9764]
+        self.assertEqual(focal_calls, [("events", 9764), ("upcoming", 9764)])
+        self.assertIn(("focal_form", "team_9764", "current"), self.svc.cache.store)
+
+    async def test_form_is_revalidated_after_the_next_match(self):
+        team = get_focal_team()
+        first = await self.svc.focal_form(team)
+
+        # Before the next kickoff + match time nothing is requested.
+        await self.svc.focal_form(team)
+        self.assertEqual(len(self.svc.sofa.calls), 2)
+
+        # Past it, an unchanged event list keeps the form; a new finished match rebuilds it.
+        self.svc._focal_forms[team.id]["check_after"] = 0
+        self.assertIs((await self.svc.focal_form(team))["gil_vicente_form"], first["gil_vicente_form"])
+        self.svc._focal_forms[team.id]["check_after"] = 0
+        self.svc.sofa.played[team.id] = 4
+        rebuilt = await self.svc.focal_form(team)
+        self.assertEqual(rebuilt["last_event_id"], 97643)
+        self.assertEqual(len(rebuilt["gil_vicente_form"]["recent_matches"]), 4)
+
+    async def test_invalidation_drops_the_shared_form(self):
+        team = get_focal_team()
+        await self.svc.focal_form(team)
+        await self.svc.invalidate_focal_form(team.id)
+        self.assertEqual(self.svc._focal_forms, {})
+        self.assertEqual(self.svc.cache.store, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import text
+
+from services.database import async_database_url, create_engine, create_sessionmaker
+from services.match_history_service import MatchHistoryService
+from services.match_repository import MatchRepository
+from services.sofascore_service import SofaScoreService
+
+GIL_ID = 9764
+
+
+def _event(event_id, home_id, away_id, home_score, away_score, ts, status="finished"):
+    return {
+        "id": event_id,
+        "homeTeam": {"id": home_id, "name": f"Team {home_id}"},
+        "awayTeam": {"id": away_id, "name": f"Team {away_id}"},
+        "homeScore": {"current": home_score},
+        "awayScore": {"current": away_score},
+        "status": {"type": status},
+        "startTimestamp": ts,
+    }
+
+
+def _stats(shots, possession):
+    return {
+        "statistics": [
+            {
+                "period": "ALL",
+                "groups": [
+                    {
+                        "statisticsItems": [
+                            {"name": "Ball possession", "home": f"{possession}%", "away": f"{100 - possession}%"},
+                            {"name": "Total shots", "home": str(shots), "away": "4"},
+                            {"name": "Expected goals", "home": "1.25", "away": "0.40"},
+                        ]
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FakeSofa(SofaScoreService):
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+        self.calls = []
+
+    async def get_last_finished_events(self, team_id, limit=5, max_pages=3):
+        self.calls.append(("events", team_id))
+        return [ev for ev in self.events if team_id in (ev["homeTeam"]["id"], ev["awayTeam"]["id"])]
+
+    async def get_event_statistics(self, event_id):
+        self.calls.append(("stats", event_id))
+        return _stats(10 + event_id % 10, 55)
+
+
+class DatabaseUrlTests(unittest.TestCase):
+    def test_plain_urls_map_to_async_drivers(self):
+        self.assertEqual(async_database_url("postgresql://u:p@db:5432/x"), "postgresql+asyncpg://u:p@db:5432/x")
+        self.assertEqual(async_database_url("sqlite:///local.db"), "sqlite+aiosqlite:///local.db")
+        self.assertEqual(async_database_url("postgresql+asyncpg://db/x"), "postgresql+asyncpg://db/x")
+
+
+class MatchRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_engine("sqlite://")
+        self.repo = MatchRepository(create_sessionmaker(self.engine))
+        await self.repo.init()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_upsert_is_idempotent_and_keeps_statistics(self):
+        events = [_event(100 + i, GIL_ID, 3000 + i, 1, i, 1_700_000_000 + i * 86400) for i in range(3)]
+        self.assertEqual(await self.repo.upsert_events(events), 3)
+        await self.repo.upsert_events(events[1:2], {101: {"home": {"total_shots": 12.0, "xg": 1.1}, "away": {"total_shots": 3}}})
+
+        events[1]["homeScore"]["current"] = 4
+        self.assertEqual(await self.repo.upsert_events(events), 3)
+
+        stored = await self.repo.finished_events(GIL_ID, limit=10)
+        self.assertEqual([ev["id"] for ev in stored], [100, 101, 102])
+        self.assertEqual(stored[1]["homeScore"]["current"], 4)
+        self.assertEqual(stored[1]["awayTeam"], {"id": 3001, "name": "Team 3001"})
+        self.assertEqual(stored[1]["startTimestamp"], 1_700_086_400)
+
+        stats = await self.repo.event_statistics([100, 101])
+        self.assertEqual(list(stats), [101])
+        self.assertEqual(stats[101]["home"]["xg"], 1.1)
+
+    async def test_batched_upsert_with_statistics(self):
+        repo = MatchRepository(self.repo.sessionmaker, batch_size=2)
+        events = [_event(400 + i, 3000 + i, 3100 + i, 1, 0, 1_700_000_000 + i) for i in range(5)]
+        statistics = {402: {"home": {"ball_poss": 61.0, "total_shots": 9.0}, "away": {"ball_poss": 39.0}}}
+        self.assertEqual(await repo.upsert_events(events, statistics), 5)
+        self.assertEqual(await repo.upsert_events(events), 5)
+
+        stored = await repo.event_statistics(range(400, 405))
+        self.assertEqual(list(stored), [402])
+        self.assertEqual(stored[402]["home"]["total_shots"], 9.0)
+        self.assertEqual(len(await repo.finished_events(3004, limit=5)), 1)
+
+    async def test_finished_events_returns_the_latest_window(self):
+        events = [_event(200 + i, 3000 + i, GIL_ID, 0, 0, 1_700_000_000 + i * 86400) for i in range(5)]
+        events.append(_event(299, GIL_ID, 3999, None, None, 1_800_000_000, status="notstarted"))
+        await self.repo.upsert_events(events)
+
+        stored = await self.repo.finished_events(GIL_ID, limit=2)
+        self.assertEqual([ev["id"] for ev in stored], [203, 204])
+        self.assertEqual(await self.repo.finished_events(4242, limit=2), [])
+
+    async def test_rolling_window_and_home_away_split(self):
+        # Gil alternates home (even i) and away (odd i); scores 2-1 from the home side.
+        events = [
+            _event(500 + i, GIL_ID if i % 2 == 0 else 3000 + i, 3000 + i if i % 2 == 0 else GIL_ID, 2, 1, 1_700_000_000 + i * 86400)
+            for i in range(6)
+        ]
+        await self.repo.upsert_events(events)
+
+        before = await self.repo.finished_events(GIL_ID, limit=3, before=1_700_000_000 + 4 * 86400)
+        self.assertEqual([ev["id"] for ev in before], [501, 502, 503])
+        away = await self.repo.finished_events(GIL_ID, limit=2, venue="away")
+        self.assertEqual([ev["id"] for ev in away], [503, 505])
+
+        window = await self.repo.team_window(GIL_ID, limit=3)
+        self.assertEqual([m["event_id"] for m in window], [505, 504, 503])
+        self.assertEqual(
+            window[0],
+            {
+                "event_id": 505,
+                "timestamp": 1_700_000_000 + 5 * 86400,
+                "status": "finished",
+                "venue": "away",
+                "team": {"id": GIL_ID, "name": f"Team {GIL_ID}"},
+                "opponent": {"id": 3005, "name": "Team 3005"},
+                "goals_for": 1,
+                "goals_against": 2,
+                "result": "L",
+            },
+        )
+
+        split = await self.repo.home_away_split(GIL_ID, limit=2)
+        self.assertEqual([m["event_id"] for m in split["home"]], [504, 502])
+        self.assertEqual([m["event_id"] for m in split["away"]], [505, 503])
+        self.assertEqual({m["result"] for m in split["home"]}, {"W"})
+
+        with self.assertRaises(ValueError):
+            await self.repo.team_window(GIL_ID, venue="neutral")
+
+
+class TeamWindowQueryPlanTests(unittest.IsolatedAsyncioTestCase):
+    """The window queries must search the (team, date DESC) indexes, never scan `matches`."""
+
+    async def asyncSetUp(self):
+        self.engine = create_engine("sqlite://")
+        self.repo = MatchRepository(create_sessionmaker(self.engine))
+        await self.repo.init()
+        events = [_event(600 + i, 3000 + i % 7, 3000 + (i + 3) % 7, 1, 1, 1_700_000_000 + i * 3600) for i in range(200)]
+        await self.repo.upsert_events(events)
+        async with self.engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def _plan(self, stmt):
+        sql = str(stmt.compile(self.engine.sync_engine, compile_kwargs={"literal_binds": True}))
+        async with self.engine.connect() as conn:
+            return [row[3] for row in (await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()]
+
+    def assertIndexedWindow(self, plan, indexes):
+        for index in indexes:
+            self.assertTrue(any(f"USING INDEX {index}" in step for step in plan), plan)
+        self.assertFalse(any(step.startswith("SCAN matches") for step in plan), plan)
+
+    async def test_window_searches_both_side_indexes(self):
+        plan = await self._plan(self.repo._window_statement(3001, 10, None, ("home", "away"), "finished"))
+        self.assertIndexedWindow(plan, ("idx_matches_home_team_date", "idx_matches_away_team_date"))
+
+    async def test_window_before_date_uses_a_range_search(self):
+        before = datetime(2023, 11, 20)
+        plan = await self._plan(self.repo._window_statement(3001, 5, before, ("away",), "finished"))
+        self.assertIndexedWindow(plan, ("idx_matches_away_team_date",))
+        self.assertTrue(any("away_team_id=? AND match_date<?" in step for step in plan), plan)
+
+
+class MatchHistoryServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_engine("sqlite://")
+        self.repo = MatchRepository(create_sessionmaker(self.engine))
+        events = [_event(300 + i, GIL_ID, 3001, 2, 1, 1_700_000_000 + i * 86400) for i in range(4)]
+        self.sofa = FakeSofa(events)
+        self.history = MatchHistoryService(sofa=self.sofa, repository=self.repo, enabled=True)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_second_analysis_reads_history_without_upstream_requests(self):
+        events = await self.history.last_finished_events(GIL_ID, limit=3)
+        games = [g async for g in self.history.iter_recent_games_tactical("Gil Vicente", limit=2, team_id=GIL_ID, events=events)]
+        self.assertEqual([ev["id"] for ev in events], [301, 302, 303])
+        self.assertEqual(self.sofa.calls, [("events", GIL_ID), ("stats", 303), ("stats", 302)])
+
+        self.sofa.calls.clear()
+        events_again = await self.history.last_finished_events(GIL_ID, limit=3)
+        games_again = [
+            g async for g in self.history.iter_recent_games_tactical("Gil Vicente", limit=2, team_id=GIL_ID, events=events_again)
+        ]
+        self.assertEqual(self.sofa.calls, [])
+        self.assertEqual(games_again, games)
+
+        expected = self.sofa.normalize_event_tactical_stats(event=events[-1], team_id=GIL_ID, stats_raw=_stats(13, 55))
+        self.assertEqual(games[0], expected)
+
+    async def test_disabled_database_falls_back_to_sofascore(self):
+        history = MatchHistoryService(sofa=self.sofa, enabled=False)
+        events = await history.last_finished_events(GIL_ID, limit=3)
+        self.assertEqual(len(events), 4)
+        self.assertIsNone(await history.repository())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from services.scraper_export_service import ScraperExportService
+
+
+class ScraperExportMemoizationTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch("services.scraper_export_service.settings.SCRAPER_EXPORT_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.svc = ScraperExportService()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, name, payload):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        stat = os.stat(self.tmp.name)
+        os.utime(self.tmp.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        return path
+
+    def test_recent_games_are_parsed_once_per_file_version(self):
+        path = self._write(
+            "gil_vicente_next_opponent_Braga_individual_20250101_120000.json",
+            [{"home_team": "Braga", "away_team": "Porto", "ball_possession_home": "55%", "match_url": "x#id:1"}],
+        )
+
+        with patch.object(self.svc, "_parse_tactical_file", wraps=self.svc._parse_tactical_file) as parse:
+            first = self.svc.load_recent_games_tactical("Braga", limit=5)
+            second = self.svc.load_recent_games_tactical("Braga", limit=5)
+            self.assertEqual(parse.call_count, 1)
+
+            # Results are copies: mutating one does not leak into the cache.
+            second[0]["possession_control"]["possession_percent"] = 0
+            self.assertEqual(self.svc.load_recent_games_tactical("Braga", limit=5), first)
+            self.assertEqual(parse.call_count, 1)
+
+            # A different limit or a rewritten file is a new cache entry.
+            self.svc.load_recent_games_tactical("Braga", limit=1)
+            self.assertEqual(parse.call_count, 2)
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump([{"home_team": "Braga", "away_team": "Porto", "ball_possession_home": "60%"}], fh)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+            latest = self.svc.load_recent_games_tactical("Braga", limit=5)
+            self.assertEqual(parse.call_count, 3)
+
+        self.assertEqual(first[0]["possession_control"]["possession_percent"], 55.0)
+        self.assertEqual(latest[0]["possession_control"]["possession_percent"], 60.0)
+
+    def test_fixtures_are_memoized_and_copied(self):
+        self._write(
+            "gil_vicente_fixtures_20250101_120000.json",
+            [{"match_url": "x#id:7", "home_team": "Gil Vicente", "away_team": "Braga", "status": "upcoming"}],
+        )
+
+        with patch.object(self.svc, "_parse_fixtures_file", wraps=self.svc._parse_fixtures_file) as parse:
+            fixtures = self.svc.load_fixtures(limit=10)
+            fixtures[0]["date"] = "mutated"
+            again = self.svc.load_fixtures(limit=10)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(again[0]["id"], 7)
+        self.assertNotEqual(again[0]["date"], "mutated")
+
+
+def _pick(raw, opponent_name, bases, other_team):
+    """Per-key probing of one metric's columns (what the compiled resolver replaces)."""
+    from services.scraper_export_service import ScraperExportMatch
+
+    side = "home" if ScraperExportMatch(raw=raw, opponent_name=opponent_name).is_opponent_home else "away"
+    if other_team:
+        side = "away" if side == "home" else "home"
+    for base in bases:
+        value = raw.get(f"{base}_{side}")
+        if value not in (None, ""):
+            return value
+    return None
+
+
+class StatKeyResolverTests(unittest.TestCase):
+    def test_compiled_columns_match_per_key_probing(self):
+        from services.scraper_export_service import _EXPORT_METRICS, StatKeyResolver
+
+        raw = {
+            "home_team": "Braga",
+            "away_team": "Porto",
+            "posse_de_bola_home": "",
+            "ball_possession_home": "55%",
+            "ball_possession_away": "45%",
+            "cantos_home": "6",
+            "corner_kicks_away": "3",
+            "xg_away": None,
+            "expected_goals_xg_away": "1.2",
+        }
+        resolver = StatKeyResolver(raw)
+        for opponent, side in (("Braga", "home"), ("Porto", "away")):
+            values = resolver.extract(raw, side)
+            for metric, (bases, other_team) in _EXPORT_METRICS.items():
+                self.assertEqual(values[metric], _pick(raw, opponent, bases, other_team), metric)
+
+    def test_resolver_is_compiled_once_per_schema(self):
+        from services import scraper_export_service as module
+
+        rows = [
+            {"home_team": "Braga", "away_team": "Porto", "cantos_home": str(i), "cantos_away": "2"} for i in range(4)
+        ]
+        rows.append({"home_team": "Braga", "away_team": "Porto", "corner_kicks_home": "9"})
+        with patch.object(module, "StatKeyResolver", wraps=module.StatKeyResolver) as resolver:
+            games = list(module.ScraperExportService._tactical_stats(rows, "Braga"))
+
+        self.assertEqual(resolver.call_count, 2)
+        self.assertEqual(
+            [g["set_pieces"]["attacking"]["corners_taken"] for g in games], [0.0, 1.0, 2.0, 3.0, 9.0]
+        )
\ No newline at end of file
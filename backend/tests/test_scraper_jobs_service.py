@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from services.scraper_jobs_service import ScraperJobService, ScraperQueueUnavailableError
+
+# The daemon owns the queue schema; the tests create the queue with its code when the
+# repository checkout (not only the backend folder) is available.
+SCRAPPER_DIR = Path(__file__).resolve().parents[2] / "scrapper"
+
+
+class FakeCache:
+    def __init__(self):
+        self.deleted_patterns = []
+        self.deleted_keys = []
+
+    async def delete_matching(self, cache_type, identifier_pattern, namespace=None):
+        self.deleted_patterns.append((cache_type, identifier_pattern, namespace))
+        return 1
+
+    async def delete(self, cache_type, identifier, namespace=None):
+        self.deleted_keys.append((cache_type, identifier))
+        return True
+
+
+class ScraperJobServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = FakeCache()
+        self.svc = ScraperJobService(
+            queue_path=os.path.join(self.tmp.name, ".scraper_jobs.sqlite3"),
+            cache=self.cache,
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _create_daemon_queue(self):
+        if not (SCRAPPER_DIR / "job_queue.py").exists():
+            self.skipTest("scrapper/job_queue.py is not available")
+        sys.path.insert(0, str(SCRAPPER_DIR))
+        self.addCleanup(sys.path.remove, str(SCRAPPER_DIR))
+        from job_queue import ScrapeJobQueue
+
+        return ScrapeJobQueue(Path(self.tmp.name))
+
+    def test_queue_is_not_created_by_the_backend(self):
+        with self.assertRaises(ScraperQueueUnavailableError):
+            self.svc.enqueue("league")
+        self.assertFalse(os.path.exists(self.svc.queue_path))
+
+    def test_daemon_sees_backend_jobs(self):
+        queue = self._create_daemon_queue()
+        job = self.svc.enqueue("next_opponent")
+
+        claimed = queue.claim_next()
+        self.assertEqual(claimed["id"], job["id"])
+        self.assertEqual(claimed["source"], "api")
+        queue.complete(claimed["id"], {"opponents": ["Moreirense"]})
+        self.assertEqual(self.svc.get(job["id"])["status"], "done")
+
+    def test_enqueue_reuses_identical_pending_job(self):
+        self._create_daemon_queue()
+        first = self.svc.enqueue("league", {"team_ids": [3010]})
+        second = self.svc.enqueue("league", {"team_ids": [3010]})
+        other = self.svc.enqueue("league", {"team_ids": [3001]})
+
+        self.assertEqual(first["id"], second["id"])
+        self.assertNotEqual(first["id"], other["id"])
+        self.assertEqual(first["status"], "pending")
+        self.assertEqual(first["source"], "api")
+        self.assertEqual(self.svc.get(first["id"])["payload"], {"team_ids": [3010]})
+        self.assertEqual([job["id"] for job in self.svc.recent()], [other["id"], first["id"]])
+
+    def test_enqueue_rejects_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            self.svc.enqueue("everything")
+
+    async def test_completion_event_invalidates_opponent_and_fixture_keys(self):
+        deleted = await self.svc.invalidate_for_event(
+            {"job_id": 1, "kind": "next_opponent", "status": "done", "opponents": ["Moreirense"], "fixtures": True}
+        )
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(self.cache.deleted_patterns, [("analysis_snapshot", "*_Moreirense", "*")])
+        self.assertEqual(self.cache.deleted_keys, [("fixtures", "all")])
+
+    async def test_opponent_name_is_matched_literally(self):
+        await self.svc.invalidate_for_event({"job_id": 3, "kind": "league", "status": "done", "opponents": ["A*[B]?"]})
+
+        self.assertEqual(self.cache.deleted_patterns, [("analysis_snapshot", "*_A\\*\\[B\\]\\?", "*")])
+
+    async def test_failed_job_keeps_cache(self):
+        deleted = await self.svc.invalidate_for_event(
+            {"job_id": 2, "kind": "league", "status": "failed", "opponents": ["Moreirense"]}
+        )
+
+        self.assertEqual(deleted, 0)
+        self.assertEqual(self.cache.deleted_patterns, [])
@@ -1,6 +1,8 @@
 import unittest
 
-from services.sofascore_service import SofaScoreService
+import numpy as np
+
+from services.sofascore_service import TACTICAL_FEATURE_COLUMNS, SofaScoreService, TacticalFeatureMatrix
 
 
 class TestSofaScoreServiceParsing(unittest.TestCase):
@@ -99,6 +101,93 @@ class TestSofaScoreServiceParsing(unittest.TestCase):
         self.assertEqual(out["expected_metrics"]["xG"], 1.2)
         self.assertIsNotNone(out["possession_control"]["passes_per_minute"])
 
+    def test_normalize_event_tactical_stats_reads_team_side_and_later_items_win(self):
+        event = {
+            "id": 112,
+            "homeTeam": {"id": 10, "name": "Home"},
+            "awayTeam": {"id": 20, "name": "Away"},
+            "homeScore": {"current": 0},
+            "awayScore": {"current": 0},
+        }
+        stats_raw = {
+            "statistics": [
+                {"groups": [{"statisticsItems": [{"name": "Corner kicks", "home": 1, "away": 1}]}]},
+                {
+                    "groups": [
+                        {
+                            "statisticsItems": [
+                                {"name": "Corner kicks", "home": 7, "away": 2},
+                                {"name": "Accurate passes", "homeValue": "300 (85%)", "awayValue": "250 (80%)"},
+                                {"name": "Long balls", "home": "21/48 (44%)", "away": "18/51 (35%)"},
+                            ]
+                        }
+                    ]
+                },
+            ]
+        }
+
+        out = self.svc.normalize_event_tactical_stats(event=event, team_id=20, stats_raw=stats_raw)
+        self.assertEqual(out["match_info"]["location"], "Away")
+        self.assertEqual(out["set_pieces"]["attacking"]["corners_taken"], 2.0)
+        self.assertEqual(out["set_pieces"]["defensive"]["corners_conceded"], 7.0)
+        self.assertEqual(out["possession_control"]["pass_accuracy"], 80.0)
+        self.assertEqual(out["possession_control"]["long_balls_attempted"], 18.0)
+        self.assertIsNone(out["shooting_finishing"]["total_shots"])
+
+
+class TestTacticalFeatureMatrix(unittest.TestCase):
+    def setUp(self):
+        self.svc = SofaScoreService()
+
+    def test_batch_matrix_matches_per_event_normalization(self):
+        events = [
+            {"id": 1, "homeTeam": {"id": 10}, "awayTeam": {"id": 20}, "homeScore": {"current": 2}, "awayScore": {"current": 1}},
+            {"id": 2, "homeTeam": {"id": 30}, "awayTeam": {"id": 10}, "homeScore": {"current": 0}, "awayScore": {"current": 3}},
+            {"id": 3, "homeTeam": {"id": 10}, "awayTeam": {"id": 40}},
+        ]
+        items = [
+            {"name": "Ball possession", "home": "58%", "away": "42%"},
+            {"name": "Total shots", "home": 12, "away": 7},
+            {"name": "Expected goals", "home": {"value": "1.45"}, "away": {"value": "0.61"}},
+            {"name": "Passes", "home": 480, "away": 350},
+            {"name": "Accurate passes", "home": "400 (83%)", "away": "270 (77%)"},
+            {"name": "Corner kicks", "home": 6, "away": 2},
+        ]
+        payloads = [{"statistics": [{"groups": [{"statisticsItems": items}]}]}, {"statistics": [{"groups": [{"statisticsItems": items[:2]}]}]}, {}]
+
+        batch = self.svc.normalize_events_matrix(events=events, team_id=10, stats_payloads=payloads)
+        rows = [
+            self.svc.normalize_event_tactical_stats(event=ev, team_id=10, stats_raw=payload)
+            for ev, payload in zip(events, payloads)
+        ]
+        expected = TacticalFeatureMatrix.from_tactical_stats(rows)
+
+        self.assertEqual(batch.columns, TACTICAL_FEATURE_COLUMNS)
+        self.assertEqual(batch.values.shape, (3, len(TACTICAL_FEATURE_COLUMNS)))
+        np.testing.assert_allclose(batch.values, expected.values, equal_nan=True)
+        np.testing.assert_array_equal(batch.missing, expected.missing)
+        self.assertTrue(batch.missing[2].all())
+        self.assertEqual(batch.column("shooting_finishing.shot_conversion_rate")[1], 42.9)
+
+    def test_batch_matrix_rejects_unpaired_payloads(self):
+        events = [{"id": 1, "homeTeam": {"id": 10}, "awayTeam": {"id": 20}}, {"id": 2, "homeTeam": {"id": 10}, "awayTeam": {"id": 30}}]
+
+        with self.assertRaises(ValueError):
+            self.svc.normalize_events_matrix(events=events, team_id=10, stats_payloads=[{}])
+
+    def test_means_skip_missing_values(self):
+        matrix = TacticalFeatureMatrix.from_tactical_stats(
+            [
+                {"expected_metrics": {"xG": 1.0}, "possession_control": {"possession_percent": "n/a"}},
+                {"expected_metrics": {"xG": 2.0}},
+                "not a match",
+            ]
+        )
+        means = matrix.means()
+        self.assertEqual(means["expected_metrics.xG"], 1.5)
+        self.assertIsNone(means["possession_control.possession_percent"])
+        self.assertEqual(len(matrix), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from services.tactical_aggregation import DISTRIBUTION, MEAN, MODE, TacticalAggregator, metric_paths, summarize
+
+
+def _percent(value):
+    if isinstance(value, str) and value.endswith("%"):
+        return float(value[:-1])
+    return value
+
+
+class TacticalAggregationTests(unittest.TestCase):
+    SPEC = {
+        "shooting": {
+            "xg_avg": ("expected_metrics.xG", MEAN),
+            "first_contact_avg": ("set_pieces.attacking.first_contact_success", MEAN),
+        },
+        "shape": ("team_shape.formation_detected", MODE),
+        "locations": ("match_info.location", DISTRIBUTION),
+        "heatmaps": None,
+    }
+
+    MATCHES = [
+        {
+            "estimated": False,
+            "expected_metrics": {"xG": 1.0},
+            "set_pieces": {"attacking": {"first_contact_success": "40%"}},
+            "team_shape": {"formation_detected": "4-4-2"},
+            "match_info": {"location": "Away"},
+        },
+        {
+            "estimated": False,
+            "expected_metrics": {"xG": None},
+            "team_shape": {"formation_detected": "4-3-3"},
+            "match_info": {"location": "Home"},
+        },
+        {
+            "estimated": True,
+            "expected_metrics": {"xG": 2.0},
+            "set_pieces": {"attacking": {"first_contact_success": 60}},
+            "team_shape": {"formation_detected": ""},
+            "match_info": {"location": "Away"},
+        },
+    ]
+
+    def test_metric_paths_split_numeric_and_categorical(self):
+        numeric, categorical = metric_paths(self.SPEC)
+        self.assertEqual(numeric, ["expected_metrics.xG", "set_pieces.attacking.first_contact_success"])
+        self.assertEqual(categorical, ["team_shape.formation_detected", "match_info.location"])
+
+    def test_summarize_fills_spec_from_one_extraction(self):
+        aggregator = TacticalAggregator(self.SPEC, parsers={"set_pieces.attacking.first_contact_success": _percent})
+        columns = aggregator.extract(self.MATCHES)
+
+        self.assertEqual(columns.count, 3)
+        self.assertTrue(columns.estimated)
+        self.assertEqual(
+            summarize(columns, self.SPEC),
+            {
+                "shooting": {"xg_avg": 1.5, "first_contact_avg": 50.0},
+                # Tie between the two formations goes to the alphabetically first one.
+                "shape": "4-3-3",
+                "locations": {"Away": 2, "Home": 1},
+                "heatmaps": None,
+            },
+        )
+        self.assertEqual(list(summarize(columns, self.SPEC)["locations"]), ["Away", "Home"])
+
+    def test_empty_columns(self):
+        columns = TacticalAggregator(self.SPEC).extract([])
+        summary = summarize(columns, self.SPEC)
+        self.assertIsNone(summary["shooting"]["xg_avg"])
+        self.assertIsNone(summary["shape"])
+        self.assertEqual(summary["locations"], {})
+        self.assertFalse(columns.estimated)
+
+
+if __name__ == "__main__":
+    unittest.main()
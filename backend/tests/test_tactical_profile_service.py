@@ -0,0 +1,221 @@
+import unittest
+
+from sqlalchemy import inspect, select, text
+
+from models import TacticalProfile
+from services.database import create_engine, create_sessionmaker, create_tables
+from services.match_history_service import MatchHistoryService
+from services.match_repository import MatchRepository
+from services.sofascore_service import SofaScoreService
+from services.tactical_profile_service import ProfileState, TacticalProfileService, profile_from_recent_games
+
+TEAM_ID = 3001
+
+
+def _game(i, possession=None, shots=None, result="W", location="Home", formation="4-3-3"):
+    return {
+        "estimated": False,
+        "match_info": {"date": 1_700_000_000 + i * 86400, "result": result, "location": location},
+        "possession_control": {"possession_percent": 50.0 + i if possession is None else possession, "pass_accuracy": 80.0 + i},
+        "shooting_finishing": {"total_shots": 10.0 + i if shots is None else shots, "shots_on_target": 4.0},
+        "expected_metrics": {"xG": 1.0 + i / 10},
+        "team_shape": {"formation_detected": formation},
+        "transitions": {"counter_attacks": i},
+    }
+
+
+class ProfileStateTests(unittest.TestCase):
+    def test_incremental_fold_matches_recomputed_window(self):
+        state = ProfileState(None, None, window=5)
+        games = [_game(i) for i in range(8)]
+        for i, game in enumerate(games):
+            state.fold(1000 + i, game)
+
+        expected = profile_from_recent_games(list(reversed(games))[:5])
+        self.assertEqual(state.profile(), expected)
+        self.assertEqual(expected["matches_analyzed"], 5)
+        self.assertAlmostEqual(state.running_mean("possession_control.possession_percent"), 53.5)
+
+    def test_refolding_an_event_is_idempotent(self):
+        state = ProfileState(None, None, window=3)
+        for i in range(4):
+            state.fold(1000 + i, _game(i))
+        state.fold(1003, _game(3))
+        state.fold(1000, _game(0))
+
+        self.assertEqual(len(state.event_ids), 4)
+        self.assertEqual(state.points_per_game("home"), 3.0)
+        self.assertAlmostEqual(state.running_mean("shooting_finishing.total_shots"), 11.5)
+
+        # Corrected statistics of a game in the window replace the old ones.
+        state.fold(1003, _game(3, shots=20.0))
+        self.assertAlmostEqual(state.running_mean("shooting_finishing.total_shots"), 13.25)
+        self.assertAlmostEqual(state.profile()["shooting_finishing"]["total_shots"], 14.33, places=2)
+
+    def test_home_away_and_formation_totals(self):
+        state = ProfileState(None, None, window=5)
+        state.fold(1, _game(1, result="W", location="Home"))
+        state.fold(2, _game(2, result="D", location="Away", formation="4-4-2"))
+        state.fold(3, _game(3, result="L", location="Away"))
+
+        self.assertEqual(state.points_per_game("home"), 3.0)
+        self.assertEqual(state.points_per_game("away"), 0.5)
+        self.assertEqual(state.formation_frequency(), {"4-3-3": 0.667, "4-4-2": 0.333})
+        self.assertEqual(state.profile()["transitions"], {"counter_attacks": 3})
+
+
+def _stats_raw(possession, shots):
+    items = [
+        {"name": "Ball possession", "home": f"{possession}%", "away": f"{100 - possession}%"},
+        {"name": "Total shots", "home": str(shots), "away": "5"},
+        {"name": "Expected goals", "home": "1.20", "away": "0.40"},
+    ]
+    return {"statistics": [{"period": "ALL", "groups": [{"statisticsItems": items}]}]}
+
+
+class FakeSofa(SofaScoreService):
+    async def get_event_statistics(self, event_id):
+        return None
+
+
+class TacticalProfileStoreTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_engine("sqlite://")
+        self.repo = MatchRepository(create_sessionmaker(self.engine))
+        self.history = MatchHistoryService(FakeSofa(), self.repo, enabled=True)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_ingested_events_are_folded_into_stored_profiles(self):
+        sofa = self.history.sofa
+        events, statistics = [], {}
+        for i in range(7):
+            event_id = 500 + i
+            events.append({
+                "id": event_id,
+                "homeTeam": {"id": TEAM_ID, "name": "Opponent"},
+                "awayTeam": {"id": 4000 + i, "name": f"Team {i}"},
+                "homeScore": {"current": 2},
+                "awayScore": {"current": i % 3},
+                "status": {"type": "finished"},
+                "startTimestamp": 1_700_000_000 + i * 86400,
+            })
+            raw = _stats_raw(50 + i, 10 + i)
+            statistics[event_id] = {
+                side: sofa.extract_event_stats(event=events[-1], team_id=events[-1][f"{side}Team"]["id"], stats_raw=raw)
+                for side in ("home", "away")
+            }
+        self.assertIsNone(await self.history.tactical_profile(TEAM_ID))
+
+        await self.history.ingest_events(events[:4], {k: statistics[k] for k in range(500, 504)})
+        await self.history.ingest_events(events[3:], statistics)
+
+        games = [
+            sofa.build_tactical_stats(event=ev, team_id=TEAM_ID, stats=statistics[ev["id"]]["home"])
+            for ev in reversed(events)
+        ]
+        profile = await self.history.tactical_profile(TEAM_ID)
+        self.assertEqual(profile, profile_from_recent_games(games[: self.history.profiles.window]))
+        self.assertEqual(profile["matches_analyzed"], 5)
+
+        async with self.repo.sessionmaker() as session:
+            rows = (await session.execute(select(TacticalProfile))).scalars().all()
+        self.assertEqual(len(rows), 8)
+        row = next(r for r in rows if r.matches_analyzed == 7)
+        self.assertAlmostEqual(row.possession_style, 53.0)
+        self.assertAlmostEqual(row.home_performance_avg, 17 / 7)
+        self.assertEqual(row.confidence_score, 1.0)
+
+    def _events_and_statistics(self, count):
+        sofa = self.history.sofa
+        events, statistics = [], {}
+        for i in range(count):
+            event = {
+                "id": 700 + i,
+                "homeTeam": {"id": 4000 + i, "name": f"Team {i}"},
+                "awayTeam": {"id": TEAM_ID, "name": "Opponent"},
+                "homeScore": {"current": 1},
+                "awayScore": {"current": 1},
+                "status": {"type": "finished"},
+                "startTimestamp": 1_700_000_000 + i * 86400,
+            }
+            raw = _stats_raw(50 - i, 10 + i)
+            events.append(event)
+            statistics[event["id"]] = {
+                side: sofa.extract_event_stats(event=event, team_id=event[f"{side}Team"]["id"], stats_raw=raw)
+                for side in ("home", "away")
+            }
+        return events, statistics
+
+    async def test_profile_is_backfilled_from_statistics_stored_before_it(self):
+        events, statistics = self._events_and_statistics(6)
+        await self.repo.init()
+        # Stored by an earlier version: statistics with the matches, no profile folded.
+        await self.repo.upsert_events(events[:5], {k: statistics[k] for k in range(700, 705)})
+        # Only the newest game goes through the profile fold.
+        await self.history.ingest_events(events[5:], statistics)
+
+        sofa = self.history.sofa
+        games = [
+            sofa.build_tactical_stats(event=ev, team_id=TEAM_ID, stats=statistics[ev["id"]]["away"])
+            for ev in reversed(events)
+        ]
+        self.assertEqual((await self.history.tactical_profile(TEAM_ID))["matches_analyzed"], 1)
+
+        profile = await self.history.tactical_profile(TEAM_ID, games_in_hand=5)
+        self.assertEqual(profile, profile_from_recent_games(games[:5]))
+
+    async def test_profile_covering_too_few_games_is_not_served(self):
+        events, statistics = self._events_and_statistics(2)
+        await self.history.ingest_events(events, statistics)
+        self.assertIsNone(await self.history.tactical_profile(TEAM_ID, games_in_hand=3))
+        self.assertEqual((await self.history.tactical_profile(TEAM_ID, games_in_hand=2))["matches_analyzed"], 2)
+
+    async def test_profile_window_setting_is_respected(self):
+        self.assertEqual(TacticalProfileService(self.repo, window=3).window, 3)
+
+
+class SchemaUpgradeTests(unittest.IsolatedAsyncioTestCase):
+    async def test_columns_and_unique_index_are_added_to_existing_tables(self):
+        engine = create_engine("sqlite://")
+        self.addAsyncCleanup(engine.dispose)
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE tactical_profiles (id INTEGER PRIMARY KEY, team_id INTEGER NOT NULL, matches_analyzed INTEGER)"
+            ))
+
+        await create_tables(engine)
+
+        def _describe(conn):
+            inspector = inspect(conn)
+            columns = {c["name"] for c in inspector.get_columns("tactical_profiles")}
+            unique = [i["column_names"] for i in inspector.get_indexes("tactical_profiles") if i["unique"]]
+            return columns, unique
+
+        async with engine.connect() as conn:
+            columns, unique = await conn.run_sync(_describe)
+        self.assertTrue({"profile", "window_stats", "running_totals"} <= columns)
+        self.assertIn(["team_id"], unique)
+        # Running it again changes nothing.
+        await create_tables(engine)
+
+    async def test_team_date_indexes_are_added_to_an_existing_matches_table(self):
+        engine = create_engine("sqlite://")
+        self.addAsyncCleanup(engine.dispose)
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE matches (id INTEGER PRIMARY KEY, api_fixture_id INTEGER UNIQUE NOT NULL, "
+                "home_team_id INTEGER, away_team_id INTEGER, match_date DATETIME NOT NULL, status VARCHAR(20))"
+            ))
+            await conn.execute(text("CREATE INDEX idx_matches_date ON matches(match_date)"))
+
+        await create_tables(engine)
+
+        async with engine.connect() as conn:
+            indexes = await conn.run_sync(lambda c: {i["name"] for i in inspect(c).get_indexes("matches")})
+        self.assertTrue({"idx_matches_home_team_date", "idx_matches_away_team_date"} <= indexes)
+        # Covered by the existing idx_matches_date and the primary key.
+        self.assertNotIn("ix_matches_match_date", indexes)
+        self.assertNotIn("ix_matches_id", indexes)
+        await create_tables(engine)
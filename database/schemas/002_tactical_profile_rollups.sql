@@ -0,0 +1,10 @@
+-- Incrementally maintained tactical profiles: one row per team with its rolling aggregates
+-- Only runs on a fresh volume (docker-entrypoint-initdb.d); on existing databases the backend
+-- adds these columns and the unique index at startup (services/database.py create_tables).
+
+ALTER TABLE tactical_profiles ADD COLUMN IF NOT EXISTS profile JSONB;
+ALTER TABLE tactical_profiles ADD COLUMN IF NOT EXISTS window_stats JSONB;
+ALTER TABLE tactical_profiles ADD COLUMN IF NOT EXISTS running_totals JSONB;
+
+DROP INDEX IF EXISTS idx_tactical_profiles_team;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tactical_profiles_team ON tactical_profiles(team_id);
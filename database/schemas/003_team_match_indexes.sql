@@ -0,0 +1,16 @@
+-- Team match history: (team, date DESC) indexes per side
+-- The per-team match view is built inline by the queries (backend/models/team_match.py).
+-- On existing databases the backend also creates these indexes at startup.
+
+-- "Last N matches of a team (before a date)" on either side, covering the window columns
+CREATE INDEX IF NOT EXISTS idx_matches_home_team_date
+    ON matches(home_team_id, match_date DESC)
+    INCLUDE (status, home_score, away_score, api_fixture_id, away_team_id);
+CREATE INDEX IF NOT EXISTS idx_matches_away_team_date
+    ON matches(away_team_id, match_date DESC)
+    INCLUDE (status, home_score, away_score, api_fixture_id, home_team_id);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX IF EXISTS idx_matches_home_team;
+DROP INDEX IF EXISTS idx_matches_away_team;
+
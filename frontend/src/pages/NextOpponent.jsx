@@ -18,6 +18,23 @@ const toErrorText = async (res) => {
   return await res.text().catch(() => `Request failed: ${res.status}`)
 }
 
+// Analysis routes answer 202 while the snapshot is being prepared; retry until it is ready.
+const fetchAnalysis = async (url) => {
+  const res = await fetch(url)
+  if (res.status === 202) {
+    const err = new Error('A análise está a ser preparada…')
+    err.pending = true
+    throw err
+  }
+  if (!res.ok) throw new Error(await toErrorText(res))
+  const json = await res.json()
+  if (json?.data_source === 'error' && json?.error) throw new Error(String(json.error))
+  return json
+}
+
+const analysisRetry = (failureCount, err) => (err?.pending ? failureCount < 60 : failureCount < 3)
+const analysisRetryDelay = (attempt, err) => (err?.pending ? 5000 : Math.min(1000 * 2 ** attempt, 30000))
+
 const badgeClass = (source) => {
   const s = String(source || '').toLowerCase()
   if (s.includes('scraper')) return 'bg-amber-100 text-amber-800'
@@ -65,16 +82,13 @@ const NextOpponent = () => {
     isFetching: fetchingStats,
   } = useQuery({
     queryKey: ['opponent-stats', opponentId, opponentName],
-    queryFn: async () => {
-      const res = await fetch(
+    queryFn: () =>
+      fetchAnalysis(
         `${API_BASE_URL}/api/v1/opponent-stats/${opponentId}?opponent_name=${encodeURIComponent(opponentName)}`
-      )
-      if (!res.ok) throw new Error(await toErrorText(res))
-      const json = await res.json()
-      if (json?.data_source === 'error' && json?.error) throw new Error(String(json.error))
-      return json
-    },
+      ),
     enabled: !!opponentId && !!opponentName,
+    retry: analysisRetry,
+    retryDelay: analysisRetryDelay,
   })
 
   const {
@@ -85,16 +99,13 @@ const NextOpponent = () => {
     isFetching: fetchingPlan,
   } = useQuery({
     queryKey: ['tactical-plan', opponentId, opponentName],
-    queryFn: async () => {
-      const res = await fetch(
+    queryFn: () =>
+      fetchAnalysis(
         `${API_BASE_URL}/api/v1/tactical-plan/${opponentId}?opponent_name=${encodeURIComponent(opponentName)}`
-      )
-      if (!res.ok) throw new Error(await toErrorText(res))
-      const json = await res.json()
-      if (json?.data_source === 'error' && json?.error) throw new Error(String(json.error))
-      return json
-    },
+      ),
     enabled: !!opponentId && !!opponentName,
+    retry: analysisRetry,
+    retryDelay: analysisRetryDelay,
   })
 
   const handleRefresh = async () => {
@@ -0,0 +1,116 @@
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ScrapeCheckpoint:
+    """Per-match checkpoints for a scrape run, stored under `<export_dir>/.checkpoints`.
+
+    Layout:
+        run.json              opponent, next-match info, fixtures and the match candidates
+        match_<event_id>.json one file per scraped match (event ID, raw stats, summary)
+
+    Files are written atomically so a crash mid-write never leaves a corrupt checkpoint.
+    The directory is removed once every planned match is exported; if some matches
+    failed, it is kept so `--resume` only retries those.
+    """
+
+    def __init__(self, export_dir: Path):
+        self.dir = Path(export_dir) / ".checkpoints"
+
+    @property
+    def run_path(self) -> Path:
+        return self.dir / "run.json"
+
+    def _match_path(self, event_id) -> Path:
+        safe_id = re.sub(r"[^0-9A-Za-z_-]+", "_", str(event_id))
+        return self.dir / f"match_{safe_id}.json"
+
+    def _write_json(self, path: Path, payload: Dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except Exception:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def start_run(
+        self,
+        opponent_name: str,
+        match_info: Dict,
+        candidates: List[Dict],
+        fixtures: Optional[List[Dict]] = None,
+    ) -> None:
+        """Record the plan for a fresh run, discarding any previous checkpoints."""
+        self.clear()
+        self._write_json(
+            self.run_path,
+            {
+                "opponent_name": opponent_name,
+                "match_info": match_info,
+                "candidates": candidates,
+                "fixtures": fixtures or [],
+                "started_at": datetime.now().isoformat(),
+            },
+        )
+
+    def load_run(self) -> Optional[Dict]:
+        run = self._read_json(self.run_path)
+        if not run or not run.get("opponent_name") or not isinstance(run.get("candidates"), list):
+            return None
+        return run
+
+    def save_match(self, event_id, match_url: str, match_data: Dict) -> None:
+        if event_id is None:
+            return
+        self._write_json(
+            self._match_path(event_id),
+            {
+                "event_id": event_id,
+                "match_url": match_url,
+                "match_data": match_data,
+                "scraped_at": datetime.now().isoformat(),
+            },
+        )
+
+    def load_match(self, event_id) -> Optional[Dict]:
+        if event_id is None:
+            return None
+        checkpoint = self._read_json(self._match_path(event_id))
+        if not checkpoint or not isinstance(checkpoint.get("match_data"), dict):
+            return None
+        return checkpoint["match_data"]
+
+    def completed_event_ids(self) -> List[str]:
+        if not self.dir.is_dir():
+            return []
+        return sorted(p.stem[len("match_"):] for p in self.dir.glob("match_*.json"))
+
+    def pending_event_ids(self) -> List[str]:
+        """Event IDs planned by the current run that have no checkpoint yet."""
+        run = self.load_run()
+        if not run:
+            return []
+        done = set(self.completed_event_ids())
+        pending = []
+        for candidate in run.get("candidates") or []:
+            event_id = candidate.get("event_id") if isinstance(candidate, dict) else None
+            if event_id is None:
+                continue
+            if self._match_path(event_id).stem[len("match_"):] not in done:
+                pending.append(str(event_id))
+        return pending
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -0,0 +1,192 @@
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from event_store import event_id_from_url, has_statistics
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # The JSON/CSV exports keep working without the columnar copy.
+    pa = None
+    pq = None
+
+
+STORE_DIRNAME = "columnar"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Typed key columns; flag columns stay boolean and every other column is stored as a
+# string (stat cells mix "58%", "12/20 (60%)" and plain numbers, and readers parse them).
+_KEY_COLUMNS = {"event_id": "int64", "match_date": "string"}
+
+
+def team_slug(name: str) -> str:
+    """Partition key for a team name ("Vitória SC" -> "vitoria_sc")."""
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_") or "unknown"
+
+
+def _match_date(row: Dict) -> Optional[str]:
+    for key in ("utc_time", "datetime"):
+        value = row.get(key)
+        if isinstance(value, str) and re.match(r"\d{4}-\d{2}-\d{2}", value):
+            return value[:10]
+    raw = row.get("date")
+    if raw in (None, "", "TBD"):
+        return None
+    try:
+        parsed = pd.to_datetime(str(raw), dayfirst=True, errors="coerce")
+    except Exception:
+        return None
+    return None if pd.isna(parsed) else parsed.date().isoformat()
+
+
+class ColumnarExportStore:
+    """Append-only Parquet copy of the scraper exports, partitioned by team.
+
+    Layout under `<export_dir>/columnar/`:
+        manifest.json                                 partitions -> parts (file, rows, event IDs,
+                                                      date range, columns)
+        matches/team=<slug>/part-<timestamp>.parquet  individual match rows of one team
+        fixtures/part-<timestamp>.parquet             Gil Vicente fixtures snapshot
+
+    Each save appends one part per partition. Match rows already stored with statistics
+    are skipped (finished matches never change); a row stored without statistics is
+    written again once a re-scrape has them. Fixtures are always appended. Readers keep
+    the newest part per event ID. Readers use the manifest to pick the parts that can
+    match a team/date range and load only the requested columns.
+    """
+
+    def __init__(self, export_dir: Path):
+        self.root = Path(export_dir) / STORE_DIRNAME
+        self.manifest_path = self.root / MANIFEST_FILENAME
+
+    @property
+    def available(self) -> bool:
+        return pq is not None
+
+    def load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as fh:
+                manifest = json.load(fh)
+        except Exception:
+            manifest = None
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("partitions"), dict):
+            manifest = {"version": MANIFEST_VERSION, "partitions": {}}
+        return manifest
+
+    def _save_manifest(self, manifest: Dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _to_table(rows: List[Dict]) -> "pa.Table":
+        columns: List[str] = []
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+
+        arrays = []
+        for col in columns:
+            values = [row.get(col) for row in rows]
+            present = [v for v in values if v is not None and not (isinstance(v, float) and pd.isna(v))]
+            if col in _KEY_COLUMNS:
+                arrays.append(pa.array(values, type=_KEY_COLUMNS[col]))
+            elif present and all(isinstance(v, (bool, np.bool_)) for v in present):
+                arrays.append(pa.array(
+                    [None if v is None or (isinstance(v, float) and pd.isna(v)) else bool(v) for v in values],
+                    type=pa.bool_(),
+                ))
+            else:
+                arrays.append(pa.array(
+                    [None if v is None or (isinstance(v, float) and pd.isna(v)) else str(v) for v in values],
+                    type=pa.string(),
+                ))
+        return pa.Table.from_arrays(arrays, names=columns)
+
+    def _append(self, manifest: Dict, partition: str, rows: List[Dict], meta: Dict) -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        relative = f"{partition}/part-{timestamp}.parquet"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        table = self._to_table(rows)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, str(tmp_path))
+        os.replace(tmp_path, path)
+
+        dates = sorted(row["match_date"] for row in rows if row.get("match_date"))
+        entry = manifest["partitions"].setdefault(partition, {"parts": []})
+        entry.update(meta)
+        entry["parts"].append({
+            "file": relative,
+            "rows": len(rows),
+            "event_ids": [row["event_id"] for row in rows if row.get("event_id") is not None],
+            "statistics_event_ids": [
+                row["event_id"] for row in rows if row.get("event_id") is not None and has_statistics(row)
+            ],
+            "date_min": dates[0] if dates else None,
+            "date_max": dates[-1] if dates else None,
+            "columns": table.column_names,
+            "written_at": datetime.now().isoformat(),
+        })
+        return path
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> List[Dict]:
+        rows = []
+        for record in df.to_dict(orient="records"):
+            row = {k: v for k, v in record.items() if not (isinstance(v, float) and pd.isna(v))}
+            event_id = row.get("event_id") or event_id_from_url(row.get("match_url"))
+            row["event_id"] = int(event_id) if event_id is not None and str(event_id).isdigit() else None
+            row["match_date"] = _match_date(row)
+            rows.append(row)
+        return rows
+
+    def append_matches(self, team_name: str, individual_df: Optional[pd.DataFrame]) -> int:
+        """Append the team's match rows that are new or now have statistics; returns rows written."""
+        if not self.available or individual_df is None or individual_df.empty:
+            return 0
+
+        manifest = self.load_manifest()
+        partition = f"matches/team={team_slug(team_name)}"
+        stored, complete = set(), set()
+        for part in (manifest["partitions"].get(partition) or {}).get("parts", []):
+            stored.update(part.get("event_ids") or [])
+            # Parts written before statistics were tracked may hold rows without them.
+            complete.update(part.get("statistics_event_ids") or [])
+        rows = [
+            row for row in self._records(individual_df)
+            if row["event_id"] is None
+            or row["event_id"] not in stored
+            or (row["event_id"] not in complete and has_statistics(row))
+        ]
+        if not rows:
+            return 0
+
+        self._append(manifest, partition, rows, {"kind": "matches", "team": team_name})
+        self._save_manifest(manifest)
+        return len(rows)
+
+    def append_fixtures(self, fixtures_df: Optional[pd.DataFrame]) -> int:
+        if not self.available or fixtures_df is None or fixtures_df.empty:
+            return 0
+
+        manifest = self.load_manifest()
+        rows = self._records(fixtures_df)
+        self._append(manifest, "fixtures", rows, {"kind": "fixtures"})
+        self._save_manifest(manifest)
+        return len(rows)
@@ -0,0 +1,393 @@
+"""
+Gil Vicente scraper service mode.
+
+Runs continuously and works through the persistent job queue (`job_queue.py`):
+- next-opponent refresh, queued when a new Gil Vicente match has finished (matchday)
+- nightly league refresh (`league_batch.py`)
+- on-demand jobs inserted by the backend API (POST /api/v1/scraper/jobs)
+
+Browsers stay open between jobs, failed jobs are retried with exponential backoff and
+every finished job is published on Redis so the backend can invalidate its cache.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+from job_queue import JOB_KINDS, JOB_LEAGUE, JOB_NEXT_OPPONENT, ScrapeJobQueue
+from league_batch import SOFASCORE_HOME, LeagueBatchScraper, _default_league_id
+from resource_blocking import ResourceBlockingProfile
+from scrapper import SofaScoreScraper
+
+try:
+    import redis
+except ImportError:  # Publishing is optional; the queue works without it.
+    redis = None
+
+
+SCRAPER_EVENTS_CHANNEL = "gil_vicente:scraper_events"
+
+
+def _redis_url() -> str:
+    url = (os.getenv("REDIS_URL") or "").strip()
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST") or "localhost"
+    port = os.getenv("REDIS_PORT") or "6379"
+    db = os.getenv("REDIS_DB") or "0"
+    return f"redis://{host}:{port}/{db}"
+
+
+class ScraperDaemon:
+    """Long-running scraper that schedules, runs and publishes scrape jobs."""
+
+    STATE_FILENAME = ".scraper_daemon_state.json"
+
+    def __init__(
+        self,
+        *,
+        headless: bool = True,
+        block_profile: Optional[ResourceBlockingProfile] = None,
+        poll_seconds: float = 30.0,
+        matchday_check_minutes: float = 60.0,
+        nightly_hour: int = 3,
+        league_id: Optional[int] = None,
+        league_workers: int = 2,
+        last_n: int = 10,
+        backoff_base_seconds: float = 120.0,
+        backoff_max_seconds: float = 3600.0,
+    ):
+        self.headless = headless
+        self.block_profile = block_profile
+        self.poll_seconds = poll_seconds
+        self.matchday_check_seconds = matchday_check_minutes * 60
+        self.nightly_hour = nightly_hour
+        self.league_id = league_id or _default_league_id()
+        self.league_workers = league_workers
+        self.last_n = last_n
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        self.export_dir = self._export_dir()
+        self.queue = ScrapeJobQueue(self.export_dir)
+        self.state_path = self.export_dir / self.STATE_FILENAME
+        self.state = self._load_state()
+
+        self._scraper: Optional[SofaScoreScraper] = None
+        self._league: Optional[LeagueBatchScraper] = None
+        self._redis = None
+        self._last_matchday_check = 0.0
+        self._stopping = False
+
+    @staticmethod
+    def _export_dir() -> Path:
+        export_dir_env = (os.getenv("SCRAPER_EXPORT_DIR") or "").strip()
+        if export_dir_env:
+            return Path(export_dir_env).expanduser()
+        return Path(CURRENT_DIR).parent / "data" / "scraper_exports"
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def _save_state(self) -> None:
+        try:
+            tmp_path = self.state_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(self.state, fh)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"  WARNING: Could not save daemon state: {e}")
+
+    # ------------------------------------------------------------------
+    # Warm browsers
+    # ------------------------------------------------------------------
+    def _browser_alive(self) -> bool:
+        try:
+            _ = self._scraper.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def scraper(self) -> SofaScoreScraper:
+        """The shared browser, restarted if it died since the last job."""
+        if self._scraper is not None and not self._browser_alive():
+            print("  WARNING: Browser is not responding; restarting it.")
+            self._close_browsers()
+        if self._scraper is None:
+            self._scraper = SofaScoreScraper(headless=self.headless, block_profile=self.block_profile)
+            self._scraper.driver.get(SOFASCORE_HOME)
+        return self._scraper
+
+    def league_scraper(self) -> LeagueBatchScraper:
+        coordinator = self.scraper()
+        if self._league is None or self._league.coordinator is not coordinator:
+            if self._league is not None:
+                self._league.close()
+            self._league = LeagueBatchScraper(
+                workers=self.league_workers,
+                last_n=self.last_n,
+                headless=self.headless,
+                block_profile=self.block_profile,
+                coordinator=coordinator,
+            )
+        return self._league
+
+    def _close_browsers(self) -> None:
+        if self._league is not None:
+            try:
+                self._league.close()
+            except Exception:
+                pass
+            self._league = None
+        if self._scraper is not None:
+            try:
+                self._scraper.close()
+            except Exception:
+                pass
+            self._scraper = None
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _gil_vicente_team_id(self) -> str:
+        return self.scraper().team_url.rstrip("/").rsplit("/", 1)[-1]
+
+    def schedule_due_jobs(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now()
+
+        today = now.strftime("%Y-%m-%d")
+        if now.hour >= self.nightly_hour and self.state.get("last_nightly_date") != today:
+            job_id = self.queue.enqueue(JOB_LEAGUE, {"league_id": self.league_id}, source="nightly")
+            print(f"  Scheduled nightly league refresh (job {job_id})")
+            self.state["last_nightly_date"] = today
+            self._save_state()
+
+        if time.time() - self._last_matchday_check >= self.matchday_check_seconds:
+            self._last_matchday_check = time.time()
+            self._check_matchday()
+
+    def _check_matchday(self) -> None:
+        """Queue a next-opponent refresh when Gil Vicente has played a new match."""
+        data = self.scraper().stats_extractor.fetch_api_json(
+            f"/team/{self._gil_vicente_team_id()}/events/last/0"
+        ) or {}
+        finished = [
+            ev for ev in data.get("events") or []
+            if str((ev.get("status") or {}).get("type") or "").lower() == "finished"
+        ]
+        if not finished:
+            return
+
+        latest = max(finished, key=lambda ev: ev.get("startTimestamp") or 0)
+        latest_id = str(latest.get("id"))
+        previous_id = self.state.get("last_finished_event_id")
+        if latest_id == previous_id:
+            return
+
+        self.state["last_finished_event_id"] = latest_id
+        self._save_state()
+        if previous_id is not None:
+            job_id = self.queue.enqueue(JOB_NEXT_OPPONENT, source="matchday")
+            print(f"  Match {latest_id} finished; scheduled next-opponent refresh (job {job_id})")
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def _run_next_opponent(self, job: Dict) -> Dict:
+        scraper = self.scraper()
+        # Retries continue from the per-match checkpoints of the failed attempt.
+        individual_df, aggregated, fixtures_df = scraper.run_complete_analysis(
+            resume=int(job.get("attempts") or 1) > 1
+        )
+        has_fixtures = fixtures_df is not None and not fixtures_df.empty
+        if individual_df is None or aggregated is None:
+            if has_fixtures:
+                scraper.save_results(None, None, fixtures_df)
+            raise RuntimeError("Next-opponent scrape did not produce match statistics")
+
+        scraper.save_results(individual_df, aggregated, fixtures_df)
+        pending = scraper.checkpoint.pending_event_ids()
+        if not pending:
+            scraper.checkpoint.clear()
+        return {
+            "opponents": [aggregated.get("opponent_name")],
+            "fixtures": has_fixtures,
+            "matches": len(individual_df),
+            "failed_matches": pending,
+        }
+
+    def _run_league(self, job: Dict) -> Dict:
+        payload = job.get("payload") or {}
+        batch = self.league_scraper()
+        batch.last_n = max(1, int(payload.get("last_n") or self.last_n))
+
+        team_ids = payload.get("team_ids") or []
+        if team_ids:
+            teams = batch.teams_from_ids(team_ids)
+        else:
+            teams = batch.teams_from_standings(int(payload.get("league_id") or self.league_id))
+        if not teams:
+            raise RuntimeError("No teams resolved for league refresh")
+
+        summary = batch.run(teams)
+        return {
+            "opponents": [name for name, count in summary.items() if count],
+            "fixtures": False,
+            "matches": sum(summary.values()),
+        }
+
+    def run_job(self, job: Dict) -> None:
+        print("\n" + "=" * 80)
+        print(f"JOB {job['id']}: {job['kind']} (attempt {job['attempts']}/{job['max_attempts']}, source: {job['source']})")
+        print("=" * 80)
+
+        try:
+            if job["kind"] == JOB_NEXT_OPPONENT:
+                result = self._run_next_opponent(job)
+            elif job["kind"] == JOB_LEAGUE:
+                result = self._run_league(job)
+            else:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+        except Exception as e:
+            traceback.print_exc()
+            retry_in = min(
+                self.backoff_base_seconds * (2 ** (int(job["attempts"]) - 1)),
+                self.backoff_max_seconds,
+            )
+            status = self.queue.fail(job, str(e), retry_in)
+            if status == "pending":
+                print(f"  WARNING: Job {job['id']} failed ({e}); retrying in {int(retry_in)}s")
+            else:
+                print(f"  WARNING: Job {job['id']} failed permanently: {e}")
+                self.publish(job, "failed", {"error": str(e)})
+            return
+
+        self.queue.complete(job["id"], result)
+        print(f"  Job {job['id']} done: {result}")
+        self.publish(job, "done", result)
+
+    # ------------------------------------------------------------------
+    # Completion events
+    # ------------------------------------------------------------------
+    def publish(self, job: Dict, status: str, result: Dict) -> None:
+        """Announce a finished job on Redis (best-effort) for cache invalidation."""
+        if redis is None:
+            return
+        event = {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": status,
+            "opponents": [name for name in result.get("opponents") or [] if name],
+            "fixtures": bool(result.get("fixtures")),
+            "finished_at": datetime.now().isoformat(),
+        }
+        try:
+            if self._redis is None:
+                self._redis = redis.Redis.from_url(_redis_url())
+            self._redis.publish(SCRAPER_EVENTS_CHANNEL, json.dumps(event))
+        except Exception as e:
+            self._redis = None
+            print(f"  WARNING: Could not publish completion event: {e}")
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+    def stop(self, *_args) -> None:
+        print("\nStopping after the current job...")
+        self._stopping = True
+
+    def run_forever(self, once: bool = False) -> None:
+        requeued = self.queue.requeue_running()
+        if requeued:
+            print(f"  Requeued {requeued} job(s) interrupted by a previous shutdown")
+
+        try:
+            while not self._stopping:
+                if not once:
+                    try:
+                        self.schedule_due_jobs()
+                    except Exception as e:
+                        print(f"  WARNING: Scheduling failed: {e}")
+
+                job = self.queue.claim_next()
+                if job is not None:
+                    self.run_job(job)
+                    continue
+                if once:
+                    break
+                time.sleep(self.poll_seconds)
+        finally:
+            self._close_browsers()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scraper as a long-lived job worker")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser windows")
+    parser.add_argument("--block-resources", default=None, help='Resources to block ("all", "none", "images,fonts,...")')
+    parser.add_argument("--poll-seconds", type=float, default=30.0, help="Idle wait between queue polls")
+    parser.add_argument(
+        "--matchday-check-minutes",
+        type=float,
+        default=60.0,
+        help="How often to check whether Gil Vicente played a new match",
+    )
+    parser.add_argument("--nightly-hour", type=int, default=3, help="Local hour of the nightly league refresh")
+    parser.add_argument("--league-id", type=int, default=None, help="SofaScore unique-tournament ID for league refreshes")
+    parser.add_argument("--workers", type=int, default=2, help="Browsers used by league refreshes")
+    parser.add_argument("--last", type=int, default=10, help="Finished matches per team in league refreshes")
+    parser.add_argument("--once", action="store_true", help="Run the jobs already due, then exit")
+    parser.add_argument("--enqueue", choices=JOB_KINDS, default=None, help="Add a job to the queue and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.enqueue:
+        payload = {"league_id": args.league_id} if args.enqueue == JOB_LEAGUE and args.league_id else None
+        job_id = ScrapeJobQueue(ScraperDaemon._export_dir()).enqueue(args.enqueue, payload, source="cli")
+        print(f"Queued {args.enqueue} job {job_id}")
+        return 0
+
+    block_profile = ResourceBlockingProfile.from_env(args.block_resources)
+    daemon = ScraperDaemon(
+        headless=not args.no_headless,
+        block_profile=block_profile,
+        poll_seconds=args.poll_seconds,
+        matchday_check_minutes=args.matchday_check_minutes,
+        nightly_hour=args.nightly_hour,
+        league_id=args.league_id,
+        league_workers=args.workers,
+        last_n=args.last,
+    )
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+
+    print("=" * 80)
+    print(f"SCRAPER DAEMON (queue: {daemon.queue.path})")
+    print("=" * 80)
+    daemon.run_forever(once=args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
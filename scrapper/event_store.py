@@ -0,0 +1,165 @@
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+EXPORT_GLOB = "gil_vicente_next_opponent_*_individual_*.json"
+
+# Columns added by `calculate_aggregated_statistics` from one team's point of view;
+# they are recomputed for every export, so cached rows must not carry them over.
+DERIVED_COLUMNS = ("opponent_goals", "opponent_goals_conceded", "result")
+
+_EVENT_ID_RE = re.compile(r"#id:(\d+)")
+
+_BASE_COLUMNS = ("home_team", "away_team", "home_score", "away_score")
+
+
+def has_statistics(row: Dict) -> bool:
+    """Whether an exported match row carries match statistics (not just the score)."""
+    return any(
+        (key.endswith("_home") or key.endswith("_away"))
+        and key not in _BASE_COLUMNS
+        and value not in (None, "")
+        for key, value in row.items()
+    )
+
+
+def event_id_from_url(match_url) -> Optional[str]:
+    if not match_url:
+        return None
+    match = _EVENT_ID_RE.search(str(match_url))
+    return match.group(1) if match else None
+
+
+class ExportedEventIndex:
+    """Index of match events already present in individual exports.
+
+    Finished matches never change, so a row exported by any previous run can be reused
+    instead of opening the match page again. The index maps event ID -> export file and
+    is persisted to `<export_dir>/.event_index.json` together with each file's
+    (mtime, size), so refreshing it only parses exports written since the last run.
+    """
+
+    INDEX_FILENAME = ".event_index.json"
+
+    def __init__(self, export_dir: Path):
+        self.export_dir = Path(export_dir)
+        self.index_path = self.export_dir / self.INDEX_FILENAME
+        self._files: Dict[str, List[float]] = {}
+        self._events: Dict[str, str] = {}
+        self._rows_cache: Dict[str, Dict[str, Dict]] = {}
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._events)
+
+    def __contains__(self, event_id) -> bool:
+        self.refresh()
+        return event_id is not None and str(event_id) in self._events
+
+    def _read_persisted(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except Exception:
+            return
+        if not isinstance(data, dict):
+            return
+        files = data.get("files")
+        events = data.get("events")
+        if isinstance(files, dict) and isinstance(events, dict):
+            self._files = {str(k): list(v) for k, v in files.items() if isinstance(v, list)}
+            self._events = {str(k): str(v) for k, v in events.items()}
+
+    def _persist(self) -> None:
+        try:
+            self.export_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"files": self._files, "events": self._events}, fh)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"  WARNING: Could not persist event index: {e}")
+
+    def _read_rows(self, filename: str) -> Dict[str, Dict]:
+        """Return {event_id: row} for one export file (memoized per run)."""
+        if filename in self._rows_cache:
+            return self._rows_cache[filename]
+
+        rows: Dict[str, Dict] = {}
+        try:
+            with open(self.export_dir / filename, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except Exception:
+            data = []
+
+        for row in data if isinstance(data, list) else []:
+            if not isinstance(row, dict):
+                continue
+            event_id = event_id_from_url(row.get("match_url"))
+            if event_id:
+                rows[event_id] = row
+
+        self._rows_cache[filename] = rows
+        return rows
+
+    def refresh(self) -> None:
+        """Pick up exports added, changed or removed since the index was last saved."""
+        if not self._loaded:
+            self._read_persisted()
+            self._loaded = True
+
+        current: Dict[str, List[float]] = {}
+        if self.export_dir.is_dir():
+            for path in self.export_dir.glob(EXPORT_GLOB):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                current[path.name] = [stat.st_mtime, stat.st_size]
+
+        changed = [name for name, sig in current.items() if self._files.get(name) != sig]
+        removed = [name for name in self._files if name not in current]
+        if not changed and not removed:
+            return
+
+        stale = set(changed) | set(removed)
+        self._events = {eid: name for eid, name in self._events.items() if name not in stale}
+        for name in stale:
+            self._rows_cache.pop(name, None)
+
+        # Oldest first so the newest export wins for events present in several files.
+        for name in sorted(current, key=lambda n: current[n][0]):
+            if name in changed:
+                for event_id in self._read_rows(name):
+                    current_owner = self._events.get(event_id)
+                    if current_owner is None or current[current_owner][0] <= current[name][0]:
+                        self._events[event_id] = name
+
+        self._files = current
+        self._persist()
+
+    def get_row(self, event_id) -> Optional[Dict]:
+        """Return a copy of the exported row for `event_id`, without derived columns."""
+        self.refresh()
+        if event_id is None:
+            return None
+        filename = self._events.get(str(event_id))
+        if not filename:
+            return None
+        row = self._read_rows(filename).get(str(event_id))
+        if row is None or not has_statistics(row):
+            # Rows exported without statistics are worth another scrape attempt.
+            return None
+        return {
+            key: value
+            for key, value in row.items()
+            if key not in DERIVED_COLUMNS and value is not None
+        }
+
+    def event_ids(self) -> Iterable[str]:
+        self.refresh()
+        return list(self._events)
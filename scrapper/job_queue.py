@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+JOB_QUEUE_FILENAME = ".scraper_jobs.sqlite3"
+
+# Job kinds understood by the daemon.
+JOB_NEXT_OPPONENT = "next_opponent"
+JOB_LEAGUE = "league"
+JOB_KINDS = (JOB_NEXT_OPPONENT, JOB_LEAGUE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    source TEXT NOT NULL DEFAULT 'schedule',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status_run_after ON scrape_jobs (status, run_after);
+"""
+
+
+class ScrapeJobQueue:
+    """Persistent scrape job queue in `<export_dir>/.scraper_jobs.sqlite3`.
+
+    The daemon claims and runs jobs; the backend (which mounts the same data folder)
+    only inserts on-demand jobs and reads their status, so the table is the contract
+    between both sides. Status flow: pending -> running -> done | failed. A failed
+    attempt goes back to pending with `run_after` pushed out by the daemon's backoff.
+    """
+
+    def __init__(self, export_dir: Path):
+        self.path = Path(export_dir) / JOB_QUEUE_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit mode; multi-statement updates take an explicit BEGIN IMMEDIATE lock.
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        for key in ("payload", "result"):
+            try:
+                job[key] = json.loads(job[key]) if job.get(key) else None
+            except Exception:
+                pass
+        return job
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Optional[Dict] = None,
+        *,
+        source: str = "schedule",
+        run_after: Optional[float] = None,
+        max_attempts: int = 3,
+    ) -> int:
+        """Add a job and return its ID; an identical pending job is reused instead."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown scrape job kind: {kind}")
+        payload_json = json.dumps(payload or {}, sort_keys=True)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute(
+                "SELECT id FROM scrape_jobs WHERE kind = ? AND payload = ? AND status = 'pending'",
+                (kind, payload_json),
+            ).fetchone()
+            if existing:
+                conn.execute("COMMIT")
+                return int(existing["id"])
+            cur = conn.execute(
+                "INSERT INTO scrape_jobs (kind, payload, source, max_attempts, run_after, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, payload_json, source, int(max_attempts), run_after or now, now, now),
+            )
+            conn.execute("COMMIT")
+            return int(cur.lastrowid)
+
+    def claim_next(self) -> Optional[Dict]:
+        """Mark the oldest due pending job as running and return it."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM scrape_jobs WHERE status = 'pending' AND run_after <= ? "
+                "ORDER BY run_after, id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE scrape_jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        job = self._row_to_job(row)
+        job["status"] = "running"
+        job["attempts"] += 1
+        return job
+
+    def complete(self, job_id: int, result: Optional[Dict] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scrape_jobs SET status = 'done', result = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result or {}, default=str), time.time(), job_id),
+            )
+
+    def fail(self, job: Dict, error: str, retry_in: Optional[float]) -> str:
+        """Record a failed attempt; reschedule it unless attempts are exhausted.
+
+        Returns the new status ("pending" or "failed").
+        """
+        exhausted = retry_in is None or int(job.get("attempts") or 0) >= int(job.get("max_attempts") or 1)
+        status = "failed" if exhausted else "pending"
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scrape_jobs SET status = ?, last_error = ?, run_after = ?, updated_at = ? WHERE id = ?",
+                (status, str(error)[:2000], now + (retry_in or 0), now, job["id"]),
+            )
+        return status
+
+    def requeue_running(self) -> int:
+        """Return jobs left 'running' by a crashed daemon to the queue."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE scrape_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (time.time(),),
+            )
+            return cur.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM scrape_jobs ORDER BY id DESC LIMIT ?", (int(limit),)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
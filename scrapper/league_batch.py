@@ -0,0 +1,297 @@
+"""
+League-wide batch scrape.
+
+Refreshes the last N matches of every team in a league (from the SofaScore standings)
+or of an explicit list of team IDs, in one run:
+1. Resolve the teams (standings or --team-ids)
+2. List each team's last N finished events through the SofaScore API
+3. Deduplicate events across teams and skip those already exported (shared event index)
+4. Scrape the remaining events through a pool of browsers
+5. Write one individual + aggregated export per team (same naming as the next-opponent run)
+"""
+
+import argparse
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.insert(0, CURRENT_DIR)
+
+import pandas as pd
+
+from event_store import ExportedEventIndex
+from resource_blocking import ResourceBlockingProfile
+from scrapper import SofaScoreScraper
+
+
+SOFASCORE_HOME = "https://www.sofascore.com/"
+
+
+def _default_league_id() -> int:
+    # SofaScore unique-tournament ID (Liga Portugal Betclic: 238). GIL_VICENTE_LEAGUE_ID is
+    # not used here: it holds a different provider's league ID.
+    return int(os.getenv("SOFASCORE_LEAGUE_ID") or 238)
+
+
+def _match_url(event: Dict) -> str:
+    slug = event.get("slug") or "match"
+    custom_id = event.get("customId") or ""
+    return f"https://www.sofascore.com/football/match/{slug}/{custom_id}#id:{event.get('id')}"
+
+
+class LeagueBatchScraper:
+    """Scrape the last N matches for many teams with a shared browser pool."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        last_n: int = 10,
+        headless: bool = True,
+        block_profile: Optional[ResourceBlockingProfile] = None,
+        incremental: bool = True,
+        coordinator: Optional[SofaScoreScraper] = None,
+    ):
+        self.workers = max(1, int(workers))
+        self.last_n = max(1, int(last_n))
+        self.headless = headless
+        self.block_profile = block_profile
+        self.incremental = incremental
+
+        # The coordinator browser owns API lookups and writes exports. A caller that keeps
+        # its own browser warm (the daemon) can lend it; it is then not closed here.
+        self._owns_coordinator = coordinator is None
+        self.coordinator = coordinator or SofaScoreScraper(headless=headless, block_profile=block_profile)
+        self.coordinator.driver.get(SOFASCORE_HOME)
+
+        # The pool outlives a single run so each worker thread keeps its browser between runs.
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._local = threading.local()
+        self._worker_scrapers: List[SofaScoreScraper] = []
+        self._worker_lock = threading.Lock()
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        for scraper in self._worker_scrapers:
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        self._worker_scrapers = []
+        if self._owns_coordinator:
+            self.coordinator.close()
+
+    def _api(self, path: str) -> Dict:
+        return self.coordinator.stats_extractor.fetch_api_json(path) or {}
+
+    # ------------------------------------------------------------------
+    # Team + event discovery
+    # ------------------------------------------------------------------
+    def teams_from_standings(self, league_id: int, season_id: Optional[int] = None) -> List[Dict]:
+        if season_id is None:
+            seasons = self._api(f"/unique-tournament/{int(league_id)}/seasons").get("seasons") or []
+            if not seasons:
+                print(f"  WARNING: No seasons found for league {league_id}")
+                return []
+            season_id = seasons[0].get("id")
+
+        data = self._api(f"/unique-tournament/{int(league_id)}/season/{int(season_id)}/standings/total")
+        teams: List[Dict] = []
+        seen = set()
+        for table in data.get("standings") or []:
+            for row in table.get("rows") or []:
+                team = row.get("team") or {}
+                team_id = team.get("id")
+                if not team_id or team_id in seen:
+                    continue
+                seen.add(team_id)
+                teams.append({"id": int(team_id), "name": team.get("name") or str(team_id)})
+
+        print(f"  Found {len(teams)} teams in league {league_id} (season {season_id})")
+        return teams
+
+    def teams_from_ids(self, team_ids: List) -> List[Dict]:
+        teams: List[Dict] = []
+        for raw_id in team_ids:
+            raw_id = str(raw_id).strip()
+            if not raw_id.isdigit():
+                continue
+            team = self._api(f"/team/{raw_id}").get("team") or {}
+            teams.append({"id": int(raw_id), "name": team.get("name") or raw_id})
+        return teams
+
+    def last_finished_events(self, team_id: int) -> List[Dict]:
+        events: List[Dict] = []
+        page = 0
+        while len(events) < self.last_n and page < 3:
+            data = self._api(f"/team/{int(team_id)}/events/last/{page}")
+            page_events = data.get("events") or []
+            if not page_events:
+                break
+            events.extend(
+                ev for ev in page_events
+                if str((ev.get("status") or {}).get("type") or "").lower() == "finished"
+            )
+            page += 1
+
+        events.sort(key=lambda ev: ev.get("startTimestamp") or 0, reverse=True)
+        return events[: self.last_n]
+
+    # ------------------------------------------------------------------
+    # Worker pool
+    # ------------------------------------------------------------------
+    def _worker_scraper(self) -> SofaScoreScraper:
+        scraper = getattr(self._local, "scraper", None)
+        if scraper is None:
+            scraper = SofaScoreScraper(headless=self.headless, block_profile=self.block_profile)
+            self._local.scraper = scraper
+            with self._worker_lock:
+                self._worker_scrapers.append(scraper)
+        return scraper
+
+    def _scrape_event(self, event_id: str, match_url: str) -> Tuple[str, Optional[Dict]]:
+        scraper = self._worker_scraper()
+        df = scraper.scrape_match_candidates([{"url": match_url, "event_id": event_id, "listing_info": {}}])
+        if df.empty:
+            return event_id, None
+        return event_id, df.iloc[0].dropna().to_dict()
+
+    def scrape_events(self, urls_by_event: Dict[str, str]) -> Dict[str, Dict]:
+        rows: Dict[str, Dict] = {}
+        if not urls_by_event:
+            return rows
+
+        print(f"\n  Scraping {len(urls_by_event)} events with {self.workers} worker(s)...")
+        futures = [
+            self._pool.submit(self._scrape_event, event_id, url)
+            for event_id, url in urls_by_event.items()
+        ]
+        for future in as_completed(futures):
+            try:
+                event_id, row = future.result()
+            except Exception as e:
+                print(f"    WARNING: Worker failed: {e}")
+                continue
+            if row:
+                rows[event_id] = row
+        return rows
+
+    # ------------------------------------------------------------------
+    # Batch run
+    # ------------------------------------------------------------------
+    def run(self, teams: List[Dict]) -> Dict[str, int]:
+        """Refresh exports for `teams` ([{id, name}]). Returns {team name: matches exported}."""
+        print("\n" + "=" * 80)
+        print(f"LEAGUE BATCH SCRAPE: {len(teams)} teams, last {self.last_n} matches each")
+        print("=" * 80)
+
+        events_by_team: Dict[int, List[Dict]] = {}
+        urls_by_event: Dict[str, str] = {}
+        for team in teams:
+            events = self.last_finished_events(team["id"])
+            events_by_team[team["id"]] = events
+            for ev in events:
+                if ev.get("id"):
+                    urls_by_event[str(ev["id"])] = _match_url(ev)
+            print(f"  {team['name']}: {len(events)} finished events")
+
+        event_index = ExportedEventIndex(self.coordinator._export_dir()) if self.incremental else None
+        rows: Dict[str, Dict] = {}
+        if event_index is not None:
+            for event_id in list(urls_by_event):
+                cached = event_index.get_row(event_id)
+                if cached is not None:
+                    rows[event_id] = cached
+        print(f"\n  {len(urls_by_event)} unique events, {len(rows)} reused from previous exports")
+
+        to_scrape = {eid: url for eid, url in urls_by_event.items() if eid not in rows}
+        rows.update(self.scrape_events(to_scrape))
+
+        summary: Dict[str, int] = {}
+        for team in teams:
+            team_rows = []
+            for number, ev in enumerate(events_by_team.get(team["id"]) or [], 1):
+                row = rows.get(str(ev.get("id")))
+                if row is None:
+                    continue
+                row = dict(row)
+                row["match_number"] = number
+                team_rows.append(row)
+
+            if not team_rows:
+                print(f"  WARNING: No matches scraped for {team['name']}")
+                summary[team["name"]] = 0
+                continue
+
+            df = pd.DataFrame(team_rows)
+            aggregated = self.coordinator.calculate_aggregated_statistics(df, team["name"])
+            self.coordinator.save_results(df, aggregated, None)
+            summary[team["name"]] = len(team_rows)
+
+        return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape the last N matches of every team in a league")
+    parser.add_argument(
+        "--league-id",
+        type=int,
+        default=None,
+        help="SofaScore unique-tournament ID (default: SOFASCORE_LEAGUE_ID or 238, Liga Portugal)",
+    )
+    parser.add_argument("--season-id", type=int, default=None, help="SofaScore season ID (default: current)")
+    parser.add_argument("--team-ids", default="", help="Comma-separated SofaScore team IDs (skips standings)")
+    parser.add_argument("--last", type=int, default=10, help="Finished matches per team")
+    parser.add_argument("--workers", type=int, default=2, help="Browsers scraping in parallel")
+    parser.add_argument("--no-headless", action="store_true", help="Show the browser windows")
+    parser.add_argument("--block-resources", default=None, help='Resources to block ("all", "none", "images,fonts,...")')
+    parser.add_argument("--full-refresh", action="store_true", help="Re-scrape events already exported")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    block_profile = ResourceBlockingProfile.from_env(args.block_resources)
+
+    batch = None
+    try:
+        batch = LeagueBatchScraper(
+            workers=args.workers,
+            last_n=args.last,
+            headless=not args.no_headless,
+            block_profile=block_profile,
+            incremental=not args.full_refresh,
+        )
+
+        if args.team_ids.strip():
+            teams = batch.teams_from_ids(args.team_ids.split(","))
+        else:
+            teams = batch.teams_from_standings(args.league_id or _default_league_id(), args.season_id)
+
+        if not teams:
+            print("\nWARNING: No teams to scrape.")
+            return 1
+
+        summary = batch.run(teams)
+
+        print("\n" + "=" * 80)
+        print("LEAGUE BATCH COMPLETE")
+        print("=" * 80)
+        for name, count in summary.items():
+            print(f"  {name}: {count} matches")
+        return 0
+
+    except KeyboardInterrupt:
+        print("\n\nWARNING: Batch scrape interrupted by user.")
+        return 130
+    finally:
+        if batch:
+            batch.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,258 @@
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from selenium.webdriver.chrome.options import Options
+
+
+_IMAGE_PATTERNS = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.svg",
+    "*.ico",
+    # Team/player badges are served from extension-less endpoints (e.g. /team/3010/image)
+    "*/image",
+    "*img.sofascore.com*",
+]
+
+_FONT_PATTERNS = [
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.eot",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+]
+
+_MEDIA_PATTERNS = [
+    "*.mp4",
+    "*.webm",
+    "*.m3u8",
+    "*.mp3",
+    "*.ogg",
+]
+
+_AD_PATTERNS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googletagmanager.com*",
+    "*googletagservices.com*",
+    "*google-analytics.com*",
+    "*adservice.google.*",
+    "*amazon-adsystem.com*",
+    "*adnxs.com*",
+    "*pubmatic.com*",
+    "*rubiconproject.com*",
+    "*criteo.com*",
+    "*criteo.net*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*scorecardresearch.com*",
+    "*quantserve.com*",
+    "*hotjar.com*",
+    "*connect.facebook.net*",
+    "*browser.sentry-cdn.com*",
+]
+
+# Chrome content settings: 1 = allow, 2 = block.
+_BLOCK = 2
+
+CATEGORIES = ("images", "fonts", "media", "ads")
+
+
+@dataclass
+class ResourceBlockingProfile:
+    """Which resource categories the scraping browser should never download.
+
+    Extractors only read DOM text, `img[alt]` attributes and the SofaScore JSON
+    API responses, so images, fonts, media and ad/analytics scripts are pure overhead.
+    Blocked `<img>` elements stay in the DOM, so alt-text lookups keep working.
+    """
+
+    images: bool = True
+    fonts: bool = True
+    media: bool = True
+    ads: bool = True
+    extra_patterns: List[str] = field(default_factory=list)
+
+    @classmethod
+    def disabled(cls) -> "ResourceBlockingProfile":
+        return cls(images=False, fonts=False, media=False, ads=False)
+
+    @classmethod
+    def from_spec(cls, spec: Optional[str]) -> "ResourceBlockingProfile":
+        """Build a profile from a spec like "all", "none" or "images,fonts,ads"."""
+        raw = (spec or "").strip().lower()
+        if not raw or raw in {"all", "default", "1", "true", "on"}:
+            return cls()
+        if raw in {"none", "off", "0", "false"}:
+            return cls.disabled()
+
+        wanted = {part.strip() for part in raw.split(",") if part.strip()}
+        unknown = wanted - set(CATEGORIES)
+        if unknown:
+            print(f"  WARNING: Unknown resource blocking categories ignored: {sorted(unknown)}")
+        return cls(
+            images="images" in wanted,
+            fonts="fonts" in wanted,
+            media="media" in wanted,
+            ads="ads" in wanted,
+        )
+
+    @classmethod
+    def from_env(cls, spec: Optional[str] = None) -> "ResourceBlockingProfile":
+        """Profile from `SCRAPER_BLOCK_RESOURCES` (or `spec`, e.g. a --block-resources value)
+        plus the custom URL patterns of `SCRAPER_BLOCK_URL_PATTERNS`."""
+        profile = cls.from_spec(spec if spec is not None else os.getenv("SCRAPER_BLOCK_RESOURCES"))
+        extra = os.getenv("SCRAPER_BLOCK_URL_PATTERNS") or ""
+        profile.extra_patterns = [p.strip() for p in extra.split(",") if p.strip()]
+        return profile
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.images or self.fonts or self.media or self.ads or self.extra_patterns)
+
+    def describe(self) -> str:
+        active = [name for name in CATEGORIES if getattr(self, name)]
+        if self.extra_patterns:
+            active.append(f"+{len(self.extra_patterns)} custom")
+        return ", ".join(active) if active else "none"
+
+    def blocked_url_patterns(self) -> List[str]:
+        patterns: List[str] = []
+        if self.images:
+            patterns.extend(_IMAGE_PATTERNS)
+        if self.fonts:
+            patterns.extend(_FONT_PATTERNS)
+        if self.media:
+            patterns.extend(_MEDIA_PATTERNS)
+        if self.ads:
+            patterns.extend(_AD_PATTERNS)
+        patterns.extend(self.extra_patterns)
+        return patterns
+
+    def content_setting_prefs(self) -> Dict[str, int]:
+        prefs: Dict[str, int] = {}
+        if self.images:
+            prefs["profile.managed_default_content_settings.images"] = _BLOCK
+        if self.media:
+            prefs["profile.managed_default_content_settings.media_stream"] = _BLOCK
+            prefs["profile.default_content_setting_values.autoplay"] = _BLOCK
+        if self.ads:
+            prefs["profile.managed_default_content_settings.popups"] = _BLOCK
+            prefs["profile.default_content_setting_values.notifications"] = _BLOCK
+        return prefs
+
+    def apply_to_options(self, chrome_options: Options) -> None:
+        """Register content-settings prefs (must run before the driver starts)."""
+        if not self.enabled:
+            return
+        prefs = self.content_setting_prefs()
+        if prefs:
+            chrome_options.add_experimental_option("prefs", prefs)
+
+    def apply_to_driver(self, driver) -> bool:
+        """Install the URL block list through CDP (best-effort)."""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": self.blocked_url_patterns()}
+            )
+            return True
+        except Exception as e:
+            print(f"  WARNING: Could not install CDP resource blocking: {e}")
+            return False
+
+
+def _drain_network_stats(driver) -> Tuple[int, int, int]:
+    """Return (bytes_transferred, finished_requests, blocked_requests) from perf logs."""
+    try:
+        logs = driver.get_log("performance") or []
+    except Exception:
+        return 0, 0, 0
+
+    total_bytes = 0
+    finished = 0
+    blocked = 0
+    for entry in logs:
+        try:
+            msg = json.loads(entry.get("message", "{}")).get("message", {})
+        except Exception:
+            continue
+
+        method = msg.get("method")
+        params = msg.get("params") or {}
+        if method == "Network.loadingFinished":
+            total_bytes += int(params.get("encodedDataLength") or 0)
+            finished += 1
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked += 1
+
+    return total_bytes, finished, blocked
+
+
+def measure_page_load(driver, url: str) -> Dict[str, object]:
+    """Load `url` on a cold cache and report bytes transferred and page-ready time."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    except Exception:
+        pass
+    _drain_network_stats(driver)
+
+    start = time.perf_counter()
+    driver.get(url)
+    page_ready = time.perf_counter() - start
+
+    dom_content_loaded_ms = None
+    try:
+        nav = driver.execute_script(
+            "const n = performance.getEntriesByType('navigation')[0];"
+            "return n ? n.domContentLoadedEventEnd : null;"
+        )
+        if nav is not None:
+            dom_content_loaded_ms = round(float(nav), 1)
+    except Exception:
+        pass
+
+    # Give late XHR/ads a moment to land so both runs are compared like-for-like.
+    time.sleep(2)
+    total_bytes, finished, blocked = _drain_network_stats(driver)
+
+    return {
+        "url": url,
+        "page_ready_seconds": round(page_ready, 3),
+        "dom_content_loaded_ms": dom_content_loaded_ms,
+        "bytes_transferred": total_bytes,
+        "requests_finished": finished,
+        "requests_blocked": blocked,
+    }
+
+
+def print_benchmark_report(unblocked: Dict[str, object], blocked: Dict[str, object], profile: ResourceBlockingProfile) -> None:
+    print("\n" + "=" * 80)
+    print(f"RESOURCE BLOCKING BENCHMARK (profile: {profile.describe()})")
+    print("=" * 80)
+    print(f"  URL: {unblocked.get('url')}")
+    for label, result in (("Without blocking", unblocked), ("With blocking", blocked)):
+        print(f"\n  {label}:")
+        print(f"    Page ready: {result.get('page_ready_seconds')}s")
+        print(f"    DOMContentLoaded: {result.get('dom_content_loaded_ms')}ms")
+        print(f"    Bytes transferred: {int(result.get('bytes_transferred') or 0) / 1024:.1f} KiB")
+        print(f"    Requests: {result.get('requests_finished')} finished, {result.get('requests_blocked')} blocked")
+
+    before_bytes = int(unblocked.get("bytes_transferred") or 0)
+    after_bytes = int(blocked.get("bytes_transferred") or 0)
+    before_time = float(unblocked.get("page_ready_seconds") or 0.0)
+    after_time = float(blocked.get("page_ready_seconds") or 0.0)
+    if before_bytes > 0:
+        print(f"\n  Bytes saved: {(1 - after_bytes / before_bytes) * 100:.1f}%")
+    if before_time > 0:
+        print(f"  Page-ready time saved: {(1 - after_time / before_time) * 100:.1f}%")
@@ -8,6 +8,7 @@ This script:
 5. Scrapes last 10 matches statistics (individual + aggregated)
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -22,28 +23,40 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import re
 
+from checkpoint import ScrapeCheckpoint
+from columnar_store import ColumnarExportStore
+from event_store import ExportedEventIndex
 from listing_extractor import ListingExtractor
+from resource_blocking import ResourceBlockingProfile, measure_page_load, print_benchmark_report
 from stats_extractor import MatchStatsExtractor
 
+# First number in a stat cell ("58%", "12/20 (60%)", "1.85")
+_NUMBER_PATTERN = r"(-?\d+(?:\.\d+)?)"
+
 
 class SofaScoreScraper:
     """
     Scraper for collecting next opponent's last 10 matches statistics.
     """
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, block_profile: Optional[ResourceBlockingProfile] = None):
         """
         Initialize the scraper with Selenium WebDriver.
         
         Args:
             headless: Run browser in headless mode (default: False for debugging)
+            block_profile: Resources the browser should not download
+                (default: from SCRAPER_BLOCK_RESOURCES, blocking images/fonts/media/ads)
         """
         print("Initializing browser...")
+
+        self.block_profile = block_profile if block_profile is not None else ResourceBlockingProfile.from_env()
         
         chrome_options = Options()
         if headless:
@@ -62,6 +75,7 @@ class SofaScoreScraper:
         chrome_options.set_capability(
             "goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"}
         )
+        self.block_profile.apply_to_options(chrome_options)
         
         self.driver = webdriver.Chrome(options=chrome_options)
         self.driver.set_page_load_timeout(30)
@@ -72,6 +86,9 @@ class SofaScoreScraper:
             self.driver.execute_cdp_cmd("Network.enable", {})
         except Exception:
             pass
+
+        if self.block_profile.enabled and self.block_profile.apply_to_driver(self.driver):
+            print(f"  Resource blocking active: {self.block_profile.describe()}")
         
         self.team_url = "https://www.sofascore.com/pt-pt/football/team/gil-vicente/3010"
         self.stats_extractor = MatchStatsExtractor(self.driver, user_agent=self.user_agent)
@@ -510,19 +527,19 @@ class SofaScoreScraper:
         
         return info
     
-    def scrape_opponent_last_10_matches(self, opponent_name: str) -> pd.DataFrame:
+    def collect_opponent_match_candidates(self, opponent_name: str) -> List[Dict]:
         """
-        Scrape the last matches from opponent's page.
+        Collect the played matches to scrape from the opponent's page.
 
-        Behaviour changed:
-            - Only consider sidebar matches from 3rd to 10th item (indices 2..9)
-            - Only click/process matches that are already played (div[title='TR'])
+        Behaviour:
+            - Skip the first two sidebar items (upcoming matches)
+            - Only keep matches that are already played (div[title='TR'])
         """
         print("\n" + "="*80)
         print(f"STEP 3: Scraping {opponent_name}'s Last Matches (sidebar 3..10, played only)")
         print("="*80)
 
-        all_matches = []
+        match_candidates = []
 
         try:
             # Wait for page to load
@@ -554,7 +571,6 @@ class SofaScoreScraper:
 
             print(f"  Found {len(match_elements)} match links")
 
-            match_candidates = []
             seen_urls = set()
             MAX_MATCHES = 8  # ou 10 se quiseres mesmo 10
 
@@ -578,6 +594,7 @@ class SofaScoreScraper:
                     seen_urls.add(url)
                     match_candidates.append({
                         'url': url,
+                        'event_id': self.stats_extractor._extract_event_id(url),
                         'listing_info': listing_info,
                     })
 
@@ -588,71 +605,120 @@ class SofaScoreScraper:
 
             print(f"\n  Will process {len(match_candidates)} matches")
 
+        except Exception as e:
+            print(f"  WARNING: Error collecting matches: {e}")
+            import traceback
+            traceback.print_exc()
 
-            # Scrape each selected match (preserve ordering)
-            for idx, match_item in enumerate(match_candidates, 1):
-                match_url = match_item['url']
-                listing_info = match_item.get('listing_info', {})
-                print(f"\n  [{idx}/{len(match_candidates)}] Processing match {match_url} ...")
-
-                try:
-                    # Clear performance logs so CDP capture works per-match.
-                    try:
-                        self.driver.get_log("performance")
-                    except Exception:
-                        pass
+        return match_candidates
 
-                    # Navigate to match
-                    match_url_to_open = match_url
-                    if "#id:" in match_url_to_open and "tab:statistics" not in match_url_to_open:
-                        match_url_to_open = f"{match_url_to_open},tab:statistics"
+    def scrape_match_candidates(
+        self,
+        match_candidates: List[Dict],
+        checkpoint: Optional[ScrapeCheckpoint] = None,
+        event_index: Optional[ExportedEventIndex] = None,
+    ) -> pd.DataFrame:
+        """
+        Scrape each candidate match page (preserving order).
 
-                    self.driver.get(match_url_to_open)
-                    time.sleep(3)
+        When a checkpoint is given, matches already checkpointed are loaded instead of
+        re-scraped, and every newly scraped match is checkpointed immediately.
+        When an event index is given, matches found in a previous export are reused
+        (finished matches never change), so only new events are fetched.
+        """
+        all_matches = []
+        reused = 0
+
+        for idx, match_item in enumerate(match_candidates, 1):
+            match_url = match_item['url']
+            listing_info = match_item.get('listing_info', {})
+            event_id = match_item.get('event_id') or self.stats_extractor._extract_event_id(match_url)
+
+            if checkpoint is not None:
+                cached = checkpoint.load_match(event_id)
+                if cached is not None:
+                    print(f"\n  [{idx}/{len(match_candidates)}] Resumed match {event_id} from checkpoint")
+                    all_matches.append(cached)
+                    continue
 
-                    # Get basic info
-                    match_data = dict(listing_info) if listing_info else {}
-                    match_page_info = self.get_match_basic_info()
-                    for key, value in match_page_info.items():
-                        if value:
-                            match_data[key] = value
-                    match_data['match_number'] = idx
-                    match_data['match_url'] = match_url
+            if event_index is not None:
+                cached = event_index.get_row(event_id)
+                if cached is not None:
+                    cached['match_number'] = idx
+                    print(f"\n  [{idx}/{len(match_candidates)}] Reused match {event_id} from a previous export")
+                    all_matches.append(cached)
+                    reused += 1
+                    if checkpoint is not None:
+                        checkpoint.save_match(event_id, match_url, cached)
+                    continue
 
-                    print(f"    Match: {match_data.get('home_team', '?')} vs {match_data.get('away_team', '?')}")
-                    print(f"    Score: {match_data.get('home_score', '?')} - {match_data.get('away_score', '?')}")
+            print(f"\n  [{idx}/{len(match_candidates)}] Processing match {match_url} ...")
 
-                    # Extract statistics
-                    stats = self.stats_extractor.extract_match_statistics(idx, match_url)
-                    if stats:
-                        match_data.update(stats)
+            try:
+                # Clear performance logs so CDP capture works per-match.
+                try:
+                    self.driver.get_log("performance")
+                except Exception:
+                    pass
 
-                    # Fill missing score/date info from event API
-                    event_summary = self.stats_extractor.extract_event_summary(match_url)
-                    if event_summary:
-                        for key, value in event_summary.items():
-                            if value is None:
-                                continue
-                            if key not in match_data or match_data.get(key) in (None, "", "TBD"):
-                                match_data[key] = value
+                # Navigate to match
+                match_url_to_open = match_url
+                if "#id:" in match_url_to_open and "tab:statistics" not in match_url_to_open:
+                    match_url_to_open = f"{match_url_to_open},tab:statistics"
+
+                self.driver.get(match_url_to_open)
+                time.sleep(3)
+
+                # Get basic info
+                match_data = dict(listing_info) if listing_info else {}
+                match_page_info = self.get_match_basic_info()
+                for key, value in match_page_info.items():
+                    if value:
+                        match_data[key] = value
+                match_data['match_number'] = idx
+                match_data['match_url'] = match_url
+
+                print(f"    Match: {match_data.get('home_team', '?')} vs {match_data.get('away_team', '?')}")
+                print(f"    Score: {match_data.get('home_score', '?')} - {match_data.get('away_score', '?')}")
+
+                # Extract statistics
+                stats = self.stats_extractor.extract_match_statistics(idx, match_url)
+                if stats:
+                    match_data.update(stats)
+
+                # Fill missing score/date info from event API
+                event_summary = self.stats_extractor.extract_event_summary(match_url)
+                if event_summary:
+                    for key, value in event_summary.items():
+                        if value is None:
+                            continue
+                        if key not in match_data or match_data.get(key) in (None, "", "TBD"):
+                            match_data[key] = value
 
-                    all_matches.append(match_data)
+                all_matches.append(match_data)
+                if checkpoint is not None:
+                    checkpoint.save_match(event_id, match_url, match_data)
 
-                except Exception as e:
-                    print(f"    WARNING: Error processing match {idx}: {e}")
-                    continue
+            except Exception as e:
+                print(f"    WARNING: Error processing match {idx}: {e}")
+                continue
 
-                # Small delay between matches
-                time.sleep(1)
+            # Small delay between matches
+            time.sleep(1)
 
-            print(f"\n  Successfully scraped {len(all_matches)} matches")
+        print(f"\n  Successfully scraped {len(all_matches)} matches ({reused} reused from previous exports)")
+        return pd.DataFrame(all_matches)
 
-        except Exception as e:
-            print(f"  WARNING: Error scraping matches: {e}")
-            import traceback
-            traceback.print_exc()
+    def scrape_opponent_last_10_matches(self, opponent_name: str) -> pd.DataFrame:
+        """
+        Scrape the last matches from opponent's page.
 
-        return pd.DataFrame(all_matches)
+        Behaviour changed:
+            - Only consider sidebar matches from 3rd to 10th item (indices 2..9)
+            - Only click/process matches that are already played (div[title='TR'])
+        """
+        match_candidates = self.collect_opponent_match_candidates(opponent_name)
+        return self.scrape_match_candidates(match_candidates)
     
     def calculate_aggregated_statistics(self, df: pd.DataFrame, opponent_name: str) -> Dict:
         """
@@ -686,28 +752,23 @@ class SofaScoreScraper:
                           and col not in ['home_team', 'away_team', 'home_score', 'away_score']]
             
             print(f"\n  Aggregating {len(stat_columns)} statistical metrics...")
+
+            # Rows where the opponent was the home side (the other rows are away games)
+            if 'home_team' in df.columns:
+                opponent_is_home = (
+                    df['home_team'].astype(str).str.lower()
+                    .str.contains(opponent_name.lower(), regex=False).to_numpy()
+                )
+            else:
+                opponent_is_home = np.zeros(len(df), dtype=bool)
             
             # Calculate wins/draws/losses
             if 'home_score' in df.columns and 'away_score' in df.columns:
                 try:
-                    # Determine if opponent was home or away and calculate results
-                    df['opponent_goals'] = df.apply(
-                        lambda row: row.get('home_score', 0) 
-                        if opponent_name.lower() in str(row.get('home_team', '')).lower()
-                        else row.get('away_score', 0),
-                        axis=1
-                    )
-                    
-                    df['opponent_goals_conceded'] = df.apply(
-                        lambda row: row.get('away_score', 0)
-                        if opponent_name.lower() in str(row.get('home_team', '')).lower()
-                        else row.get('home_score', 0),
-                        axis=1
-                    )
-                    
-                    # Convert to numeric
-                    df['opponent_goals'] = pd.to_numeric(df['opponent_goals'], errors='coerce').fillna(0)
-                    df['opponent_goals_conceded'] = pd.to_numeric(df['opponent_goals_conceded'], errors='coerce').fillna(0)
+                    home_score = pd.to_numeric(df['home_score'], errors='coerce').fillna(0).to_numpy()
+                    away_score = pd.to_numeric(df['away_score'], errors='coerce').fillna(0).to_numpy()
+                    df['opponent_goals'] = np.where(opponent_is_home, home_score, away_score)
+                    df['opponent_goals_conceded'] = np.where(opponent_is_home, away_score, home_score)
                     
                     aggregated['total_goals_scored'] = int(df['opponent_goals'].sum())
                     aggregated['total_goals_conceded'] = int(df['opponent_goals_conceded'].sum())
@@ -715,10 +776,11 @@ class SofaScoreScraper:
                     aggregated['avg_goals_conceded'] = round(df['opponent_goals_conceded'].mean(), 2)
                     
                     # Calculate wins/draws/losses
-                    df['result'] = df.apply(
-                        lambda row: 'W' if row['opponent_goals'] > row['opponent_goals_conceded']
-                        else ('D' if row['opponent_goals'] == row['opponent_goals_conceded'] else 'L'),
-                        axis=1
+                    df['result'] = np.select(
+                        [df['opponent_goals'] > df['opponent_goals_conceded'],
+                         df['opponent_goals'] == df['opponent_goals_conceded']],
+                        ['W', 'D'],
+                        default='L',
                     )
                     
                     aggregated['wins'] = int((df['result'] == 'W').sum())
@@ -729,26 +791,31 @@ class SofaScoreScraper:
                 except Exception as e:
                     print(f"    WARNING: Error calculating match results: {e}")
             
-            # Aggregate other statistics
-            for col in stat_columns:
-                try:
-                    # Try to extract numeric values from the column
-                    numeric_series = df[col].apply(self._extract_numeric_value)
-                    
-                    # Remove NaN values
-                    numeric_series = numeric_series.dropna()
-                    
-                    if len(numeric_series) > 0:
-                        # Calculate aggregates
-                        col_name = col.replace('_home', '').replace('_away', '')
-                        
-                        aggregated[f'{col_name}_total'] = round(numeric_series.sum(), 2)
-                        aggregated[f'{col_name}_avg'] = round(numeric_series.mean(), 2)
-                        aggregated[f'{col_name}_max'] = round(numeric_series.max(), 2)
-                        aggregated[f'{col_name}_min'] = round(numeric_series.min(), 2)
-                        
-                except Exception as e:
-                    continue
+            # Aggregate other statistics: parse every stat cell in one pass, then take
+            # the opponent's side of each metric (home column in home games, away otherwise)
+            if stat_columns:
+                numeric = self._numeric_stat_frame(df, stat_columns)
+                opponent_stats = {}
+                for col in stat_columns:
+                    col_name = col.replace('_home', '').replace('_away', '')
+                    if col_name in opponent_stats:
+                        continue
+                    home_col, away_col = f'{col_name}_home', f'{col_name}_away'
+                    home_values = numeric[home_col].to_numpy() if home_col in numeric else np.full(len(df), np.nan)
+                    away_values = numeric[away_col].to_numpy() if away_col in numeric else np.full(len(df), np.nan)
+                    opponent_stats[col_name] = np.where(opponent_is_home, home_values, away_values)
+
+                summary = (
+                    pd.DataFrame(opponent_stats, index=df.index)
+                    .dropna(axis=1, how='all')
+                    .agg(['sum', 'mean', 'max', 'min'])
+                    .round(2)
+                )
+                for col_name in summary.columns:
+                    aggregated[f'{col_name}_total'] = float(summary.at['sum', col_name])
+                    aggregated[f'{col_name}_avg'] = float(summary.at['mean', col_name])
+                    aggregated[f'{col_name}_max'] = float(summary.at['max', col_name])
+                    aggregated[f'{col_name}_min'] = float(summary.at['min', col_name])
             
             print("  Aggregated statistics calculated")
             print(f"\n  Key Metrics:")
@@ -763,28 +830,24 @@ class SofaScoreScraper:
         
         return aggregated
     
-    def _extract_numeric_value(self, value) -> float:
-        """Extract numeric value from string."""
-        if pd.isna(value):
-            return None
-        
-        try:
-            # Convert to string
-            value_str = str(value)
-            
-            # Remove percentage signs and other non-numeric characters except dots and minus
-            value_str = re.sub(r'[^\d.\-]', '', value_str)
-            
-            if value_str and value_str != '-':
-                return float(value_str)
-        except:
-            pass
-        
-        return None
-    
-    def run_complete_analysis(self):
+    @staticmethod
+    def _numeric_stat_frame(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """Parse the first number of every cell in `columns` (e.g. "58%" -> 58.0, "12/20 (60%)" -> 12.0)."""
+        cells = df[columns].stack()
+        if cells.empty:
+            return pd.DataFrame(index=df.index, columns=columns, dtype=float)
+        numbers = cells.astype(str).str.extract(_NUMBER_PATTERN, expand=False).astype(float)
+        return numbers.unstack().reindex(index=df.index, columns=columns)
+
+    def run_complete_analysis(self, resume: bool = False, incremental: bool = True):
         """
         Run the complete scraping workflow.
+
+        Args:
+            resume: Continue the last interrupted run from its checkpoints instead of
+                starting from the team page (matches already scraped are not re-opened)
+            incremental: Reuse rows for events already present in previous individual
+                exports instead of re-scraping them
         
         Returns:
             Tuple of (individual_matches_df, aggregated_stats_dict, fixtures_df)
@@ -799,33 +862,61 @@ class SofaScoreScraper:
         print("3. Scrape opponent's last 10 matches")
         print("4. Calculate aggregated statistics")
         print("="*80)
+
+        checkpoint = self.checkpoint
         
         try:
-            # Navigate to Gil Vicente's page
-            print(f"\nNavigating to: {self.team_url}")
-            self.driver.get(self.team_url)
-            time.sleep(3)
-            
-            
-            # Step 0: Capture fixtures for offline cache
-            fixtures_df = self.scrape_gil_vicente_fixtures()
+            run_state = checkpoint.load_run() if resume else None
+
+            if run_state:
+                opponent_name = run_state['opponent_name']
+                match_candidates = run_state['candidates']
+                fixtures_df = pd.DataFrame(run_state.get('fixtures') or [])
+                done = checkpoint.completed_event_ids()
+                print(f"\nResuming run for {opponent_name}: "
+                      f"{len(done)}/{len(match_candidates)} matches already checkpointed")
+            else:
+                if resume:
+                    print("\nNo interrupted run to resume; starting a fresh run.")
 
-            # Step 1: Find next match
-            match_info = self.find_next_match()
-            
-            if not match_info:
-                print("\nWARNING: Could not find next match. Exiting...")
-                return None, None, fixtures_df
-            
-            opponent_name = match_info['opponent']
-            
-            # Step 2: Navigate to opponent's page
-            if not self.navigate_to_opponent_page(match_info['opponent_position']):
-                print("\nWARNING: Could not navigate to opponent's page. Exiting...")
-                return None, None, fixtures_df
+                # Navigate to Gil Vicente's page
+                print(f"\nNavigating to: {self.team_url}")
+                self.driver.get(self.team_url)
+                time.sleep(3)
+                
+                
+                # Step 0: Capture fixtures for offline cache
+                fixtures_df = self.scrape_gil_vicente_fixtures()
+
+                # Step 1: Find next match
+                match_info = self.find_next_match()
+                
+                if not match_info:
+                    print("\nWARNING: Could not find next match. Exiting...")
+                    return None, None, fixtures_df
+                
+                opponent_name = match_info['opponent']
+                
+                # Step 2: Navigate to opponent's page
+                if not self.navigate_to_opponent_page(match_info['opponent_position']):
+                    print("\nWARNING: Could not navigate to opponent's page. Exiting...")
+                    return None, None, fixtures_df
+
+                match_candidates = self.collect_opponent_match_candidates(opponent_name)
+                checkpoint.start_run(
+                    opponent_name,
+                    match_info,
+                    match_candidates,
+                    fixtures_df.to_dict(orient='records') if not fixtures_df.empty else [],
+                )
             
             # Step 3: Scrape opponent's last 10 matches
-            individual_matches_df = self.scrape_opponent_last_10_matches(opponent_name)
+            event_index = ExportedEventIndex(self._export_dir()) if incremental else None
+            if event_index is not None:
+                print(f"\n  Event index: {len(event_index)} events already exported")
+            individual_matches_df = self.scrape_match_candidates(
+                match_candidates, checkpoint=checkpoint, event_index=event_index
+            )
             
             if individual_matches_df.empty:
                 print("\nWARNING: No matches were scraped. Exiting...")
@@ -841,10 +932,21 @@ class SofaScoreScraper:
             
         except Exception as e:
             print(f"\nWARNING: Error in complete analysis: {e}")
+            print("  Completed matches are checkpointed; rerun with --resume to continue.")
             import traceback
             traceback.print_exc()
             return None, None, None
     
+    def _export_dir(self) -> Path:
+        export_dir_env = (os.getenv("SCRAPER_EXPORT_DIR") or "").strip()
+        if export_dir_env:
+            return Path(export_dir_env).expanduser()
+        repo_root = Path(__file__).resolve().parents[1]
+        return repo_root / "data" / "scraper_exports"
+
+    @property
+    def checkpoint(self) -> ScrapeCheckpoint:
+        return ScrapeCheckpoint(self._export_dir())
     
     def save_results(
         self,
@@ -857,13 +959,7 @@ class SofaScoreScraper:
         print("STEP 5: Saving Results")
         print("="*80)
 
-        export_dir_env = (os.getenv("SCRAPER_EXPORT_DIR") or "").strip()
-        if export_dir_env:
-            export_dir = Path(export_dir_env).expanduser()
-        else:
-            repo_root = Path(__file__).resolve().parents[1]
-            export_dir = repo_root / "data" / "scraper_exports"
-
+        export_dir = self._export_dir()
         export_dir.mkdir(parents=True, exist_ok=True)
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -908,6 +1004,19 @@ class SofaScoreScraper:
             fixtures_json_path = export_dir / fixtures_json
             fixtures_df.to_json(str(fixtures_json_path), orient="records", indent=2, force_ascii=False)
             print(f"  Fixtures cache saved to: {fixtures_json_path}")
+
+        # Append to the columnar store (read selectively by the backend)
+        columnar = ColumnarExportStore(export_dir)
+        if columnar.available:
+            try:
+                if individual_df is not None and aggregated_dict is not None:
+                    written = columnar.append_matches(aggregated_dict.get('opponent_name', opponent), individual_df)
+                    print(f"\n  Columnar store: {written} new match rows for {aggregated_dict.get('opponent_name')}")
+                if fixtures_df is not None and not fixtures_df.empty:
+                    written = columnar.append_fixtures(fixtures_df)
+                    print(f"  Columnar store: {written} fixture rows")
+            except Exception as e:
+                print(f"  WARNING: Could not append to columnar store: {e}")
         
         # Print summary
         if aggregated_dict is not None and individual_df is not None:
@@ -933,16 +1042,69 @@ class SofaScoreScraper:
             print(f"Total Aggregated Metrics: {len(aggregated_dict)} calculated values")
 
 
-def main():
+def benchmark_resource_blocking(headless: bool, profile: ResourceBlockingProfile, url: Optional[str] = None):
+    """Load the same page with and without resource blocking and print the difference."""
+    results = {}
+    for label, run_profile in (("unblocked", ResourceBlockingProfile.disabled()), ("blocked", profile)):
+        scraper = None
+        try:
+            scraper = SofaScoreScraper(headless=headless, block_profile=run_profile)
+            results[label] = measure_page_load(scraper.driver, url or scraper.team_url)
+        finally:
+            if scraper:
+                scraper.close()
+
+    print_benchmark_report(results["unblocked"], results["blocked"], profile)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Gil Vicente's next opponent from SofaScore")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome in headless mode")
+    parser.add_argument(
+        "--block-resources",
+        default=None,
+        help='Resources to block: "all", "none" or a list like "images,fonts,media,ads" '
+        "(default: SCRAPER_BLOCK_RESOURCES or all)",
+    )
+    parser.add_argument(
+        "--benchmark-blocking",
+        action="store_true",
+        help="Compare bytes transferred and page-ready time with and without resource blocking, then exit",
+    )
+    parser.add_argument("--benchmark-url", default=None, help="Page used by --benchmark-blocking (default: team page)")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last interrupted run from its per-match checkpoints",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Re-scrape every match instead of reusing events from previous exports",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
+    block_profile = ResourceBlockingProfile.from_env(args.block_resources)
+
+    if args.benchmark_blocking:
+        benchmark_resource_blocking(args.headless, block_profile, args.benchmark_url)
+        return
+
     scraper = None
     
     try:
         # Initialize scraper
-        scraper = SofaScoreScraper(headless=False)
+        scraper = SofaScoreScraper(headless=args.headless, block_profile=block_profile)
         
         # Run complete analysis
-        individual_df, aggregated_stats, fixtures_df = scraper.run_complete_analysis()
+        individual_df, aggregated_stats, fixtures_df = scraper.run_complete_analysis(
+            resume=args.resume, incremental=not args.full_refresh
+        )
         
         if (individual_df is not None and aggregated_stats is not None) or (
             fixtures_df is not None and not fixtures_df.empty
@@ -950,6 +1112,14 @@ def main():
             # Save results
             scraper.save_results(individual_df, aggregated_stats, fixtures_df)
 
+            checkpoint = scraper.checkpoint
+            pending = checkpoint.pending_event_ids()
+            if pending:
+                print(f"\nWARNING: {len(pending)} match(es) failed: {', '.join(pending)}")
+                print("  Rerun with --resume to scrape only those matches.")
+            else:
+                checkpoint.clear()
+
             print("\n" + "="*80)
             print("ANALYSIS COMPLETE!")
             print("="*80)
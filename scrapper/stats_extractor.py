@@ -493,6 +493,19 @@ class MatchStatsExtractor:
 
         return {}
 
+    def fetch_api_json(self, path: str) -> Optional[Dict]:
+        """GET an API path (e.g. "/team/3010/events/last/0") via the browser session, then urllib."""
+        base_urls = [
+            self.api_base_url.rstrip("/"),
+            "https://www.sofascore.com/api/v1",
+        ]
+        for base in base_urls:
+            url = f"{base}/{path.lstrip('/')}"
+            data = self._fetch_json_via_browser(url) or self._fetch_json(url)
+            if isinstance(data, dict):
+                return data
+        return None
+
     def extract_event_summary(self, match_url: Optional[str]) -> Dict[str, object]:
         """Best-effort fetch of match metadata (scores/date/status)."""
         if not match_url: